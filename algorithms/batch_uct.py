@@ -0,0 +1,157 @@
+import sys
+import os
+import time
+
+# Ensure access to parent directory for module imports
+sys.path.append("..")
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from connectFour import ConnectFour
+from algorithms.uct import select, expand, backpropagate, apply_virtual_loss, new_root, new_table, choose_move
+from algorithms.solver import ENDGAME_EMPTY_CELLS, in_endgame, solve_position
+from utils import batch_rollout
+from utils.monte_utils import simulate_random_game, simulate_heuristic_game
+from utils.file_utils import load_board_from_file
+from utils.transposition import DEFAULT_MAX_ENTRIES
+from utils import algorithm_table
+
+# Node class and heuristic rollouts (True) or random ones (False) for each algorithm
+VARIANTS = {
+    algorithm: (algorithm_table.node_class(algorithm),
+                algorithm_table.rollout_policy(algorithm) is simulate_heuristic_game)
+    for algorithm in algorithm_table.TREE_SEARCHES
+}
+
+# Fewer leaves than this are rolled out one by one: a vectorized batch has
+# a fixed cost per ply that only pays off over enough games
+MIN_VECTOR_LEAVES = 128
+
+def evaluate_leaves(leaves, heuristic):
+    """
+    Roll out every (red, yellow, player to move) leaf, as one vectorized
+    batch when NumPy is installed and there are at least MIN_VECTOR_LEAVES.
+    Returns results from Yellow's point of view.
+    """
+    if not leaves:
+        return []
+    if batch_rollout.available() and len(leaves) >= MIN_VECTOR_LEAVES:
+        reds, yellows, players = zip(*leaves)
+        results = batch_rollout.rollouts_from_positions(reds, yellows, [player == 'Y' for player in players],
+                                                        heuristic=heuristic)
+        return results.tolist()
+    rollout = simulate_heuristic_game if heuristic else simulate_random_game
+    return [rollout(ConnectFour.from_bitboards(red, yellow, player)) for red, yellow, player in leaves]
+
+def grow_trees_lockstep(trees, num_simulations, leaves_per_tree=1):
+    """
+    Advance several independent UCT trees together. Each step selects and
+    expands up to leaves_per_tree leaves in every tree that still has
+    budget left (virtual loss spreads several descents of one tree, as in
+    tree-parallel search), rolls all the leaves out in one batch per
+    rollout policy, then backpropagates each result into its own tree.
+    Leaves with a proven value skip the rollout, and a tree stops once its
+    root is proven.
+    `trees` holds (root, game, transposition table, heuristic) tuples.
+    Returns the number of leaves rolled out.
+    """
+    iterations = [0] * len(trees)
+    root_plies = [len(game.moves) for _, game, _, _ in trees]
+    evaluated = 0
+    while True:
+        leaves = {False: [], True: []}
+        paths = {False: [], True: []}
+        running = False
+        for index, (root, game, tt, heuristic) in enumerate(trees):
+            for _ in range(leaves_per_tree):
+                if root.proven is not None or iterations[index] >= num_simulations:
+                    break
+                running = True
+                iterations[index] += 1
+                selected_node, path = select(root, game, game.current_player)
+                if selected_node.proven is not None:
+                    backpropagate(path, selected_node.proven)
+                    new_node = None
+                else:
+                    new_node, move_played = expand(selected_node, game, tt)
+                if new_node and new_node.proven is not None:
+                    path.append(new_node)
+                    backpropagate(path, new_node.proven)
+                elif new_node:
+                    path.append(new_node)
+                    mover = game.current_player
+                    if leaves_per_tree > 1:
+                        apply_virtual_loss(path)
+                    leaves[heuristic].append((game.red, game.yellow, 'Y' if mover == 'R' else 'R'))
+                    paths[heuristic].append((path, mover))
+                game.undo_to(root_plies[index])
+        if not running:
+            return evaluated
+
+        for heuristic in (False, True):
+            results = evaluate_leaves(leaves[heuristic], heuristic)
+            evaluated += len(results)
+            for (path, mover), result in zip(paths[heuristic], results):
+                if leaves_per_tree > 1:
+                    apply_virtual_loss(path, sign=-1)
+                backpropagate(path, result if mover == 'Y' else -result)
+
+def batch_uct_search(positions, verbosity="Brief", num_simulations=500, tt_size=DEFAULT_MAX_ENTRIES,
+                     mirror=False, endgame_cells=ENDGAME_EMPTY_CELLS, leaves_per_tree=1, report=None):
+    """
+    Choose a move in each of several positions, given as (algorithm,
+    current_player, board) like load_board_from_file returns, by growing
+    their UCT trees in lockstep (see grow_trees_lockstep). Each tree gets
+    num_simulations iterations with its algorithm's node class and rollout
+    policy; endgames are solved exactly as in uct_search. leaves_per_tree
+    is passed to grow_trees_lockstep.
+    Every position's column values and move are printed in order, then
+    the rollout throughput. A `report` dict receives the per-position
+    values under "values" and the totals under "positions", "seconds"
+    and "positions_per_sec".
+    Returns the list of chosen columns.
+    """
+    started = time.perf_counter()
+    trees = []
+    for algorithm, current_player, board in positions:
+        if algorithm not in VARIANTS:
+            raise ValueError(f"Algorithm '{algorithm}' has no lockstep search.")
+        game = ConnectFour(board, current_player)
+        node_class, heuristic = VARIANTS[algorithm]
+        if in_endgame(game, endgame_cells):
+            trees.append(None)
+            continue
+        trees.append((new_root(game, node_class), game, new_table(tt_size, mirror), heuristic))
+
+    evaluated = grow_trees_lockstep([tree for tree in trees if tree is not None], num_simulations, leaves_per_tree)
+    seconds = time.perf_counter() - started
+
+    moves, values = [], []
+    for (algorithm, current_player, board), tree in zip(positions, trees):
+        position_report = {}
+        if tree is None:
+            moves.append(solve_position(board, current_player, verbosity, report=position_report))
+        else:
+            moves.append(choose_move(tree[0], current_player, verbosity, report=position_report))
+        values.append(position_report["values"])
+
+    positions_per_sec = evaluated / seconds if seconds else 0.0
+    if verbosity in ["Verbose", "Brief"]:
+        print(f"Positions evaluated: {evaluated} in {seconds:.2f}s ({positions_per_sec:.0f} positions/sec)")
+    if report is not None:
+        report.update(values=values, positions=evaluated, seconds=seconds, positions_per_sec=positions_per_sec)
+    return moves
+
+if __name__ == "__main__":
+    if len(sys.argv) < 4:
+        print("Usage: python batch_uct.py <verbosity> <num_simulations> <input_file> [input_file ...]")
+        sys.exit(1)
+
+    verbosity = sys.argv[1]
+    num_simulations = int(sys.argv[2])
+
+    # Boards written for the other algorithms are searched with plain UCT
+    positions = []
+    for input_file in sys.argv[3:]:
+        algorithm, current_player, board = load_board_from_file(input_file)
+        positions.append((algorithm if algorithm in VARIANTS else "UCT", current_player, board))
+    batch_uct_search(positions, verbosity, num_simulations)
@@ -1,18 +1,16 @@
 import sys
 import os
 import math
-import random
-import copy
 
 # Allow access to parent directory to import shared utilities and modules
 sys.path.append("..")
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
-from connectFour import ConnectFour
+from algorithms import uct
 from utils.monte_utils import simulate_random_game, basic_heuristic
 from utils.file_utils import load_board_from_file
 
-class Node:
+class Node(uct.Node):
     """
     Represents a node in the UCT tree with additional bias support.
     Each node tracks:
@@ -20,136 +18,34 @@ class Node:
     - ni: number of visits (simulations)
     - children: dictionary mapping moves to child nodes
     """
-    def __init__(self, parent=None, move=None):
-        self.parent = parent
-        self.move = move
-        self.children = {}
-        self.wi = 0
-        self.ni = 0
+    # basic_heuristic only looks at the column, so the bias is a per-column constant
+    COLUMN_BIAS = tuple(0.3 * basic_heuristic(None, move) for move in range(7))
 
     def ucb1_with_bias(self, total_simulations, player, exploration_const=math.sqrt(2)):
         """
         Compute UCB1 with an added heuristic bias term to favor strategic positions (e.g., center columns).
+        Selection scores all children at once with uct.score_children; this is the single-child form.
         """
         if self.ni == 0:
             return float('inf')  # Always explore unvisited nodes
 
         # Base UCB1 value = average reward + exploration term
         value_estimate = self.wi / self.ni
-        exploration = exploration_const * math.sqrt(math.log(total_simulations) / self.ni)
+        exploration = uct.exploration_scale(total_simulations, exploration_const) / math.sqrt(self.ni)
 
         # Add a heuristic bias to encourage good early choices (e.g., prefer center columns)
-        bias = 0.3 * basic_heuristic(ConnectFour([['O'] * 7 for _ in range(6)], player), self.move)
+        return value_estimate + exploration + self.COLUMN_BIAS[self.move]
 
-        return value_estimate + exploration + bias
+    def score(self, total_simulations, player):
+        return self.ucb1_with_bias(total_simulations, player)
 
-def select(node, game, player, verbosity):
-    """
-    Traverse the tree using UCB1 with bias until an unvisited node is found.
-    Returns the leaf node and the path from the root.
-    """
-    path = [node]
-    current_node = node
-
-    while True:
-        legal_moves = game.get_legal_moves()
-        if not legal_moves:
-            break
-
-        # If any child hasn't been visited, expand from there
-        unvisited = [move for move in legal_moves if move not in current_node.children]
-        if unvisited:
-            break
-
-        if verbosity == "Verbose":
-            for move, child in current_node.children.items():
-                val = child.ucb1_with_bias(current_node.ni, game.current_player)
-                print(f"V{move + 1}: {val:.2f}")
-
-        # Choose move with highest UCB1 + bias value
-        best_move = max(current_node.children, key=lambda m: current_node.children[m].ucb1_with_bias(current_node.ni, game.current_player))
-        game.apply_move(best_move)
-
-        current_node = current_node.children[best_move]
-        path.append(current_node)
-
-        # Alternate the current player
-        game.current_player = 'Y' if game.current_player == 'R' else 'R'
-
-    return current_node, path
-
-def expand(node, game):
-    """
-    Expand the search tree by creating a child node for the first unvisited legal move.
-    """
-    legal_moves = game.get_legal_moves()
-    for move in legal_moves:
-        if move not in node.children:
-            new_node = Node(parent=node, move=move)
-            node.children[move] = new_node
-            game.apply_move(move)
-            return new_node, move
-    return None, None
-
-def backpropagate(path, result):
-    """
-    Backpropagate the simulation result up the tree,
-    flipping the result at each level to account for alternating players.
-    """
-    for node in reversed(path):
-        node.wi += result
-        node.ni += 1
-        result = -result  # Flip the result for the opposing player
-
-def uct_search(board, current_player, verbosity="Brief", num_simulations=500):
+def uct_search(board, current_player, verbosity="Brief", num_simulations=500, **options):
     """
     Execute the UCT search with bias to select the best move from the current state.
+    Keyword options are those of algorithms.uct.uct_search.
     """
-    root = Node()
-    move_stats = {i: Node(parent=root, move=i) for i in range(7)}  # Children for each column
-    for move in move_stats:
-        root.children[move] = move_stats[move]
-
-    # Run simulations
-    for _ in range(num_simulations):
-        game = ConnectFour(copy.deepcopy(board), current_player)
-        selected_node, path = select(root, game, current_player, verbosity)
-
-        if verbosity == "Verbose" and selected_node != root:
-            print(f"Move selected: {selected_node.move + 1}")
-
-        new_node, move_played = expand(selected_node, game)
-        if new_node:
-            if verbosity == "Verbose":
-                print("NODE ADDED")
-
-            path.append(new_node)
-            game.current_player = 'Y' if game.current_player == 'R' else 'R'
-            result = simulate_random_game(game)
-
-            if verbosity == "Verbose":
-                print(f"TERMINAL NODE VALUE: {result}")
-
-            backpropagate(path, result)
-
-    # Print move statistics for root node
-    if verbosity in ["Verbose", "Brief"]:
-        for col in range(7):
-            node = root.children.get(col)
-            if node and node.ni > 0:
-                val = (node.wi / node.ni) * (-1 if current_player == 'R' else 1)
-                print(f"Column {col + 1}: {val:.2f}")
-            else:
-                print(f"Column {col + 1}: Null")
-
-    # Choose the move with the highest expected value
-    best_move = max(
-        ((col, node) for col, node in root.children.items() if node.ni > 0),
-        key=lambda item: (item[1].wi / item[1].ni) * (-1 if current_player == 'R' else 1)
-    )[0]
-
-    print("FINAL Move selected:", best_move + 1)
-    return best_move
+    return uct.uct_search(board, current_player, verbosity, num_simulations,
+                          rollout=simulate_random_game, node_class=Node, **options)
 
 if __name__ == "__main__":
     if len(sys.argv) != 4:
@@ -2,47 +2,83 @@ import sys
 import os
 sys.path.append("..")
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
-from utils.monte_utils import simulate_random_game
+from utils.monte_utils import simulate_random_game, deadline_after, print_column_values
+from utils import batch_rollout
 from utils.file_utils import load_board_from_file
 from connectFour import ConnectFour
-import random
-import copy
+from algorithms.solver import ENDGAME_EMPTY_CELLS, in_endgame, solve_position
+import time
 
 
-def run_pmcgs(board, current_player, verbosity="Brief", num_simulations=500):
+# Rollouts per legal move between clock reads in time-limited searches
+TIMED_ROUND = 8
+TIMED_BATCH_ROUND = 512
+
+def run_pmcgs(board, current_player, verbosity="Brief", num_simulations=500, time_limit_ms=None,
+              endgame_cells=ENDGAME_EMPTY_CELLS, report=None):
     """
     Run Pure Monte Carlo Game Search from the current board.
+    With NumPy installed, all rollouts run as a few vectorized batches;
+    otherwise they share one game that is rewound after each playout.
+    With time_limit_ms, rounds of rollouts for every move are played until
+    the time is up instead of num_simulations per move.
+    Positions with fewer than endgame_cells empty cells are solved exactly
+    by algorithms.solver instead (0 disables this).
+    A `report` dict receives the printed column values under "values" and
+    the number of rollouts played under "simulations".
     """
-    legal_moves = [col for col in range(7) if board[0][col] == 'O']
-    move_scores = {}
-    simulations = {}
-
-    for move in legal_moves:
-        win_sum = 0
-        count = 0
-        for _ in range(num_simulations):
-            game_copy = ConnectFour(copy.deepcopy(board), current_player)
-            game_copy.apply_move(move)
-            game_copy.current_player = 'Y' if current_player == 'R' else 'R'
-            result = simulate_random_game(game_copy)
-
-            win_sum += result
-            count += 1
-
-        avg = win_sum / count if count > 0 else 0
-        move_scores[move] = avg
-        simulations[move] = count
-
-    # Print based on verbosity
-    if verbosity == "Verbose" or verbosity == "Brief":
-        for col in range(7):
-            if col in move_scores:
-                print(f"Column {col + 1}: {move_scores[col]:.2f}")
-            else:
-                print(f"Column {col + 1}: Null")
-
-    # Select best move
-    best_move = max(move_scores, key=move_scores.get)
+    game = ConnectFour(board, current_player)
+    if in_endgame(game, endgame_cells):
+        return solve_position(board, current_player, verbosity, report=report)
+    legal_moves = game.get_legal_moves()
+    opponent = 'Y' if current_player == 'R' else 'R'
+    root_ply = len(game.moves)
+    use_batches = batch_rollout.available()
+    win_sums = {move: 0 for move in legal_moves}
+    simulations = {move: 0 for move in legal_moves}
+
+    def play_round(games_per_move):
+        if use_batches:
+            sums = batch_rollout.batch_random_rollouts(game, legal_moves, games_per_move)
+            for move, win_sum in zip(legal_moves, sums):
+                win_sums[move] += win_sum
+                simulations[move] += games_per_move
+            return
+        for move in legal_moves:
+            for _ in range(games_per_move):
+                game.apply_move(move)
+                game.current_player = opponent
+                win_sums[move] += simulate_random_game(game)
+                game.undo_to(root_ply)
+            simulations[move] += games_per_move
+
+    deadline = deadline_after(time_limit_ms)
+    if deadline is None:
+        if num_simulations > 0:
+            play_round(num_simulations)
+    else:
+        round_size = TIMED_BATCH_ROUND if use_batches else TIMED_ROUND
+        while True:
+            play_round(round_size)
+            if time.monotonic() >= deadline:
+                break
+        if verbosity in ["Verbose", "Brief"]:
+            print(f"Iterations completed: {sum(simulations.values())}")
+
+    move_scores = {move: win_sums[move] / simulations[move] if simulations[move] else 0
+                   for move in legal_moves}
+
+    values = [move_scores.get(col) for col in range(7)]
+    print_column_values(values, verbosity)
+    if report is not None:
+        report["values"] = values
+        report["simulations"] = sum(simulations.values())
+
+    # Select best move: scores are from Yellow's (Max) point of view
+    if current_player == 'Y':
+        best_move = max(move_scores, key=move_scores.get)
+    else:
+        best_move = min(move_scores, key=move_scores.get)
     print("FINAL Move selected:", best_move + 1)
     return best_move
 
@@ -0,0 +1,195 @@
+import sys
+import os
+
+# Ensure access to parent directory for module imports
+sys.path.append("..")
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from connectFour import ConnectFour
+from utils.bitboard import COLUMN_HEIGHT, BOARD_CELLS, LINE_MASKS, has_four, position_key
+from utils.monte_utils import CENTER_FIRST_ORDER, print_column_values
+from utils.transposition import TranspositionTable
+from utils.file_utils import load_board_from_file
+
+# The search entry points hand positions with fewer empty cells than this to the solver
+ENDGAME_EMPTY_CELLS = 12
+
+# Positions kept in the solver's transposition table
+SOLVER_TT_ENTRIES = 1_000_000
+
+# Kinds of transposition table entry: exact value, lower bound, upper bound
+EXACT, LOWER, UPPER = 0, 1, 2
+
+def in_endgame(game, endgame_cells=ENDGAME_EMPTY_CELLS):
+    """
+    True if the game is still running and has fewer than endgame_cells
+    empty cells, so the solver should replace the search.
+    """
+    return (bool(endgame_cells) and BOARD_CELLS - game.move_count < endgame_cells
+            and game.check_winner() is None)
+
+def wins_with(game, col):
+    """
+    True if the player to move completes four in a row by playing col.
+    """
+    bit_index = col * COLUMN_HEIGHT + game.heights[col]
+    stones = game.red if game.current_player == 'R' else game.yellow
+    return has_four((stones | 1 << bit_index) & LINE_MASKS[bit_index])
+
+class Solver:
+    """
+    Negamax search with alpha-beta pruning and a transposition table.
+    Values are from the point of view of the player to move: a win scores
+    BOARD_CELLS + 1 minus the number of stones on the board after the
+    winning move (sooner wins score higher), a draw scores 0, and so does
+    a position left unresolved by the depth limit. Any non-zero value is
+    therefore a proven result.
+    """
+    def __init__(self, max_entries=SOLVER_TT_ENTRIES):
+        self.tt = TranspositionTable(max_entries)
+        self.nodes = 0
+        self.depth = 0  # depth of the last completed iteration
+
+    def negamax(self, game, depth, alpha, beta):
+        """
+        Value of the position searched `depth` plies deep. The game must
+        not be finished on entry.
+        """
+        self.nodes += 1
+        legal_moves = game.get_legal_moves()
+        for col in legal_moves:
+            if wins_with(game, col):
+                return BOARD_CELLS - game.move_count
+        if depth == 0 or game.move_count >= BOARD_CELLS - 1:
+            return 0
+
+        # Nobody can win on this move, so the best win comes two plies later
+        best_possible = BOARD_CELLS - 2 - game.move_count
+        if beta > best_possible:
+            beta = best_possible
+            if alpha >= beta:
+                return beta
+
+        key = position_key(game.red, game.yellow)
+        entry = self.tt.get(key)
+        first_move = None
+        if entry is not None:
+            entry_depth, kind, value, first_move = entry
+            if entry_depth >= depth:
+                if kind == EXACT:
+                    return value
+                if kind == LOWER and value > alpha:
+                    alpha = value
+                elif kind == UPPER and value < beta:
+                    beta = value
+                if alpha >= beta:
+                    return value
+
+        order = [col for col in CENTER_FIRST_ORDER if col in legal_moves and col != first_move]
+        if first_move is not None:
+            order.insert(0, first_move)
+
+        alpha_on_entry = alpha
+        best_value, best_move = -BOARD_CELLS, order[0]
+        player = game.current_player
+        for col in order:
+            game.apply_move(col)
+            game.current_player = 'Y' if player == 'R' else 'R'
+            value = -self.negamax(game, depth - 1, -beta, -alpha)
+            game.undo_move()
+            if value > best_value:
+                best_value, best_move = value, col
+                if value > alpha:
+                    alpha = value
+                    if alpha >= beta:
+                        break
+
+        if best_value <= alpha_on_entry:
+            kind = UPPER
+        elif best_value >= beta:
+            kind = LOWER
+        else:
+            kind = EXACT
+        self.tt.put(key, (depth, kind, best_value, best_move))
+        return best_value
+
+    def outcomes(self, game, depth):
+        """
+        Classify every legal move with a `depth`-ply search: 1 proven win,
+        -1 proven loss, 0 draw or unresolved (for the player to move).
+        """
+        results = {}
+        player = game.current_player
+        for col in game.get_legal_moves():
+            if wins_with(game, col):
+                results[col] = 1
+                continue
+            game.apply_move(col)
+            game.current_player = 'Y' if player == 'R' else 'R'
+            if game.move_count == BOARD_CELLS:
+                value = 0
+            else:
+                value = -self.negamax(game, depth - 1, -1, 1)
+            game.undo_move()
+            results[col] = (value > 0) - (value < 0)
+        return results
+
+    def solve(self, game):
+        """
+        Iterative deepening over outcomes() until a winning move is proven,
+        every move is lost, or the search reaches the end of the game (then
+        0 means a proven draw). Shallower iterations find the quickest wins
+        and fill the table with move ordering for the deeper ones.
+        Returns the outcome of each legal move for the player to move.
+        """
+        empty_cells = BOARD_CELLS - game.move_count
+        results = {}
+        for depth in range(1, empty_cells + 1):
+            results = self.outcomes(game, depth)
+            self.depth = depth
+            values = results.values()
+            if 1 in values or all(value == -1 for value in values):
+                break
+        return results
+
+def best_solved_move(results):
+    """
+    Column with the best outcome, center columns first on ties.
+    """
+    return max(sorted(results, key=CENTER_FIRST_ORDER.index), key=lambda col: results[col])
+
+def solve_position(board, current_player, verbosity="Brief", max_entries=SOLVER_TT_ENTRIES, report=None):
+    """
+    Solve the position exactly and return the best column.
+    Column outcomes are printed from Yellow's point of view like the other
+    algorithms: 1 Yellow wins, -1 Red wins, 0 draw (or not needed to pick
+    a forced win). A `report` dict receives them under "values", and 0
+    under "simulations" like the sampling searches' counts.
+    """
+    game = ConnectFour(board, current_player)
+    solver = Solver(max_entries)
+    results = solver.solve(game)
+
+    sign = 1 if current_player == 'Y' else -1
+    values = [results[col] * sign if col in results else None for col in range(7)]
+    print_column_values(values, verbosity)
+    if report is not None:
+        report["values"] = values
+        report["simulations"] = 0
+    if verbosity == "Verbose":
+        print(f"Solved to depth {solver.depth} in {solver.nodes} nodes")
+
+    best_move = best_solved_move(results)
+    print("FINAL Move selected:", best_move + 1)
+    return best_move
+
+if __name__ == "__main__":
+    if len(sys.argv) != 3:
+        print("Usage: python solver.py <input_file> <verbosity>")
+        sys.exit(1)
+
+    input_file = sys.argv[1]
+    verbosity = sys.argv[2]
+
+    algorithm, current_player, board = load_board_from_file(input_file)
+    solve_position(board, current_player, verbosity)
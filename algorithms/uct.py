@@ -1,30 +1,60 @@
 import sys
 import os
 import math
+import time
 import random
-import copy
+import concurrent.futures
 
 # Ensure access to parent directory for module imports
 sys.path.append("..")
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
 from connectFour import ConnectFour
-from utils.monte_utils import simulate_random_game
+from utils.bitboard import MIRRORED_COLUMN
+from utils.monte_utils import simulate_random_game, deadline_after, print_column_values
 from utils.file_utils import load_board_from_file
+from utils.transposition import TranspositionTable, DEFAULT_MAX_ENTRIES
+from utils.node_store import NodeStore
+from utils.search_stats import SearchStats
+from utils.trace import TextTracer
+from algorithms.solver import Solver, ENDGAME_EMPTY_CELLS, in_endgame, best_solved_move, solve_position
+
+EXPLORATION_CONST = math.sqrt(2)
+
+# Visit counts below this use the precomputed UCB tables
+UCB_TABLE_SIZE = 4096
+# 1 / sqrt(n) and sqrt(log(n)) by visit count n
+INV_SQRT_VISITS = (math.inf,) + tuple(1 / math.sqrt(n) for n in range(1, UCB_TABLE_SIZE))
+SQRT_LOG_VISITS = (0.0,) + tuple(math.sqrt(math.log(n)) for n in range(1, UCB_TABLE_SIZE))
 
 class Node:
     """
     Represents a node in the UCT tree.
     Each node tracks wins (wi), simulations (ni), and its children.
+    Nodes shared through a transposition table also remember the position
+    key their children's moves refer to; a visit through the mirrored
+    position maps every column c to 6 - c.
+    COLUMN_BIAS is the constant each column adds to the selection score,
+    which is how variants describe their tree policy to select() and the
+    NodeStore search; score() gives the same value for a single child.
+    `proven` is the game-theoretic value once it is known (MCTS-Solver),
+    from the same point of view as wi: 1 the player who moved into the
+    node wins, -1 loses, 0 draw. `num_moves` is the number of legal moves
+    in the node's position, so a parent can tell when every child is proven.
     """
+    COLUMN_BIAS = (0.0,) * 7
+
     def __init__(self, parent=None, move=None):
         self.parent = parent
         self.move = move
         self.children = {}
         self.wi = 0
         self.ni = 0
+        self.key = None
+        self.proven = None
+        self.num_moves = None
 
-    def ucb1(self, total_simulations, exploration_const=math.sqrt(2)):
+    def ucb1(self, total_simulations, exploration_const=EXPLORATION_CONST):
         """
         Calculate the UCB1 value used for node selection.
         """
@@ -32,104 +62,866 @@ class Node:
             return float('inf')
         return (self.wi / self.ni) + exploration_const * math.sqrt(math.log(total_simulations) / self.ni)
 
-def select(node, game, player, verbosity):
+    def score(self, total_simulations, player):
+        """
+        Tree policy value used by select. UCT variants override this.
+        """
+        return self.ucb1(total_simulations)
+
+def is_mirrored(node, game):
+    """
+    True if the game holds the mirror image of the position the node's
+    children were created from.
+    """
+    return node.key is not None and node.key != game.position_key()
+
+def exploration_scale(parent_visits, exploration_const=EXPLORATION_CONST):
+    """
+    Exploration factor shared by all children of a parent:
+    exploration_const * sqrt(log(parent_visits)).
+    """
+    if parent_visits < UCB_TABLE_SIZE:
+        return exploration_const * SQRT_LOG_VISITS[parent_visits]
+    return exploration_const * math.sqrt(math.log(parent_visits))
+
+def score_children(node, children):
+    """
+    UCB1 plus COLUMN_BIAS for every child of a node in one pass, aligned
+    with the iteration order of `children`. The parent's log term is
+    computed once and per-child terms come from the lookup tables.
+    Children proven lost for the player choosing score -inf, so they are
+    pruned from selection.
+    """
+    scale = exploration_scale(node.ni)
+    bias = node.COLUMN_BIAS
+    inv_sqrt = INV_SQRT_VISITS
+    return [
+        math.inf if child.ni == 0 else
+        -math.inf if child.proven == -1 else
+        child.wi / child.ni + scale * (inv_sqrt[child.ni] if child.ni < UCB_TABLE_SIZE else child.ni ** -0.5)
+        + bias[move]
+        for move, child in children.items()
+    ]
+
+def best_child(node, children):
+    """
+    Move of the highest-scoring child (first one on ties).
+    """
+    scores = score_children(node, children)
+    return list(children)[scores.index(max(scores))]
+
+def select(node, game, player, trace=None):
     """
     Traverse the tree from the root to a leaf node using UCB1.
+    The descent also stops at a node whose value is already proven.
+    A Tracer (utils/trace.py) receives the children's scores at each level.
     """
     path = [node]
     current_node = node
+    mirrored = is_mirrored(node, game)
 
-    while True:
+    while current_node.proven is None:
         legal_moves = game.get_legal_moves()
         if not legal_moves:
             break
 
-        unvisited = [move for move in legal_moves if move not in current_node.children]
+        children = current_node.children
+        if mirrored:
+            unvisited = [move for move in legal_moves if MIRRORED_COLUMN[move] not in children]
+        else:
+            unvisited = [move for move in legal_moves if move not in children]
         if unvisited:
             break  # Stop at an unvisited node
 
-        if verbosity == "Verbose":
-            for move, child in current_node.children.items():
-                val = child.ucb1(current_node.ni)
-                print(f"V{move + 1}: {val:.2f}")
+        if trace is not None:
+            trace.event("ucb", values={(MIRRORED_COLUMN[move] if mirrored else move): val
+                                       for move, val in zip(children, score_children(current_node, children))})
 
-        best_move = max(current_node.children, key=lambda m: current_node.children[m].ucb1(current_node.ni))
-        game.apply_move(best_move)
-        current_node = current_node.children[best_move]
+        best_move = best_child(current_node, children)
+        game.apply_move(MIRRORED_COLUMN[best_move] if mirrored else best_move)
+        current_node = children[best_move]
         path.append(current_node)
         game.current_player = 'Y' if game.current_player == 'R' else 'R'
+        mirrored = is_mirrored(current_node, game)
 
     return current_node, path
 
-def expand(node, game):
+def expand(node, game, tt=None):
     """
     Add a new child node to the tree based on the first unvisited legal move.
+    With a transposition table, a child whose position is already in the
+    table is linked to the existing node instead of a new one.
+    A child whose position ends the game is created already proven.
     """
     legal_moves = game.get_legal_moves()
+    mirrored = is_mirrored(node, game)
+    if node.num_moves is None:
+        node.num_moves = len(legal_moves)
     for move in legal_moves:
-        if move not in node.children:
-            new_node = Node(parent=node, move=move)
-            node.children[move] = new_node
+        stored_move = MIRRORED_COLUMN[move] if mirrored else move
+        if stored_move not in node.children:
             game.apply_move(move)
+            key = tt.canonical_key(game) if tt is not None else None
+            new_node = tt.get(key) if tt is not None else None
+            if new_node is None:
+                new_node = type(node)(parent=node, move=move)
+                mark_terminal(new_node, game, move)
+                if tt is not None:
+                    new_node.key = game.position_key()
+                    tt.put(key, new_node)
+            node.children[stored_move] = new_node
             return new_node, move
     return None, None
 
+def mark_terminal(node, game, move):
+    """
+    Mark a node proven if `move`, just played in the game, ended it.
+    """
+    winner = game.check_winner_after(move, game.last_row)
+    if winner is not None:
+        node.proven = 0 if winner == 'Draw' else 1
+
+def settle_proven(node):
+    """
+    MCTS-Solver rule for a node whose value is not proven yet: it is lost
+    for the player who moved into it if any child is a proven win for the
+    player to move, and otherwise proven once every legal move has a
+    proven child. Returns True if the node became proven.
+    """
+    children = node.children.values()
+    proven = [child.proven for child in children]
+    if 1 in proven:
+        node.proven = -1
+    elif len(proven) == node.num_moves and None not in proven:
+        node.proven = -max(proven)
+    return node.proven is not None
+
+def leaf_result(node, game, rollout):
+    """
+    Result of one simulation from a leaf, for the player who moved into
+    it: the proven value if there is one, else a rollout of the game
+    (which must hold the leaf's position with the right player to move).
+    """
+    if node.proven is not None:
+        return node.proven
+    yellow_moved = game.current_player == 'R'
+    result = rollout(game)
+    return result if yellow_moved else -result
+
 def backpropagate(path, result):
     """
     Propagate the result of a simulation back up the tree.
+    `result` is from the perspective of the player who moved into the last
+    node of the path, so every node's wi is scored for the player who made
+    the move leading to it.
     """
     for node in reversed(path):
         node.wi += result
         node.ni += 1
         result = -result  # Flip result for the opponent's perspective
 
-def uct_search(board, current_player, verbosity="Brief", num_simulations=500):
+    # A newly proven leaf may decide its ancestors
+    if path[-1].proven is not None:
+        for node in reversed(path[:-1]):
+            if node.proven is not None or not settle_proven(node):
+                break
+
+# Iterations between clock reads in time-limited searches
+CLOCK_CHECK_INTERVAL = 32
+
+# Approximate bytes per tree node, used to turn a memory cap into a node cap
+NODE_BYTES = 250
+STORE_NODE_BYTES = 36
+# Fraction of the node cap kept after an eviction pass
+EVICTION_LOW_WATER = 0.75
+
+def nodes_for_memory(max_memory_mb, node_store=False):
     """
-    Perform UCT search to find the best move from the current board state.
+    Node cap that keeps a tree within roughly max_memory_mb megabytes.
+    """
+    return int(max_memory_mb * 2 ** 20 / (STORE_NODE_BYTES if node_store else NODE_BYTES))
+
+def reachable_nodes(root):
+    """
+    List every node reachable from the root, each once.
     """
-    root = Node()
-    move_stats = {i: Node(parent=root, move=i) for i in range(7)}
-    for move in move_stats:
-        root.children[move] = move_stats[move]
+    seen = {id(root)}
+    nodes = [root]
+    for node in nodes:
+        for child in node.children.values():
+            if id(child) not in seen:
+                seen.add(id(child))
+                nodes.append(child)
+    return nodes
 
-    for _ in range(num_simulations):
-        game = ConnectFour(copy.deepcopy(board), current_player)
-        selected_node, path = select(root, game, current_player, verbosity)
+class NodeBudget:
+    """
+    Cap on the number of nodes a search tree may hold.
+    When the tree outgrows max_nodes, evict() prunes the least-visited
+    subtrees down to EVICTION_LOW_WATER of the cap; `evicted` counts the
+    nodes removed over the budget's lifetime.
+    """
+    def __init__(self, max_nodes):
+        self.max_nodes = max_nodes
+        self.size = 0
+        self.evicted = 0
+
+    def evict(self, root, tt=None):
+        """
+        Cut the edges to the least-visited nodes (never the root's own
+        children) so their subtrees can be collected, then drop them from
+        the transposition table. Pruned moves count as unvisited again.
+        """
+        nodes = reachable_nodes(root)
+        target = int(self.max_nodes * EVICTION_LOW_WATER)
+        if len(nodes) > target:
+            visits = sorted(node.ni for node in nodes)
+            threshold = visits[len(nodes) - target - 1]
+            for node in nodes:
+                if node is root:
+                    continue
+                for move in [move for move, child in node.children.items() if child.ni <= threshold]:
+                    del node.children[move]
+            remaining = len(reachable_nodes(root))
+            self.evicted += len(nodes) - remaining
+            nodes = range(remaining)
+            if tt is not None:
+                tt.retain(root)
+        self.size = len(nodes)
+
+def grow_tree(root, game, verbosity, num_simulations, rollout, tt=None, deadline=None, budget=None,
+              stats=None, trace=None):
+    """
+    Run select/expand/rollout/backpropagate iterations from the root.
+    Every iteration plays on the same game and rewinds it afterwards,
+    so nothing is allocated per iteration except new tree nodes.
+    With a deadline (see deadline_after) iterations continue until it
+    passes, checking the clock every CLOCK_CHECK_INTERVAL iterations, and
+    num_simulations is ignored. A NodeBudget keeps the tree within its
+    node cap by evicting subtrees. The search stops early once the root's
+    value is proven. A SearchStats (utils/search_stats.py) receives phase
+    timings and histograms, and a Tracer (utils/trace.py) the events of
+    its sampled iterations; Verbose without a Tracer prints them as text.
+    Returns the number of iterations run.
+    """
+    root_ply = len(game.moves)
+    iterations = 0
+    clock = time.perf_counter
+    if trace is None and verbosity == "Verbose":
+        trace = TextTracer()
+    traced = None
+    if budget is not None:
+        budget.size = len(reachable_nodes(root))
+    while root.proven is None:
+        if deadline is None:
+            if iterations >= num_simulations:
+                break
+        elif iterations % CLOCK_CHECK_INTERVAL == 0 and time.monotonic() >= deadline:
+            break
+        iterations += 1
+        if trace is not None:
+            traced = trace if trace.begin_iteration() else None
+        if stats is not None:
+            started = clock()
+        selected_node, path = select(root, game, game.current_player, traced)
+        if stats is not None:
+            now = clock()
+            stats.add_phase("select", now - started)
+            stats.add_path(path)
+            started = now
 
-        if verbosity == "Verbose" and selected_node != root:
-            print(f"Move selected: {selected_node.move + 1}")
+        if traced is not None and selected_node != root:
+            traced.event("selected", move=selected_node.move)
 
-        new_node, move_played = expand(selected_node, game)
+        tt_hits = tt.hits if tt is not None else 0
+        new_node = None
+        if selected_node.proven is not None:
+            backpropagate(path, selected_node.proven)
+            if stats is not None:
+                stats.add_phase("backpropagate", clock() - started)
+        else:
+            new_node, move_played = expand(selected_node, game, tt)
+            if stats is not None:
+                now = clock()
+                stats.add_phase("expand", now - started)
+                started = now
         if new_node:
-            if verbosity == "Verbose":
-                print("NODE ADDED")
+            if traced is not None:
+                traced.event("added")
 
             path.append(new_node)
-            game.current_player = 'Y' if game.current_player == 'R' else 'R'
-            result = simulate_random_game(game)
+            mover = game.current_player
+            game.current_player = 'Y' if mover == 'R' else 'R'
+            leaf_ply = len(game.moves)
+            result = leaf_result(new_node, game, rollout)
+            if stats is not None:
+                now = clock()
+                stats.add_phase("rollout", now - started)
+                stats.rollout_lengths[len(game.moves) - leaf_ply] += 1
+                started = now
 
-            if verbosity == "Verbose":
-                print(f"TERMINAL NODE VALUE: {result}")
+            if traced is not None:
+                traced.event("result", value=result if mover == 'Y' else -result)
 
             backpropagate(path, result)
+            if stats is not None:
+                stats.add_phase("backpropagate", clock() - started)
+
+        game.undo_to(root_ply)
+        if budget is not None and new_node and (tt is None or tt.hits == tt_hits):
+            budget.size += 1
+            if budget.size > budget.max_nodes:
+                budget.evict(root, tt)
+        if stats is not None:
+            stats.end_iteration()
+    if stats is not None:
+        stats.end_search()
+    if trace is not None:
+        trace.flush()
+    return iterations
+
+def store_select(store, root, game, trace, column_bias, path):
+    """
+    NodeStore version of select: descend by UCB1 plus the column bias until
+    a node that is unexpanded or has an unvisited child. `path` is refilled
+    with the handles visited. `trace` is a Tracer or None.
+    """
+    visits, value, moves = store.visits, store.value, store.move
+    first_child, child_count = store.first_child, store.child_count
+    path.clear()
+    path.append(root)
+    node = root
+
+    while True:
+        count = child_count[node]
+        if count == 0:
+            return node
+        first = first_child[node]
+        children = range(first, first + count)
+        for child in children:
+            if visits[child] == 0:
+                return node  # Stop at an unvisited node
+
+        scale = exploration_scale(visits[node])
+        chosen, best_score = -1, -math.inf
+        scores = {} if trace is not None else None
+        for child in children:
+            n = visits[child]
+            score = (value[child] / n + scale * (INV_SQRT_VISITS[n] if n < UCB_TABLE_SIZE else n ** -0.5)
+                     + column_bias[moves[child]])
+            if scores is not None:
+                scores[moves[child]] = score
+            if score > best_score:
+                chosen, best_score = child, score
+        if scores is not None:
+            trace.event("ucb", values=scores)
+
+        game.apply_move(moves[chosen])
+        game.current_player = 'Y' if game.current_player == 'R' else 'R'
+        node = chosen
+        path.append(node)
+
+def store_expand(store, node, game, max_nodes=None):
+    """
+    NodeStore version of expand: allocate the node's child block on first
+    expansion, then play the first child that has not been visited yet.
+    Blocks that would take the store past max_nodes are not allocated.
+    """
+    if store.child_count[node] == 0:
+        legal_moves = game.get_legal_moves()
+        if not legal_moves:
+            return None
+        if max_nodes is not None and store.size + len(legal_moves) > max_nodes:
+            return None
+        store.add_children(node, legal_moves)
+    visits = store.visits
+    for child in store.children(node):
+        if visits[child] == 0:
+            game.apply_move(store.move[child])
+            return child
+    return None
+
+def store_terminal_result(game, root_ply):
+    """
+    If the move into the node store_select stopped at ended the game, its
+    value for the player who made that move (1 for a win, 0 for a draw, as
+    mark_terminal scores it); None if the game goes on or that node is the root.
+    """
+    if len(game.moves) == root_ply:
+        return None
+    winner = game.check_winner_after(game.moves[-1], game.last_row)
+    if winner is None:
+        return None
+    return 0 if winner == 'Draw' else 1
+
+def store_backpropagate(store, path, result):
+    """
+    NodeStore version of backpropagate, with the same sign convention.
+    """
+    visits, value = store.visits, store.value
+    for node in reversed(path):
+        value[node] += result
+        visits[node] += 1
+        result = -result
+
+def grow_store_tree(store, root, game, verbosity, num_simulations, rollout, column_bias,
+                    deadline=None, max_nodes=None, trace=None):
+    """
+    grow_tree over a NodeStore. The only per-iteration allocations are
+    child blocks in the store's preallocated columns. Once max_nodes is
+    reached the tree stops growing and leaves are rolled out in place.
+    """
+    root_ply = len(game.moves)
+    path = []
+    iterations = 0
+    if trace is None and verbosity == "Verbose":
+        trace = TextTracer()
+    traced = None
+    while True:
+        if deadline is None:
+            if iterations >= num_simulations:
+                break
+        elif iterations % CLOCK_CHECK_INTERVAL == 0 and time.monotonic() >= deadline:
+            break
+        iterations += 1
+        if trace is not None:
+            traced = trace if trace.begin_iteration() else None
+        selected = store_select(store, root, game, traced, column_bias, path)
 
-    if verbosity in ["Verbose", "Brief"]:
-        for col in range(7):
-            node = root.children.get(col)
-            if node and node.ni > 0:
-                val = (node.wi / node.ni) * (-1 if current_player == 'R' else 1)
-                print(f"Column {col + 1}: {val:.2f}")
-            else:
-                print(f"Column {col + 1}: Null")
+        if traced is not None and selected != root:
+            traced.event("selected", move=store.move[selected])
 
-    best_move = max(
-        ((col, node) for col, node in root.children.items() if node.ni > 0),
-        key=lambda item: (item[1].wi / item[1].ni) * (-1 if current_player == 'R' else 1)
-    )[0]
+        terminal = store_terminal_result(game, root_ply)
+        new_node = None if terminal is not None else store_expand(store, selected, game, max_nodes)
+        if terminal is not None:
+            # A finished game is scored as it stands and never expanded
+            store_backpropagate(store, path, terminal)
+        elif new_node is None and store.child_count[selected] == 0 and game.get_legal_moves():
+            # Node cap reached: roll out from the selected leaf itself
+            mover = 'Y' if game.current_player == 'R' else 'R'
+            result = rollout(game)
+            store_backpropagate(store, path, result if mover == 'Y' else -result)
+        elif new_node is not None:
+            if traced is not None:
+                traced.event("added")
+
+            path.append(new_node)
+            mover = game.current_player
+            game.current_player = 'Y' if mover == 'R' else 'R'
+            result = rollout(game)
+
+            if traced is not None:
+                traced.event("result", value=result)
+
+            store_backpropagate(store, path, result if mover == 'Y' else -result)
+
+        game.undo_to(root_ply)
+    if trace is not None:
+        trace.flush()
+    return iterations
+
+def store_root_node(store, root, node_class=Node):
+    """
+    Copy a NodeStore root and its children into Node objects for choose_move.
+    """
+    node = node_class()
+    node.wi, node.ni = store.value[root], store.visits[root]
+    for handle in store.children(root):
+        child = node_class(parent=node, move=store.move[handle])
+        child.wi, child.ni = store.value[handle], store.visits[handle]
+        node.children[child.move] = child
+    return node
+
+def move_rank(node):
+    """
+    Sort key for the final move choice: proven wins first, then anything
+    not proven lost, then by average result.
+    """
+    return node.proven == 1, node.proven != -1, node.wi / node.ni if node.ni else 0
+
+def choose_move(root, current_player, verbosity, mirrored=False, report=None):
+    """
+    Print the root statistics (from Yellow's point of view, like the rollout
+    results) and return the column with the best value for the current player.
+    `mirrored` says the root's children were stored for the mirror image.
+    A `report` dict receives the printed values under "values" and the
+    root children's visit counts under "visits".
+    """
+    children = {(MIRRORED_COLUMN[move] if mirrored else move): child
+                for move, child in root.children.items()}
+    sign = -1 if current_player == 'R' else 1
+    values = [None] * 7
+    for col, node in children.items():
+        if node.proven is not None:
+            values[col] = node.proven * sign
+        elif node.ni > 0:
+            values[col] = node.wi / node.ni * sign
+    print_column_values(values, verbosity)
+    if report is not None:
+        report["values"] = values
+        report["visits"] = [children[col].ni if col in children else 0 for col in range(7)]
+
+    visited = [(col, node) for col, node in children.items() if node.ni > 0 or node.proven is not None]
+    if not visited:
+        visited = [(col, node) for col, node in children.items()]  # no iteration finished in time
+    best_move = max(visited, key=lambda item: move_rank(item[1]))[0]
 
     print("FINAL Move selected:", best_move + 1)
     return best_move
 
+def new_root(game, node_class=Node):
+    """
+    Create a root node with one child per legal move of the game.
+    Moves that end the game give proven children.
+    """
+    root = node_class()
+    legal_moves = game.get_legal_moves()
+    root.num_moves = len(legal_moves)
+    for move in legal_moves:
+        child = root.children[move] = node_class(parent=root, move=move)
+        game.apply_move(move)
+        mark_terminal(child, game, move)
+        game.undo_move()
+    return root
+
+def new_table(tt_size, mirror):
+    """
+    Create the transposition table for one search, or None if tt_size is 0.
+    """
+    return TranspositionTable(tt_size, mirror) if tt_size else None
+
+def split_budget(num_simulations, workers):
+    """
+    Split a simulation budget into `workers` near-equal shares.
+    """
+    share, extra = divmod(num_simulations, workers)
+    return [share + (1 if i < extra else 0) for i in range(workers)]
+
+def search_tree(board, current_player, verbosity, num_simulations, settings):
+    """
+    Grow one tree from the position with the given settings, on Node
+    objects or on a NodeStore. Returns the root as a Node, the number of
+    iterations run and the number of nodes evicted.
+    """
+    game = ConnectFour(board, current_player)
+    node_class = settings["node_class"]
+    max_nodes = settings["max_nodes"]
+    if settings["node_store"]:
+        store = NodeStore()
+        root = store.new_node()
+        store.add_children(root, game.get_legal_moves())
+        iterations = grow_store_tree(store, root, game, verbosity, num_simulations, settings["rollout"],
+                                     node_class.COLUMN_BIAS, settings["deadline"], max_nodes,
+                                     settings["trace"])
+        return store_root_node(store, root, node_class), iterations, 0
+
+    root = new_root(game, node_class)
+    budget = NodeBudget(max_nodes) if max_nodes else None
+    iterations = grow_tree(root, game, verbosity, num_simulations, settings["rollout"],
+                           new_table(settings["tt_size"], settings["mirror"]), settings["deadline"], budget,
+                           settings["stats"], settings["trace"])
+    return root, iterations, budget.evicted if budget else 0
+
+def _root_child_stats(board, current_player, num_simulations, seed, settings):
+    """
+    Worker entry point for root parallelism: grow an independent tree
+    and return only the root child statistics {move: (wi, ni, proven)}
+    together with the number of iterations run, nodes evicted and the
+    worker's SearchStats (None without instrumentation).
+    """
+    random.seed(seed)
+    root, iterations, evicted = search_tree(board, current_player, "None", num_simulations, settings)
+    stats = {move: (child.wi, child.ni, child.proven) for move, child in root.children.items()}
+    return stats, iterations, evicted, settings["stats"]
+
+def root_parallel_search(board, current_player, num_simulations, workers, settings):
+    """
+    Grow one tree per worker process from the same position with different
+    seeds, then merge the root child statistics into a single root.
+    The simulation budget is shared between the workers; a deadline
+    and node cap apply to each of them. A child proven by any worker is
+    proven in the merged root. Worker SearchStats are merged into
+    settings["stats"].
+    Returns the merged root and the total iterations and evictions.
+    """
+    game = ConnectFour(board, current_player)
+    root = new_root(game, settings["node_class"])
+    base_seed = random.getrandbits(32)
+    iterations = 0
+    evicted = 0
+    search_stats = settings["stats"]
+    worker_settings = dict(settings, stats=SearchStats() if search_stats is not None else None, trace=None)
+
+    with concurrent.futures.ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [
+            executor.submit(_root_child_stats, board, current_player, share, base_seed + i, worker_settings)
+            for i, share in enumerate(split_budget(num_simulations, workers))
+        ]
+        for future in futures:
+            stats, worker_iterations, worker_evicted, worker_stats = future.result()
+            iterations += worker_iterations
+            evicted += worker_evicted
+            if search_stats is not None:
+                search_stats.merge(worker_stats)
+            for move, (wi, ni, proven) in stats.items():
+                child = root.children[move]
+                child.wi += wi
+                child.ni += ni
+                if proven is not None:
+                    child.proven = proven
+                root.wi -= wi
+                root.ni += ni
+    if search_stats is not None and search_stats.callback is not None:
+        search_stats.callback(search_stats)
+    return root, iterations, evicted
+
+# Leaves sent to a rollout worker per task, and tasks kept in flight per worker
+LEAF_BATCH = 16
+TASKS_PER_WORKER = 2
+
+def apply_virtual_loss(path, sign=1):
+    """
+    Count an in-flight rollout as a lost visit for every node on the path,
+    so other descents steer away from it until the result comes back.
+    Call again with sign=-1 to remove it.
+    """
+    for node in path:
+        node.wi -= sign
+        node.ni += sign
+
+def _rollout_leaves(leaves, rollout, seed):
+    """
+    Worker entry point for tree parallelism: play one rollout from each
+    (red, yellow, player to move) leaf and return the results.
+    """
+    random.seed(seed)
+    return [rollout(ConnectFour.from_bitboards(red, yellow, player))
+            for red, yellow, player in leaves]
+
+def _rollout_executor(workers):
+    """
+    Threads on a free-threaded interpreter, rollout-only processes otherwise.
+    """
+    if not getattr(sys, "_is_gil_enabled", lambda: True)():
+        return concurrent.futures.ThreadPoolExecutor(max_workers=workers)
+    return concurrent.futures.ProcessPoolExecutor(max_workers=workers)
+
+def tree_parallel_search(board, current_player, num_simulations, workers, settings):
+    """
+    Descend one shared tree in this process and run the leaf rollouts on
+    `workers` executors fed in batches of LEAF_BATCH leaves. Virtual loss
+    keeps outstanding descents from all piling onto the same path.
+    Leaves with a proven value are backpropagated without a rollout, and
+    no new descents start once the root is proven.
+    Returns the root and the number of iterations started.
+    """
+    game = ConnectFour(board, current_player)
+    root = new_root(game, settings["node_class"])
+    rollout = settings["rollout"]
+    tt = new_table(settings["tt_size"], settings["mirror"])
+    deadline = settings["deadline"]
+    root_ply = len(game.moves)
+    pending = {}
+    started = 0
+
+    def budget_left():
+        if root.proven is not None:
+            return False
+        if deadline is None:
+            return started < num_simulations
+        return time.monotonic() < deadline
+
+    with _rollout_executor(workers) as executor:
+        while budget_left() or pending:
+            while budget_left() and len(pending) < workers * TASKS_PER_WORKER:
+                leaves, paths = [], []
+                while (len(leaves) < LEAF_BATCH and root.proven is None
+                       and (deadline is not None or started < num_simulations)):
+                    started += 1
+                    selected_node, path = select(root, game, game.current_player)
+                    if selected_node.proven is not None:
+                        backpropagate(path, selected_node.proven)
+                        new_node = None
+                    else:
+                        new_node, move_played = expand(selected_node, game, tt)
+                    if new_node and new_node.proven is not None:
+                        path.append(new_node)
+                        backpropagate(path, new_node.proven)
+                    elif new_node:
+                        path.append(new_node)
+                        mover = game.current_player
+                        apply_virtual_loss(path)
+                        leaves.append((game.red, game.yellow, 'Y' if mover == 'R' else 'R'))
+                        paths.append((path, mover))
+                    game.undo_to(root_ply)
+                if leaves:
+                    future = executor.submit(_rollout_leaves, leaves, rollout, random.getrandbits(32))
+                    pending[future] = paths
+
+            if not pending:
+                break
+            done, _ = concurrent.futures.wait(pending, return_when=concurrent.futures.FIRST_COMPLETED)
+            for future in done:
+                for (path, mover), result in zip(pending.pop(future), future.result()):
+                    apply_virtual_loss(path, sign=-1)
+                    backpropagate(path, result if mover == 'Y' else -result)
+    return root, started, 0
+
+def uct_search(board, current_player, verbosity="Brief", num_simulations=500,
+               rollout=simulate_random_game, node_class=Node, workers=1, parallel="root",
+               tt_size=DEFAULT_MAX_ENTRIES, mirror=False, time_limit_ms=None, node_store=False,
+               max_nodes=None, max_memory_mb=None, endgame_cells=ENDGAME_EMPTY_CELLS, report=None,
+               stats=None, trace=None):
+    """
+    Perform UCT search to find the best move from the current board state.
+    The improved variants reuse this loop with their own rollout policy
+    or Node subclass. With workers > 1 the search runs root-parallel, or
+    on one shared tree with parallel="tree" (the per-iteration trace is
+    only recorded by single-worker searches).
+    Transpositions share nodes through a table of up to tt_size positions
+    (0 disables it); mirror=True also merges mirror-image positions.
+    With time_limit_ms the search runs until the time is up instead of
+    for num_simulations iterations, and reports the iterations completed.
+    node_store=True keeps the tree in a compact NodeStore instead of Node
+    objects (no transposition table; tree-parallel search still uses Nodes).
+    max_nodes (or max_memory_mb, converted with nodes_for_memory) caps the
+    tree size: Node trees evict their least-visited subtrees and a
+    NodeStore stops growing. Evicted nodes are reported.
+    Positions with fewer than endgame_cells empty cells are solved exactly
+    by algorithms.solver instead (0 disables this).
+    A `report` dict receives the printed column values (see choose_move)
+    and the iterations run under "simulations".
+    A SearchStats (utils/search_stats.py) collects per-phase timings and
+    histograms for Node-tree searches, root-parallel ones included; the
+    NodeStore and tree-parallel loops are not instrumented.
+    `trace`, a Tracer (utils/trace.py), records the iterations as
+    structured events; without one, Verbose prints them as text.
+    """
+    if in_endgame(ConnectFour(board, current_player), endgame_cells):
+        return solve_position(board, current_player, verbosity, report=report)
+    if max_memory_mb and not max_nodes:
+        max_nodes = nodes_for_memory(max_memory_mb, node_store)
+    settings = {
+        "rollout": rollout,
+        "node_class": node_class,
+        "tt_size": tt_size,
+        "mirror": mirror,
+        "deadline": deadline_after(time_limit_ms),
+        "node_store": node_store,
+        "max_nodes": max_nodes,
+        "stats": stats,
+        "trace": trace,
+    }
+    if workers > 1 and parallel == "tree":
+        root, iterations, evicted = tree_parallel_search(board, current_player, num_simulations, workers, settings)
+    elif workers > 1:
+        root, iterations, evicted = root_parallel_search(board, current_player, num_simulations, workers, settings)
+    else:
+        root, iterations, evicted = search_tree(board, current_player, verbosity, num_simulations, settings)
+
+    if time_limit_ms and verbosity in ["Verbose", "Brief"]:
+        print(f"Iterations completed: {iterations}")
+    if max_nodes and verbosity in ["Verbose", "Brief"]:
+        print(f"Nodes evicted: {evicted}")
+    if report is not None:
+        report["simulations"] = iterations
+    return choose_move(root, current_player, verbosity, report=report)
+
+class UCTAgent:
+    """
+    UCT player that keeps its search tree between the moves of one game.
+    Every move played is passed to observe(), which re-roots the tree at the
+    matching child; after our move and the opponent's reply the next search
+    starts from the grandchild with its subtree statistics intact.
+    With top_up=True each search only runs enough simulations to bring the
+    root up to num_simulations visits; with time_limit_ms each search runs
+    for that long instead. max_nodes or max_memory_mb bound the kept tree
+    and `evicted` counts the nodes pruned to stay within it. Endgames with
+    fewer than endgame_cells empty cells are played by a Solver that keeps
+    its table for the rest of the game. `stats`, a SearchStats, accumulates
+    instrumentation over every search the agent runs, and `trace`, a
+    Tracer, records their iterations.
+    """
+    def __init__(self, num_simulations=500, rollout=simulate_random_game, node_class=Node,
+                 tt_size=DEFAULT_MAX_ENTRIES, mirror=False, verbosity="None", top_up=False,
+                 time_limit_ms=None, max_nodes=None, max_memory_mb=None,
+                 endgame_cells=ENDGAME_EMPTY_CELLS, stats=None, trace=None):
+        if max_memory_mb and not max_nodes:
+            max_nodes = nodes_for_memory(max_memory_mb)
+        self.budget = NodeBudget(max_nodes) if max_nodes else None
+        self.endgame_cells = endgame_cells
+        self.solver = None
+        self.stats = stats
+        self.trace = trace
+        self.num_simulations = num_simulations
+        self.top_up = top_up
+        self.time_limit_ms = time_limit_ms
+        self.iterations = 0  # iterations run by the last search
+        self.rollout = rollout
+        self.node_class = node_class
+        self.tt_size = tt_size
+        self.mirror = mirror
+        self.verbosity = verbosity
+        self.game = None
+        self.root = None
+        self.tt = None
+        self.carried_visits = 0  # root visits kept from earlier searches, for the last move
+
+    @property
+    def evicted(self):
+        return self.budget.evicted if self.budget else 0
+
+    def choose_move(self, game, report=None):
+        """
+        Search from the game's position, reusing the kept tree if it matches.
+        A `report` dict receives the column values (see choose_move).
+        """
+        if self.game is None or self.game.position_key() != game.position_key():
+            self.game = ConnectFour.from_bitboards(game.red, game.yellow, game.current_player)
+            self.root = None
+        self.game.current_player = game.current_player
+        if in_endgame(self.game, self.endgame_cells):
+            if self.solver is None:
+                self.solver = Solver()
+            self.carried_visits = 0
+            self.iterations = 0
+            results = self.solver.solve(self.game)
+            if report is not None:
+                sign = 1 if game.current_player == 'Y' else -1
+                report["values"] = [results[col] * sign if col in results else None for col in range(7)]
+            best_move = best_solved_move(results)
+            print("FINAL Move selected:", best_move + 1)
+            return best_move
+        if self.root is None:
+            self.root = new_root(self.game, self.node_class)
+            self.tt = new_table(self.tt_size, self.mirror)
+
+        self.carried_visits = self.root.ni
+        budget = self.num_simulations
+        if self.top_up:
+            budget = max(1, budget - self.carried_visits)
+        self.iterations = grow_tree(self.root, self.game, self.verbosity, budget, self.rollout,
+                                    self.tt, deadline_after(self.time_limit_ms), self.budget, self.stats,
+                                    self.trace)
+        return choose_move(self.root, self.game.current_player, self.verbosity,
+                           is_mirrored(self.root, self.game), report)
+
+    def observe(self, move):
+        """
+        Record a move played by either side and move the root down to it.
+        """
+        if self.game is None:
+            return
+        if self.root is not None:
+            stored_move = MIRRORED_COLUMN[move] if is_mirrored(self.root, self.game) else move
+            self.root = self.root.children.get(stored_move)
+        self.game.apply_move(move)
+        self.game.current_player = 'Y' if self.game.current_player == 'R' else 'R'
+        if self.root is not None:
+            self.root.parent = None
+            if self.tt is not None:
+                self.tt.retain(self.root)
+
 if __name__ == "__main__":
     if len(sys.argv) != 4:
         print("Usage: python uct.py <input_file> <verbosity> <num_simulations>")
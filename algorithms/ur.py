@@ -27,8 +27,9 @@ def run_ur(board, current_player, verbosity="Brief", parameter=0):
         game.apply_move(selected_move)
         move_count += 1
 
-        if game.check_winner() in ['R', 'Y']:
-            result = f"{game.check_winner()} wins"
+        winner = game.check_winner_after(selected_move, game.last_row)
+        if winner in ['R', 'Y']:
+            result = f"{winner} wins"
             break
 
         if verbosity == "Verbose":
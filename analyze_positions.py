@@ -0,0 +1,117 @@
+"""
+Batch position analyzer: runs a search on every position of a stream
+and writes one JSON result line per position, in input order.
+
+Positions come from board files (a directory, or a glob such as
+"boards/*improved*.txt"), from a packed position file
+(utils/packed_positions.py) or from JSONL position records such as
+{"moves": "4453"} or {"board": [...], "player": "R"} (utils/positions.py),
+optionally with "id", "algorithm", "budget" and "options". They are
+read lazily and fanned out over a process pool with a bounded number
+in flight, so memory stays flat however long the input is.
+
+Each result line echoes the position's name (file name, or the record's
+"id", else its index) and gives the algorithm, chosen column (0-based
+`move`), column values from Yellow's point of view, the simulations
+run and the time taken, or an "error".
+"""
+import io
+import os
+import sys
+import json
+import time
+import random
+import contextlib
+import concurrent.futures
+from collections import deque
+
+from utils.algorithm_table import ALGORITHMS, load_search, request_options
+from utils.positions import request_game, open_positions
+
+# Positions in flight per worker process
+PENDING_PER_WORKER = 4
+
+
+def analyze_record(task):
+    """
+    Worker entry point: search one record and return its result line as a dict.
+    """
+    index, record, algorithm, budget, seed, options = task
+    name = record.get("id", index) if isinstance(record, dict) else index
+    started = time.perf_counter()
+    try:
+        if not isinstance(record, dict):
+            raise ValueError(f"not a JSON object: {str(record)[:80]!r}")
+        algorithm = algorithm or record.get("algorithm", "UCT")
+        if algorithm not in ALGORITHMS or algorithm == "UR":
+            raise ValueError(f"cannot analyze with {algorithm!r}")
+        game = request_game(record)
+        if game.check_winner() is not None:
+            raise ValueError("the game is already over")
+        budget = int(record.get("budget", budget))
+        options = request_options(algorithm, {**options, **record.get("options", {})})
+
+        report = {}
+        if seed is not None:
+            random.seed(seed + index)
+        with contextlib.redirect_stdout(io.StringIO()):
+            move = load_search(algorithm)(game.board, game.current_player, "None", budget, report=report, **options)
+    except Exception as error:
+        return {"id": name, "error": f"{type(error).__name__}: {error}"}
+    return {
+        "id": name,
+        "algorithm": algorithm,
+        "move": move,
+        "values": report.get("values"),
+        "simulations": report.get("simulations"),
+        "elapsed_ms": round((time.perf_counter() - started) * 1000, 3),
+    }
+
+
+def analyze_stream(records, algorithm=None, budget=500, workers=None, seed=None, options=None):
+    """
+    Analyze every record of an iterable on a process pool and yield the
+    results in input order. `algorithm` (None: each record's own, UCT by
+    default), `budget` and `options` apply to records that do not set
+    their own. With a seed, position i is searched after seeding with
+    seed + i, so results do not depend on the worker that ran them.
+    At most PENDING_PER_WORKER positions per worker are read ahead.
+    """
+    workers = workers or os.cpu_count()
+    pending = deque()
+    with concurrent.futures.ProcessPoolExecutor(max_workers=workers) as executor:
+        for index, record in enumerate(records):
+            if len(pending) >= workers * PENDING_PER_WORKER:
+                yield pending.popleft().result()
+            pending.append(executor.submit(analyze_record, (index, record, algorithm, budget, seed, options or {})))
+        while pending:
+            yield pending.popleft().result()
+
+
+def main():
+    """
+    Analyze the positions of an input and write the results as JSONL.
+    """
+    if len(sys.argv) not in range(4, 8):
+        print("Usage: python analyze_positions.py <input_dir|board_glob|positions.jsonl|positions.c4p|-> <algorithm|-> "
+              "<budget> [output_jsonl|-] [workers] [seed]")
+        sys.exit(1)
+
+    source = sys.argv[1]
+    algorithm = None if sys.argv[2] == "-" else sys.argv[2]
+    budget = int(sys.argv[3])
+    output = sys.argv[4] if len(sys.argv) > 4 else "-"
+    workers = int(sys.argv[5]) if len(sys.argv) > 5 else None
+    seed = int(sys.argv[6]) if len(sys.argv) > 6 else None
+
+    out = sys.stdout if output == "-" else open(output, "w")
+    try:
+        for result in analyze_stream(open_positions(source), algorithm, budget, workers, seed):
+            out.write(json.dumps(result) + "\n")
+            out.flush()
+    finally:
+        if out is not sys.stdout:
+            out.close()
+
+if __name__ == "__main__":
+    main()
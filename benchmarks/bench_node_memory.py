@@ -0,0 +1,68 @@
+import sys
+import os
+import random
+import tracemalloc
+
+# Ensure access to parent directory for module imports
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from connectFour import ConnectFour
+from algorithms.uct import Node, new_root, grow_tree, grow_store_tree
+from utils.monte_utils import simulate_random_game
+from utils.node_store import NodeStore
+
+def count_nodes(root):
+    """
+    Count the Node objects reachable from a root.
+    """
+    count, stack = 0, [root]
+    while stack:
+        node = stack.pop()
+        count += 1
+        stack.extend(node.children.values())
+    return count
+
+def measure_objects(board, num_simulations):
+    """
+    Grow a Node-object tree and return (nodes, bytes allocated).
+    """
+    tracemalloc.start()
+    game = ConnectFour(board, 'R')
+    root = new_root(game)
+    grow_tree(root, game, "None", num_simulations, simulate_random_game)
+    allocated = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return count_nodes(root), allocated
+
+def measure_store(board, num_simulations):
+    """
+    Grow a NodeStore tree and return (nodes, bytes allocated).
+    """
+    tracemalloc.start()
+    game = ConnectFour(board, 'R')
+    store = NodeStore()
+    root = store.new_node()
+    store.add_children(root, game.get_legal_moves())
+    grow_store_tree(store, root, game, "None", num_simulations, simulate_random_game, Node.COLUMN_BIAS)
+    allocated = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return store.size, allocated
+
+def run_benchmark(sizes=(1000, 10000, 50000)):
+    """
+    Report bytes per node and per simulation for dict-based Node trees and
+    the NodeStore. The NodeStore counts every slot of a child block, so its
+    node count is higher for the same search. The transposition table is
+    left out so both trees hold the same positions.
+    """
+    board = [['O'] * 7 for _ in range(6)]
+    print("simulations\tbackend\tnodes\tbytes\tbytes/node\tbytes/simulation")
+    for num_simulations in sizes:
+        for name, measure in (("Node", measure_objects), ("NodeStore", measure_store)):
+            random.seed(0)
+            nodes, allocated = measure(board, num_simulations)
+            print(f"{num_simulations}\t{name}\t{nodes}\t{allocated}\t{allocated / nodes:.1f}"
+                  f"\t{allocated / num_simulations:.1f}")
+
+if __name__ == "__main__":
+    run_benchmark()
@@ -0,0 +1,43 @@
+import sys
+import os
+import time
+
+# Ensure access to parent directory for module imports
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from algorithms.uct import uct_search
+from utils.file_utils import load_board_from_file
+
+def measure(board, current_player, num_simulations, workers, parallel):
+    """
+    Time one parallel UCT search and return simulations per second.
+    """
+    start = time.perf_counter()
+    uct_search(board, current_player, "None", num_simulations, workers=workers, parallel=parallel)
+    return num_simulations / (time.perf_counter() - start)
+
+def run_benchmark(board_path="boards/empty.txt", sims_per_worker=5000):
+    """
+    Report simulations/sec and speedup of root- and tree-parallel search
+    for 1, 2, 4, ... workers up to the core count.
+    The total budget grows with the worker count so each worker does the same work.
+    """
+    algorithm, current_player, board = load_board_from_file(board_path)
+    cores = os.cpu_count() or 1
+    counts = [1]
+    while counts[-1] * 2 <= cores:
+        counts.append(counts[-1] * 2)
+    if counts[-1] != cores:
+        counts.append(cores)
+
+    baseline = None
+    print("mode\tworkers\tsims/sec\tspeedup")
+    for parallel in ("root", "tree"):
+        for workers in counts:
+            rate = measure(board, current_player, sims_per_worker * workers, workers, parallel)
+            baseline = baseline or rate
+            print(f"{parallel}\t{workers}\t{rate:.0f}\t{rate / baseline:.2f}x")
+
+if __name__ == "__main__":
+    board_path = sys.argv[1] if len(sys.argv) > 1 else "boards/empty.txt"
+    run_benchmark(board_path)
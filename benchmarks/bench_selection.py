@@ -0,0 +1,90 @@
+import sys
+import os
+import math
+import time
+import random
+
+# Ensure access to parent directory for module imports
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from connectFour import ConnectFour
+from algorithms.uct import new_root, grow_tree, select
+from algorithms.improved_uct_ucb import Node
+from utils.monte_utils import simulate_random_game, basic_heuristic
+
+def legacy_score(child, total_simulations, player, exploration_const=math.sqrt(2)):
+    """
+    Improved_UCT_UCB child score as it was computed before the lookup
+    tables: log of the parent visits per child and a fresh board per call.
+    Children proven lost score -inf, as in uct.score_children.
+    """
+    if child.ni == 0:
+        return float('inf')
+    if child.proven == -1:
+        return float('-inf')
+    value_estimate = child.wi / child.ni
+    exploration = exploration_const * math.sqrt(math.log(total_simulations) / child.ni)
+    bias = 0.3 * basic_heuristic(ConnectFour([['O'] * 7 for _ in range(6)], player), child.move)
+    return value_estimate + exploration + bias
+
+def legacy_select(node, game, player):
+    """
+    select() with the old one-call-per-child scoring. Like select(), it
+    stops at proven nodes; the benchmark tree is grown without a
+    transposition table, so no node is mirrored.
+    """
+    path = [node]
+    current_node = node
+    while current_node.proven is None:
+        legal_moves = game.get_legal_moves()
+        if not legal_moves:
+            break
+        children = current_node.children
+        if [move for move in legal_moves if move not in children]:
+            break
+        best_move = max(children, key=lambda m: legacy_score(children[m], current_node.ni, game.current_player))
+        game.apply_move(best_move)
+        current_node = children[best_move]
+        path.append(current_node)
+        game.current_player = 'Y' if game.current_player == 'R' else 'R'
+    return current_node, path
+
+def time_descents(select_fn, root, game, descents):
+    """
+    Time `descents` root-to-leaf selections, rewinding the game after each.
+    Returns (seconds, total nodes visited).
+    """
+    root_ply = len(game.moves)
+    player = game.current_player
+    steps = 0
+    start = time.perf_counter()
+    for _ in range(descents):
+        _, path = select_fn(root, game, player)
+        steps += len(path)
+        game.undo_to(root_ply)
+        game.current_player = player
+    return time.perf_counter() - start, steps
+
+def run_benchmark(tree_simulations=20000, descents=20000):
+    """
+    Grow one Improved_UCT_UCB tree, then time selection descents through it
+    with the old per-child scoring and with the table-driven scoring.
+    Both prune proven nodes the same way, so they visit the same nodes
+    unless rounding breaks a tie between two children differently; the
+    node counts printed show whether the workloads matched.
+    """
+    random.seed(0)
+    game = ConnectFour([['O'] * 7 for _ in range(6)], 'R')
+    root = new_root(game, Node)
+    grow_tree(root, game, "None", tree_simulations, simulate_random_game)
+
+    print("scoring\tdescents\tnodes\tseconds\tnodes/sec")
+    results = {}
+    for name, select_fn in (("legacy", legacy_select), ("tables", select)):
+        seconds, steps = time_descents(select_fn, root, game, descents)
+        results[name] = seconds
+        print(f"{name}\t{descents}\t{steps}\t{seconds:.3f}\t{steps / seconds:.0f}")
+    print(f"Speedup: {results['legacy'] / results['tables']:.1f}x")
+
+if __name__ == "__main__":
+    run_benchmark()
@@ -0,0 +1,356 @@
+import sys
+import os
+import io
+import json
+import time
+import random
+import contextlib
+import tracemalloc
+import multiprocessing
+import concurrent.futures
+
+# Ensure access to parent directory for module imports
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from connectFour import ConnectFour, ROWS, COLUMNS, EMPTY
+from algorithms.uct import new_root, grow_tree
+from algorithms.batch_uct import VARIANTS as LOCKSTEP_VARIANTS, grow_trees_lockstep
+from utils import algorithm_table, batch_rollout
+from utils.file_utils import load_board_from_file
+
+SEED = 12345
+# The suite runs in this many fresh interpreters, one after the other, and
+# each metric keeps its best value: memory layout alone can move a timing
+# by a fifth from one process to the next
+PROCESSES = 3
+# Timing rounds per process: every round times one batch of every metric
+# and each metric keeps its best batch, so a slow spell of the machine
+# spoils one round of every metric rather than all the samples of a few
+REPEATS = 5
+# Each timed batch repeats the function for at least this long, so short
+# functions are not measured at the scale of timer and scheduler noise
+MIN_BATCH_SEC = 0.05
+
+# Allowed slowdown (a fraction) per metric name before it counts as a
+# regression; memory is deterministic under the fixed seed, timings are not
+TOLERANCES = {
+    "check_winner_per_sec": 0.15,
+    "check_winner_after_per_sec": 0.15,
+    "rollouts_per_sec": 0.2,
+    "iterations_per_sec": 0.2,
+    "lockstep_iterations_per_sec": 0.25,
+    "time_to_move_sec": 0.25,
+    "peak_memory_bytes": 0.05,
+}
+DEFAULT_TOLERANCE = 0.2
+
+BOARDS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'boards')
+BENCH_BOARDS = ("test1.txt", "bench_midgame.txt", "bench_late.txt", "bench_endgame.txt")
+
+# Search parameter of every algorithm but UR, which takes none
+PARAMETER = 500
+
+ROLLOUTS = 2000
+BATCH_ROLLOUTS = 20000
+TREE_ITERATIONS = 3000
+LOCKSTEP_TREES = 64
+LOCKSTEP_ITERATIONS = 300
+CHECK_WINNER_CALLS = 20000
+
+class Timing:
+    """
+    A function to time and the work one run of it does: the metric is
+    work per second, or seconds per run if work is None.
+    """
+    def __init__(self, function, work=None):
+        self.function = function
+        self.work = work
+
+def timed_batch(function, calls):
+    """
+    Wall time of `calls` runs of function(), each seeded the same way.
+    """
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        for _ in range(calls):
+            random.seed(SEED)
+            function()
+    return time.perf_counter() - start
+
+def batch_calls(function, min_batch=MIN_BATCH_SEC):
+    """
+    Runs of function() per batch for a batch to take at least min_batch.
+    """
+    calls = 1
+    seconds = timed_batch(function, calls)
+    while seconds < min_batch:
+        calls = max(calls * 2, int(calls * 1.2 * min_batch / seconds)) if seconds > 0 else calls * 10
+        seconds = timed_batch(function, calls)
+    return calls
+
+def measure(timings, repeats=REPEATS, min_batch=MIN_BATCH_SEC):
+    """
+    Best seconds per run of every Timing in a {path: Timing} dict, over
+    `repeats` rounds that each time one batch of every function.
+    """
+    calls = {path: batch_calls(timing.function, min_batch) for path, timing in timings.items()}
+    best = {path: float("inf") for path in timings}
+    for _ in range(repeats):
+        for path, timing in timings.items():
+            best[path] = min(best[path], timed_batch(timing.function, calls[path]) / calls[path])
+    return best
+
+def empty_game():
+    return ConnectFour([[EMPTY] * COLUMNS for _ in range(ROWS)], 'R')
+
+def sample_positions(count=200):
+    """
+    Fixed set of undecided positions reached by seeded random play.
+    """
+    rng = random.Random(SEED)
+    positions = []
+    while len(positions) < count:
+        game = empty_game()
+        for _ in range(rng.randrange(1, 30)):
+            move = rng.choice(game.get_legal_moves())
+            game.apply_move(move)
+            if game.check_winner_after(move, game.last_row) is not None:
+                game.undo_move()
+                break
+            game.current_player = 'Y' if game.current_player == 'R' else 'R'
+        positions.append(game)
+    return positions
+
+def check_winner_timings():
+    """
+    check_winner and check_winner_after calls over sampled positions.
+    """
+    positions = sample_positions()
+    rounds = CHECK_WINNER_CALLS // len(positions)
+
+    def full_checks():
+        for _ in range(rounds):
+            for game in positions:
+                game.check_winner()
+
+    def incremental_checks():
+        for _ in range(rounds):
+            for game in positions:
+                if game.moves:
+                    game.check_winner_after(game.moves[-1], ROWS - game.heights[game.moves[-1]])
+
+    calls = rounds * len(positions)
+    return {
+        "check_winner_per_sec": Timing(full_checks, calls),
+        "check_winner_after_per_sec": Timing(incremental_checks, calls),
+    }
+
+def rollout_timing(name, rollout):
+    """
+    Rollouts from the empty board with the algorithm's policy; PMCGS uses
+    the batch engine when NumPy is installed.
+    """
+    game = empty_game()
+    if name == "PMCGS" and batch_rollout.available():
+        moves = game.get_legal_moves()
+        per_move = BATCH_ROLLOUTS // len(moves)
+        return Timing(lambda: batch_rollout.batch_random_rollouts(game, moves, per_move), per_move * len(moves))
+
+    def rollouts():
+        for _ in range(ROLLOUTS):
+            rollout(game)
+            game.undo_to(0)
+            game.current_player = 'R'
+    return Timing(rollouts, ROLLOUTS)
+
+def iteration_timing(rollout, node_class):
+    """
+    UCT iterations growing a fresh tree from the empty board.
+    """
+    def search():
+        game = empty_game()
+        grow_tree(new_root(game, node_class), game, "None", TREE_ITERATIONS, rollout)
+    return Timing(search, TREE_ITERATIONS)
+
+def lockstep_timing(name):
+    """
+    Iterations over LOCKSTEP_TREES trees grown together from the empty
+    board by algorithms.batch_uct.
+    """
+    node_class, heuristic = LOCKSTEP_VARIANTS[name]
+
+    def search():
+        trees = []
+        for _ in range(LOCKSTEP_TREES):
+            game = empty_game()
+            trees.append((new_root(game, node_class), game, None, heuristic))
+        grow_trees_lockstep(trees, LOCKSTEP_ITERATIONS)
+    return Timing(search, LOCKSTEP_TREES * LOCKSTEP_ITERATIONS)
+
+def peak_memory(search, parameter):
+    """
+    Peak bytes allocated while choosing a move on the empty board.
+    """
+    board = [[EMPTY] * COLUMNS for _ in range(ROWS)]
+    random.seed(SEED)
+    tracemalloc.start()
+    with contextlib.redirect_stdout(io.StringIO()):
+        search(board, 'R', "None", parameter)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return peak
+
+def time_to_move(search, parameter):
+    """
+    Choosing a move on every benchmark board in turn (for UR, its entry
+    point, which plays out a whole random game). The boards are timed
+    together: the endgame ones are solved in well under a millisecond and
+    would only measure call overhead on their own.
+    """
+    positions = []
+    for board_file in BENCH_BOARDS:
+        _, current_player, board = load_board_from_file(os.path.join(BOARDS_DIR, board_file))
+        positions.append((board, current_player))
+
+    def choose_moves():
+        for board, current_player in positions:
+            search(board, current_player, "None", parameter)
+    return Timing(choose_moves)
+
+def measure_suite():
+    """
+    Measure every metric in this process and return them as a
+    JSON-serializable dict.
+    """
+    results = {"core": check_winner_timings(), "algorithms": {}}
+    for name in algorithm_table.ALGORITHMS:
+        search, parameter = algorithm_table.load_search(name), (0 if name == "UR" else PARAMETER)
+        rollout, node_class = algorithm_table.rollout_policy(name), algorithm_table.node_class(name)
+        metrics = {}
+        if rollout is not None:
+            metrics["rollouts_per_sec"] = rollout_timing(name, rollout)
+        if node_class is not None:
+            metrics["iterations_per_sec"] = iteration_timing(rollout, node_class)
+            metrics["lockstep_iterations_per_sec"] = lockstep_timing(name)
+        metrics["peak_memory_bytes"] = peak_memory(search, parameter)
+        metrics["time_to_move_sec"] = time_to_move(search, parameter)
+        results["algorithms"][name] = metrics
+
+    timings = {path: value for path, value in flatten(results).items() if isinstance(value, Timing)}
+    for path, seconds in measure(timings).items():
+        work = timings[path].work
+        set_path(results, path, work / seconds if work is not None else seconds)
+    return results
+
+def run_suite(processes=PROCESSES):
+    """
+    Run measure_suite() in `processes` freshly spawned interpreters in turn
+    and keep the best value of every metric. Metrics ending in _per_sec
+    are better when higher; all others (seconds, bytes) are better when
+    lower.
+    """
+    context = multiprocessing.get_context("spawn")
+    runs = []
+    for _ in range(processes):
+        with concurrent.futures.ProcessPoolExecutor(max_workers=1, mp_context=context) as executor:
+            runs.append(executor.submit(measure_suite).result())
+
+    results = runs[0]
+    for run in runs[1:]:
+        keep_best(results, run)
+    return results
+
+def keep_best(results, run):
+    """
+    Update `results` in place with every metric of `run` that is better.
+    """
+    best = flatten(results)
+    for path, value in flatten(run).items():
+        if path in best and (value > best[path] if "_per_sec" in path else value < best[path]):
+            set_path(results, path, value)
+
+def set_path(results, path, value):
+    """
+    Set the value at a "section/name/metric" path of nested dicts.
+    """
+    *sections, metric = path.split("/")
+    for section in sections:
+        results = results[section]
+    results[metric] = value
+
+def flatten(results, prefix=""):
+    """
+    Map "section/name/metric" paths to values.
+    """
+    flat = {}
+    for key, value in results.items():
+        path = f"{prefix}/{key}" if prefix else key
+        if isinstance(value, dict):
+            flat.update(flatten(value, path))
+        else:
+            flat[path] = value
+    return flat
+
+def regressions(results, baseline, tolerance=None):
+    """
+    Metrics that are worse than the baseline by more than their tolerance
+    (a fraction, from TOLERANCES unless `tolerance` overrides them all),
+    as (path, baseline value, new value) tuples.
+    Metrics missing from either side are skipped.
+    """
+    current = flatten(results)
+    found = []
+    for path, old in flatten(baseline).items():
+        new = current.get(path)
+        if new is None or not old:
+            continue
+        if tolerance is None:
+            allowed = TOLERANCES.get(path.rsplit("/", 1)[-1], DEFAULT_TOLERANCE)
+        else:
+            allowed = tolerance
+        if "_per_sec" in path:
+            worse = new < old * (1 - allowed)
+        else:
+            worse = new > old * (1 + allowed)
+        if worse:
+            found.append((path, old, new))
+    return found
+
+def main():
+    """
+    Run the suite, write the results as JSON and, given a baseline file,
+    exit with status 1 if any metric regressed beyond its tolerance. A
+    regression found on the first run is only reported if it survives a
+    second run of the suite (each metric keeping its best of both), so a
+    slow spell of the machine does not fail the check.
+    """
+    if len(sys.argv) not in (2, 3, 4):
+        print("Usage: python bench_suite.py <output_json> [baseline_json] [tolerance]")
+        sys.exit(2)
+
+    baseline, found = None, []
+    if len(sys.argv) >= 3:
+        with open(sys.argv[2]) as file:
+            baseline = json.load(file)
+    tolerance = float(sys.argv[3]) if len(sys.argv) == 4 else None
+
+    results = run_suite()
+    if baseline is not None and regressions(results, baseline, tolerance):
+        print("Possible regressions; measuring again to confirm")
+        keep_best(results, run_suite())
+        found = regressions(results, baseline, tolerance)
+
+    with open(sys.argv[1], "w") as file:
+        json.dump(results, file, indent=2, sort_keys=True)
+    for path, value in sorted(flatten(results).items()):
+        print(f"{path}\t{value:.6g}")
+
+    if baseline is not None:
+        for path, old, new in found:
+            print(f"REGRESSION {path}: {old:.6g} -> {new:.6g}")
+        if found:
+            sys.exit(1)
+        print("No regressions beyond " + (f"{tolerance:.0%}" if tolerance is not None else "the metric tolerances"))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+import os
+import sys
+import random
+import concurrent.futures
+
+from connectFour import ConnectFour, ROWS, COLUMNS, EMPTY
+from algorithms.uct import new_root, new_table, grow_tree, move_rank
+from utils.bitboard import MIRRORED_COLUMN
+from utils.monte_utils import simulate_random_game
+from utils.opening_book import DEFAULT_BOOK, canonical_book_key, write_book
+from utils.transposition import DEFAULT_MAX_ENTRIES
+
+def book_positions(depth):
+    """
+    Every position reachable from the empty board (Red to move) in at most
+    `depth` plies that is still undecided, one per mirror pair.
+    Returns {canonical key: (red, yellow, player to move, mirrored)}.
+    """
+    start = ConnectFour([[EMPTY] * COLUMNS for _ in range(ROWS)], 'R')
+    positions = {}
+    frontier = [start]
+    for ply in range(depth + 1):
+        next_frontier = []
+        for game in frontier:
+            key, mirrored = canonical_book_key(game.red, game.yellow, game.current_player)
+            if key in positions:
+                continue
+            positions[key] = (game.red, game.yellow, game.current_player, mirrored)
+            if ply == depth:
+                continue
+            for move in game.get_legal_moves():
+                child = ConnectFour.from_bitboards(game.red, game.yellow, game.current_player)
+                child.apply_move(move)
+                if child.check_winner_after(move, child.last_row) is None:
+                    child.current_player = 'Y' if game.current_player == 'R' else 'R'
+                    next_frontier.append(child)
+        frontier = next_frontier
+    return positions
+
+def _search_position(task):
+    """
+    Worker entry point: UCT search of one book position.
+    Returns (key, column in the canonical orientation, value for the player to move).
+    """
+    key, (red, yellow, player, mirrored), num_simulations, seed = task
+    random.seed(seed)
+    game = ConnectFour.from_bitboards(red, yellow, player)
+    root = new_root(game)
+    grow_tree(root, game, "None", num_simulations, simulate_random_game, new_table(DEFAULT_MAX_ENTRIES, False))
+    move, child = max(root.children.items(), key=lambda item: move_rank(item[1]))
+    if child.proven is not None:
+        value = child.proven
+    else:
+        value = child.wi / child.ni if child.ni else 0  # with fewer iterations than moves, as in move_rank
+    return key, (MIRRORED_COLUMN[move] if mirrored else move), value
+
+def build_book(path, depth, num_simulations, workers=None, seed=0):
+    """
+    Search every book position to `depth` plies with num_simulations UCT
+    iterations each, spread over a process pool, and write the book file.
+    Returns the number of positions written.
+    """
+    if num_simulations < 1:
+        raise ValueError("num_simulations must be at least 1")
+    positions = book_positions(depth)
+    tasks = [(key, position, num_simulations, seed + i) for i, (key, position) in enumerate(positions.items())]
+    entries = {}
+    with concurrent.futures.ProcessPoolExecutor(max_workers=workers or os.cpu_count()) as executor:
+        for key, move, value in executor.map(_search_position, tasks, chunksize=8):
+            entries[key] = (move, value)
+
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    write_book(path, entries, depth)
+    return len(entries)
+
+def main():
+    """
+    Build an opening book offline.
+    """
+    if len(sys.argv) not in (3, 4):
+        print("Usage: python build_opening_book.py <depth> <num_simulations> [book_file]")
+        return
+
+    depth = int(sys.argv[1])
+    num_simulations = int(sys.argv[2])
+    path = sys.argv[3] if len(sys.argv) == 4 else DEFAULT_BOOK
+    count = build_book(path, depth, num_simulations)
+    print(f"Wrote {count} positions to {path}")
+
+if __name__ == "__main__":
+    main()
@@ -1,58 +1,217 @@
 import sys
+import random
 from utils.file_utils import load_board_from_file
+from utils.bitboard import (
+    ROWS, COLUMNS, COLUMN_HEIGHT, BOTTOM_MASK, BOARD_MASK, BOARD_CELLS,
+    LEGAL_MOVES, LINE_MASKS, has_four, position_key, column_heights, from_rows, to_rows,
+)
 
 # Constants
-ROWS = 6
-COLUMNS = 7
 EMPTY = 'O'
 
 class ConnectFour:
     """
     Core Connect Four game logic: board state, move rules, and win detection.
+    The position is kept as two bitboards (one per player) plus per-column
+    heights; `board` rebuilds the 6x7 list-of-lists view on demand.
+    Moves played through apply_move are kept on a stack so searches can
+    rewind a single game with undo_move instead of copying boards.
     """
     def __init__(self, board, current_player):
-        self.board = board  # 6x7 matrix
+        self.board = board  # 6x7 matrix, converted to bitboards by the setter
         self.current_player = current_player  # 'R' or 'Y'
 
+    @property
+    def board(self):
+        return to_rows(self.red, self.yellow, EMPTY)
+
+    @board.setter
+    def board(self, board):
+        self.red, self.yellow, self.heights = from_rows(board, EMPTY)
+        self._reset_counters()
+
+    @classmethod
+    def from_bitboards(cls, red, yellow, current_player):
+        """
+        Build a game straight from the two player bitboards.
+        """
+        game = cls.__new__(cls)
+        game.red = red
+        game.yellow = yellow
+        game.heights = column_heights(red | yellow)
+        game._reset_counters()
+        game.current_player = current_player
+        return game
+
+    def _reset_counters(self):
+        self.full = 0  # bit c is set once column c is full
+        self.moves = []  # columns played since the board was loaded
+        self.move_count = sum(self.heights)  # stones on the board
+        self.last_row = None  # board row (0 = top) of the last stone dropped
+        for col in range(COLUMNS):
+            if self.heights[col] == ROWS:
+                self.full |= 1 << col
+
     def display(self):
         for row in self.board:
             print(''.join(row))
 
     def get_legal_moves(self):
-        return [col for col in range(COLUMNS) if self.board[0][col] == EMPTY]
+        return LEGAL_MOVES[self.full]
+
+    def position_key(self):
+        """
+        Integer key identifying the stones on the board (see utils.bitboard).
+        """
+        return position_key(self.red, self.yellow)
+
+    def legal_moves_mask(self):
+        """
+        Bitboard of the cells a piece would land in, one per open column.
+        """
+        return ((self.red | self.yellow) + BOTTOM_MASK) & BOARD_MASK
 
     def apply_move(self, col):
-        for row in reversed(range(ROWS)):
-            if self.board[row][col] == EMPTY:
-                self.board[row][col] = self.current_player
-                return True
-        return False
+        height = self.heights[col]
+        if height == ROWS:
+            return False
+        if self.current_player == 'R':
+            self.red |= 1 << (col * COLUMN_HEIGHT + height)
+        else:
+            self.yellow |= 1 << (col * COLUMN_HEIGHT + height)
+        self.heights[col] = height + 1
+        if height == ROWS - 1:
+            self.full |= 1 << col
+        self.moves.append(col)
+        self.move_count += 1
+        self.last_row = ROWS - 1 - height
+        return True
+
+    def undo_move(self):
+        """
+        Take back the last move and hand the turn back to the player who made it.
+        Returns the column that was undone.
+        """
+        col = self.moves.pop()
+        height = self.heights[col] - 1
+        bit = 1 << (col * COLUMN_HEIGHT + height)
+        if self.red & bit:
+            self.red ^= bit
+            self.current_player = 'R'
+        else:
+            self.yellow ^= bit
+            self.current_player = 'Y'
+        self.heights[col] = height
+        self.full &= ~(1 << col)
+        self.move_count -= 1
+        self.last_row = None
+        return col
+
+    def undo_to(self, ply):
+        """
+        Undo moves until only `ply` moves remain on the move stack.
+        """
+        while len(self.moves) > ply:
+            self.undo_move()
 
     def check_winner(self):
-        directions = [(0, 1), (1, 0), (1, 1), (-1, 1)]  # horiz, vert, diag down, diag up
-        for row in reversed(range(ROWS)):
-            for col in range(COLUMNS):
-                player = self.board[row][col]
-                if player == EMPTY:
-                    continue
-                for dr, dc in directions:
-                    count = 0
-                    r, c = row, col
-                    while (0 <= r < ROWS and 0 <= c < COLUMNS and self.board[r][c] == player):
-                        count += 1
-                        if count == 4:
-                            return player
-                        r += dr
-                        c += dc
-        return 'Draw' if not self.get_legal_moves() else None
+        if has_four(self.red):
+            return 'R'
+        if has_four(self.yellow):
+            return 'Y'
+        return 'Draw' if self.move_count == BOARD_CELLS else None
+
+    def check_winner_after(self, col, row):
+        """
+        Fast path for check_winner right after a stone lands at (row, col).
+        Only the four lines through that cell can hold a new win, and the
+        draw test is a move-count comparison.
+        """
+        bit_index = col * COLUMN_HEIGHT + ROWS - 1 - row
+        if self.red >> bit_index & 1:
+            if has_four(self.red & LINE_MASKS[bit_index]):
+                return 'R'
+        elif has_four(self.yellow & LINE_MASKS[bit_index]):
+            return 'Y'
+        return 'Draw' if self.move_count == BOARD_CELLS else None
+
+USAGE = ("Usage: python connectFour.py <input_file> <verbosity> <parameter>"
+         " [--workers N] [--parallel root|tree] [--tt-size N] [--mirror 0|1]"
+         " [--time-limit-ms N] [--node-store 0|1] [--max-nodes N] [--max-memory-mb M]"
+         " [--endgame-cells N] [--book FILE] [--cache FILE] [--seed N]"
+         " [--trace FILE] [--trace-every N] [--trace-max-mb M]")
+
+# Optional command-line flags: the keyword argument each one sets and its type
+OPTIONS = {
+    "--workers": ("workers", int),
+    "--parallel": ("parallel", str),
+    "--tt-size": ("tt_size", int),
+    "--mirror": ("mirror", int),
+    "--time-limit-ms": ("time_limit_ms", int),
+    "--node-store": ("node_store", int),
+    "--max-nodes": ("max_nodes", int),
+    "--max-memory-mb": ("max_memory_mb", float),
+    "--endgame-cells": ("endgame_cells", int),
+    "--book": ("book", str),
+    "--cache": ("cache", str),
+    "--seed": ("seed", int),
+    "--trace": ("trace", str),
+    "--trace-every": ("trace_every", int),
+    "--trace-max-mb": ("trace_max_mb", float),
+}
+
+def parse_options(args):
+    """
+    Parse the optional `--flag value` pairs that follow the positional arguments.
+    Returns a dict of keyword arguments, or None if the flags are malformed
+    (a flag with a value of the wrong type is reported first).
+    """
+    options = {}
+    if len(args) % 2:
+        return None
+    for flag, value in zip(args[::2], args[1::2]):
+        if flag not in OPTIONS:
+            return None
+        name, kind = OPTIONS[flag]
+        try:
+            options[name] = kind(value)
+        except ValueError:
+            print(f"Invalid value for {flag}: {value!r}")
+            return None
+    return options
+
+def book_move(board, current_player, verbosity, book_path):
+    """
+    Look the position up in the opening book at book_path.
+    Prints the book move like a search result and returns it, or returns
+    None if there is no book or the position is not in it.
+    """
+    import os
+    from utils.opening_book import OpeningBook
+    if not os.path.exists(book_path):
+        return None
+    book = OpeningBook(book_path)
+    try:
+        found = book.lookup(ConnectFour(board, current_player))
+    finally:
+        book.close()
+    if found is None:
+        return None
+
+    move, value = found
+    if verbosity == "Verbose" or verbosity == "Brief":
+        print(f"Opening book: Column {move + 1}: {value * (-1 if current_player == 'R' else 1):.2f}")
+    print("FINAL Move selected:", move + 1)
+    return move
 
 def main():
     """
     Entry point for running the Connect Four simulation.
     Dispatches control to the appropriate algorithm module
     """
-    if len(sys.argv) != 4:
-        print("Usage: python connectFour.py <input_file> <verbosity> <parameter>")
+    options = parse_options(sys.argv[4:]) if len(sys.argv) >= 4 else None
+    if options is None:
+        print(USAGE)
         return
 
     input_file = sys.argv[1]
@@ -61,23 +220,44 @@ def main():
 
     algorithm, current_player, board = load_board_from_file(input_file)
 
+    from utils.opening_book import DEFAULT_BOOK
+    book_path = options.pop("book", DEFAULT_BOOK)
+    cache_path = options.pop("cache", None)
+    seed = options.pop("seed", None)
+    trace_path = options.pop("trace", None)
+    trace_every = options.pop("trace_every", 1)
+    trace_max_mb = options.pop("trace_max_mb", None)
+    if algorithm != 'UR' and book_move(board, current_player, verbosity, book_path) is not None:
+        return
+
+    from utils.algorithm_table import ALGORITHMS, TREE_SEARCHES, load_search, search_keywords
+    if algorithm not in ALGORITHMS:
+        print(f"Algorithm '{algorithm}' not implemented.")
+        return
+    search = load_search(algorithm)
     if algorithm == 'UR':
-        from algorithms.ur import run_ur
-        run_ur(board, current_player, verbosity, parameter)
-    elif algorithm == 'PMCGS':
-        from algorithms.pmcgs import run_pmcgs
-        run_pmcgs(board, current_player, verbosity, parameter)
-    elif algorithm == 'UCT':
-        from algorithms.uct import uct_search
-        uct_search(board, current_player, verbosity, parameter)
-    elif algorithm == 'Improved_UCT_Heuristic':
-        from algorithms.improved_uct_heuristic import uct_search
-        uct_search(board, current_player, verbosity, parameter)
-    elif algorithm == 'Improved_UCT_UCB':
-        from algorithms.improved_uct_ucb import uct_search
-        uct_search(board, current_player, verbosity, parameter)
+        search(board, current_player, verbosity, parameter)
+        return
+    options = search_keywords(algorithm, options)
+
+    tracer = None
+    if trace_path and algorithm in TREE_SEARCHES:
+        import functools
+        from utils.trace import Tracer, DEFAULT_MAX_BYTES
+        max_bytes = int(trace_max_mb * 2 ** 20) if trace_max_mb else DEFAULT_MAX_BYTES
+        tracer = Tracer(trace_path, trace_every, max_bytes)
+        search = functools.partial(search, trace=tracer)  # kept out of the cache key
+
+    if cache_path:
+        from utils.eval_cache import EvalCache, cached_search
+        cached_search(EvalCache(cache_path), algorithm, search, board, current_player, verbosity,
+                      parameter, seed, **options)
     else:
-        print(f"Algorithm '{algorithm}' not implemented.")
+        if seed is not None:
+            random.seed(seed)
+        search(board, current_player, verbosity, parameter, **options)
+    if tracer is not None:
+        tracer.close()
 
 if __name__ == "__main__":
     main()
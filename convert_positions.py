@@ -0,0 +1,87 @@
+"""
+Convert position sets between board files, JSONL records and the packed
+binary format (utils/packed_positions.py).
+
+The input is a directory or glob of board files, a .jsonl file of
+position records (see utils/positions.py) or a packed .c4p file. The
+output format follows the output path: .c4p writes a packed file, .jsonl
+one {"board", "player"} record per line, and anything else a directory
+of board files named position_000000.txt, ... with the given algorithm
+line.
+"""
+import os
+import sys
+import json
+
+from utils.positions import request_game, board_file_positions, jsonl_positions
+from utils.packed_positions import PackedPositions, PackedWriter, PACKED_SUFFIX, unpack_board
+
+DEFAULT_ALGORITHM = "UCT"
+
+
+def read_positions(source):
+    """
+    Yield (red, yellow, player) for every position of an input. Text
+    boards with unknown cells or stones above empty cells are rejected
+    (see request_game).
+    """
+    if source.endswith(PACKED_SUFFIX):
+        with PackedPositions(source) as positions:
+            yield from positions
+        return
+    if source.endswith(".jsonl"):
+        with open(source) as file:
+            yield from _bitboards(jsonl_positions(file))
+        return
+    yield from _bitboards(board_file_positions(source))
+
+
+def _bitboards(records):
+    for index, record in enumerate(records):
+        name = record.get("id", index) if isinstance(record, dict) else index
+        try:
+            game = request_game(record)
+        except (ValueError, TypeError, AttributeError) as error:
+            raise ValueError(f"position {name}: {error}") from None
+        yield game.red, game.yellow, game.current_player
+
+
+def write_positions(positions, target, algorithm=DEFAULT_ALGORITHM):
+    """
+    Write (red, yellow, player) positions in the format of the target path.
+    Returns the number written.
+    """
+    count = 0
+    if target.endswith(PACKED_SUFFIX):
+        with PackedWriter(target) as writer:
+            for red, yellow, current_player in positions:
+                writer.write(red, yellow, current_player)
+            return writer.count
+    if target.endswith(".jsonl"):
+        with open(target, "w") as file:
+            for red, yellow, current_player in positions:
+                rows = ["".join(row) for row in unpack_board(red, yellow)]
+                file.write(json.dumps({"board": rows, "player": current_player}) + "\n")
+                count += 1
+        return count
+    os.makedirs(target, exist_ok=True)
+    for red, yellow, current_player in positions:
+        with open(os.path.join(target, f"position_{count:06d}.txt"), "w") as file:
+            file.write(f"{algorithm}\n{current_player}\n")
+            file.writelines("".join(row) + "\n" for row in unpack_board(red, yellow))
+        count += 1
+    return count
+
+
+def main():
+    if len(sys.argv) not in (3, 4):
+        print("Usage: python convert_positions.py <input_dir|board_glob|positions.jsonl|positions.c4p> "
+              "<output.c4p|output.jsonl|output_dir> [algorithm]")
+        sys.exit(1)
+
+    algorithm = sys.argv[3] if len(sys.argv) == 4 else DEFAULT_ALGORITHM
+    count = write_positions(read_positions(sys.argv[1]), sys.argv[2], algorithm)
+    print(f"Converted {count} positions to {sys.argv[2]}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,337 @@
+"""
+Long-lived engine process that answers move requests without paying for
+interpreter startup, imports and board-file parsing on every move.
+
+Requests and replies are single JSON lines, read from stdin and written
+to stdout, or exchanged over a local Unix socket. A request names a
+position and a search:
+
+    {"id": 7, "moves": "4453", "algorithm": "UCT", "budget": 2000, "seed": 1}
+    {"id": 8, "board": ["OOOOOOO", ..., "OOORYOO"], "player": "R",
+     "algorithm": "PMCGS", "budget": 500, "options": {"time_limit_ms": 200}}
+
+`moves` lists the 1-based columns played from the empty board; `board`
+gives the six rows top first, as in a board file, and `red` and `yellow`
+the two bitboards (see utils.bitboard), both with the side to move in
+`player`. `options` are keyword options of the search (see
+connectFour.py). Requests with a `session` key are UCT searches that
+keep their tree: successive positions of one game in the same session
+reuse the subtree of the moves played in between.
+
+The reply echoes the id and gives the chosen column (0-based `move`),
+the column values from Yellow's point of view (null where a column was
+not searched), where the move came from ("book", "cache" or "search")
+and the time taken; session replies add the root visits carried over
+from earlier requests:
+
+    {"id": 7, "move": 3, "values": [...], "source": "search", "elapsed_ms": 41.2}
+
+or {"id": 7, "error": "..."} if the request could not be served. Replies
+are written as requests finish, so they can come back out of order.
+
+Requests are spread over a pool of worker processes; each keeps its
+modules, opening book, evaluation cache and session trees warm.
+"""
+import io
+import os
+import sys
+import json
+import time
+import random
+import signal
+import threading
+import itertools
+import contextlib
+import socketserver
+import multiprocessing
+from collections import OrderedDict
+
+from connectFour import COLUMNS
+from game_driver import make_agent
+from utils.opening_book import OpeningBook, DEFAULT_BOOK
+from utils.eval_cache import EvalCache, cached_search
+from utils.algorithm_table import ALGORITHMS, TREE_SEARCHES, load_search, request_options
+from utils.positions import request_game
+
+# Session trees kept per worker; the least recently used one is dropped beyond this
+MAX_SESSIONS = 64
+
+
+class WorkerState:
+    """
+    What a worker process keeps between requests.
+    """
+    def __init__(self, cache_path=None, book_path=DEFAULT_BOOK):
+        self.book = OpeningBook(book_path) if book_path and os.path.exists(book_path) else None
+        self.cache = EvalCache(cache_path) if cache_path else None
+        self.sessions = OrderedDict()  # session -> (agent settings, UCTAgent)
+
+    def session_agent(self, session, algorithm, budget, options):
+        """
+        The session's UCTAgent, or a new one if the session is unknown or
+        was opened with other settings.
+        """
+        settings = (algorithm, budget, sorted(options.items()))
+        entry = self.sessions.pop(session, None)
+        if entry is None or entry[0] != settings:
+            entry = (settings, make_agent(algorithm, budget, **options).agent)
+        self.sessions[session] = entry
+        while len(self.sessions) > MAX_SESSIONS:
+            self.sessions.popitem(last=False)
+        return entry[1]
+
+
+def follow_game(agent, game):
+    """
+    Move a session agent's tree down to `game` if it is one move past the
+    agent's position (the opponent's reply). Anything else is left to
+    UCTAgent.choose_move, which starts a new tree.
+    """
+    known = agent.game
+    if known is None or known.position_key() == game.position_key():
+        return
+    for col in known.get_legal_moves():
+        known.apply_move(col)
+        matches = known.position_key() == game.position_key()
+        known.undo_move()
+        if matches:
+            agent.observe(col)
+            return
+
+
+def analyze(request, state):
+    """
+    Serve one request in a worker. Returns the reply without its id.
+    """
+    started = time.perf_counter()
+    game = request_game(request)
+    algorithm = request.get("algorithm", "UCT")
+    if algorithm not in ALGORITHMS:
+        raise ValueError(f"unknown algorithm {algorithm!r}")
+    if game.check_winner() is not None:
+        raise ValueError("the game is already over")
+    budget = int(request.get("budget", 500))
+    seed = request.get("seed")
+    options = request_options(algorithm, request.get("options", {}))
+    session = request.get("session")
+    if session is not None and algorithm in TREE_SEARCHES and options.pop("node_store", False):
+        raise ValueError("session trees cannot use node_store")
+
+    report = {}
+    source = "search"
+    found = state.book.lookup(game) if state.book is not None and algorithm != "UR" else None
+    with contextlib.redirect_stdout(io.StringIO()):
+        if found is not None:
+            move, value = found
+            report["values"] = [None] * COLUMNS
+            report["values"][move] = value * (-1 if game.current_player == 'R' else 1)
+            source = "book"
+        elif algorithm == "UR":
+            if seed is not None:
+                random.seed(seed)
+            move = random.choice(game.get_legal_moves())
+        elif session is not None and algorithm in TREE_SEARCHES:
+            agent = state.session_agent(session, algorithm, budget, options)
+            follow_game(agent, game)
+            if seed is not None:
+                random.seed(seed)
+            move = agent.choose_move(game, report)
+            report["carried_visits"] = agent.carried_visits
+            agent.observe(move)
+        else:
+            search = load_search(algorithm)
+            board = game.board
+            if state.cache is not None:
+                move = cached_search(state.cache, algorithm, search, board, game.current_player, "None",
+                                     budget, seed, report, **options)
+                if report["cached"]:
+                    source = "cache"
+            else:
+                if seed is not None:
+                    random.seed(seed)
+                move = search(board, game.current_player, "None", budget, report=report, **options)
+
+    reply = {
+        "move": move,
+        "values": report.get("values"),
+        "source": source,
+        "elapsed_ms": round((time.perf_counter() - started) * 1000, 3),
+    }
+    if "carried_visits" in report:
+        reply["carried_visits"] = report["carried_visits"]
+    return reply
+
+
+def _worker(inbox, outbox, cache_path, book_path):
+    """
+    Worker process loop: serve (sequence number, request) pairs until None.
+    """
+    state = WorkerState(cache_path, book_path)
+    for algorithm in ALGORITHMS:
+        load_search(algorithm)  # import everything before the first request
+    for seq, request in iter(inbox.get, None):
+        try:
+            reply = analyze(request, state)
+        except Exception as error:
+            reply = {"error": f"{type(error).__name__}: {error}"}
+        outbox.put((seq, reply))
+
+
+class EngineServer:
+    """
+    Pool of worker processes serving requests through submit(). Requests
+    of one session always go to the same worker, so its tree is there;
+    other requests go to the least busy worker.
+    """
+    def __init__(self, workers=1, cache_path=None, book_path=DEFAULT_BOOK):
+        self._outbox = multiprocessing.Queue()
+        self._inboxes = [multiprocessing.Queue() for _ in range(workers)]
+        self._processes = [
+            multiprocessing.Process(target=_worker, args=(inbox, self._outbox, cache_path, book_path), daemon=True)
+            for inbox in self._inboxes
+        ]
+        for process in self._processes:
+            process.start()
+        self._busy = [0] * workers
+        self._pending = {}  # sequence number -> (callback, worker)
+        self._sessions = {}  # session -> worker
+        self._worker_sessions = [OrderedDict() for _ in range(workers)]  # each worker's sessions, oldest first
+        self._lock = threading.Lock()
+        self._sequence = itertools.count()
+        self._collector = threading.Thread(target=self._collect, daemon=True)
+        self._collector.start()
+
+    def submit(self, request, callback):
+        """
+        Queue a request; callback(reply) is called from the collector thread.
+        """
+        with self._lock:
+            seq = next(self._sequence)
+            session = request.get("session")
+            if session is not None and session in self._sessions:
+                worker = self._sessions[session]
+            else:
+                worker = min(range(len(self._busy)), key=self._busy.__getitem__)
+                if session is not None:
+                    self._sessions[session] = worker
+            if session is not None:
+                self._touch_session(session, worker)
+            self._busy[worker] += 1
+            self._pending[seq] = (callback, worker)
+        self._inboxes[worker].put((seq, request))
+
+    def _touch_session(self, session, worker):
+        """
+        Mark a session as the worker's most recent one. Beyond MAX_SESSIONS
+        the worker drops its least recent tree, and the session is
+        forgotten here too, so a long-running server does not grow.
+        """
+        sessions = self._worker_sessions[worker]
+        sessions[session] = None
+        sessions.move_to_end(session)
+        while len(sessions) > MAX_SESSIONS:
+            del self._sessions[sessions.popitem(last=False)[0]]
+
+    def _collect(self):
+        for seq, reply in iter(self._outbox.get, None):
+            with self._lock:
+                callback, worker = self._pending.pop(seq)
+                self._busy[worker] -= 1
+            callback(reply)
+
+    def close(self):
+        for inbox in self._inboxes:
+            inbox.put(None)
+        for process in self._processes:
+            process.join()
+        self._outbox.put(None)
+        self._collector.join()
+
+
+def serve_lines(engine, lines, write):
+    """
+    Serve the JSON requests in `lines`, passing each reply line to write().
+    Returns once every request has been answered.
+    """
+    lock = threading.Condition()
+    outstanding = [0]
+
+    def reply_with(request_id):
+        def send(reply):
+            text = json.dumps({"id": request_id, **reply}) + "\n"
+            with lock:
+                try:
+                    write(text)
+                except OSError:
+                    pass  # the client has gone; the collector thread must keep serving the others
+                outstanding[0] -= 1
+                lock.notify_all()
+        return send
+
+    for line in lines:
+        line = line.strip()
+        if not line:
+            continue
+        with lock:
+            outstanding[0] += 1
+        try:
+            request = json.loads(line)
+            if not isinstance(request, dict):
+                raise ValueError("a request must be a JSON object")
+        except ValueError as error:
+            reply_with(None)({"error": f"bad request: {error}"})
+            continue
+        engine.submit(request, reply_with(request.get("id")))
+
+    with lock:
+        lock.wait_for(lambda: outstanding[0] == 0)
+
+
+def serve_stdio(engine):
+    def write(text):
+        sys.stdout.write(text)
+        sys.stdout.flush()
+    serve_lines(engine, sys.stdin, write)
+
+
+def serve_socket(engine, path):
+    """
+    Accept connections on a Unix socket at `path`, one thread per connection.
+    """
+    class Handler(socketserver.StreamRequestHandler):
+        def handle(self):
+            serve_lines(engine, (line.decode() for line in self.rfile),
+                        lambda text: self.wfile.write(text.encode()))
+
+    if os.path.exists(path):
+        os.remove(path)
+    with socketserver.ThreadingUnixStreamServer(path, Handler) as server:
+        try:
+            server.serve_forever()
+        finally:
+            os.remove(path)
+
+
+def main():
+    if len(sys.argv) not in (2, 3, 4):
+        print("Usage: python engine_server.py <workers> [socket_path|-] [cache_file]")
+        sys.exit(1)
+
+    workers = int(sys.argv[1])
+    socket_path = sys.argv[2] if len(sys.argv) > 2 and sys.argv[2] != "-" else None
+    cache_path = sys.argv[3] if len(sys.argv) > 3 else None
+
+    engine = EngineServer(workers, cache_path)
+    signal.signal(signal.SIGTERM, lambda *args: sys.exit(0))
+    try:
+        if socket_path:
+            serve_socket(engine, socket_path)
+        else:
+            serve_stdio(engine)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        engine.close()
+
+if __name__ == "__main__":
+    main()
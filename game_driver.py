@@ -0,0 +1,144 @@
+import sys
+import io
+import random
+import functools
+import contextlib
+
+from connectFour import ConnectFour, ROWS, COLUMNS, EMPTY
+from utils.file_utils import load_board_from_file
+from utils.eval_cache import cached_search
+from utils.algorithm_table import TREE_SEARCHES, load_search, rollout_policy, node_class, search_keywords
+
+class RandomAgent:
+    """
+    Uniform Random (UR) player: any legal column with equal probability.
+    """
+    def choose_move(self, game):
+        return random.choice(game.get_legal_moves())
+
+    def observe(self, move):
+        pass
+
+class SearchAgent:
+    """
+    Wraps a stateless search entry point such as run_pmcgs.
+    Every move is searched from scratch, or replayed from an EvalCache
+    (utils/eval_cache.py) under the given algorithm name. `stats`, a
+    SearchStats, is handed to every search but kept out of the cache key.
+    """
+    def __init__(self, search, parameter, cache=None, algorithm=None, stats=None, **options):
+        self.search = search
+        self.parameter = parameter
+        self.cache = cache
+        self.algorithm = algorithm
+        self.options = options
+        if stats is not None:
+            self.search = functools.partial(search, stats=stats)
+
+    def choose_move(self, game):
+        with contextlib.redirect_stdout(io.StringIO()):
+            if self.cache is not None:
+                return cached_search(self.cache, self.algorithm, self.search, game.board, game.current_player,
+                                     "None", self.parameter, **self.options)
+            return self.search(game.board, game.current_player, "None", self.parameter, **self.options)
+
+    def observe(self, move):
+        pass
+
+class TreeReuseAgent:
+    """
+    Adapter around algorithms.uct.UCTAgent that silences its FINAL line.
+    """
+    def __init__(self, agent):
+        self.agent = agent
+
+    @property
+    def carried_visits(self):
+        return self.agent.carried_visits
+
+    def choose_move(self, game):
+        with contextlib.redirect_stdout(io.StringIO()):
+            return self.agent.choose_move(game)
+
+    def observe(self, move):
+        self.agent.observe(move)
+
+def make_agent(algorithm, parameter, reuse_tree=True, cache=None, stats=None, **options):
+    """
+    Build an in-process player for one of the algorithms in algorithms/.
+    UCT variants keep their tree between moves unless reuse_tree is False.
+    Options a search does not take are dropped (see
+    utils.algorithm_table.search_keywords); UCT variants take any option
+    of algorithms.uct.uct_search.
+    Searches that start from scratch every move (PMCGS, and UCT without
+    tree reuse) look their results up in `cache`, an EvalCache, if given.
+    UCT variants record their searches in `stats`, a SearchStats, if given;
+    UR and PMCGS ignore it.
+    """
+    if algorithm == 'UR':
+        return RandomAgent()
+    search = load_search(algorithm)
+    if algorithm not in TREE_SEARCHES:
+        return SearchAgent(search, parameter, cache, algorithm, **search_keywords(algorithm, options))
+
+    if reuse_tree:
+        from algorithms import uct
+        return TreeReuseAgent(uct.UCTAgent(parameter, rollout=rollout_policy(algorithm),
+                                           node_class=node_class(algorithm), stats=stats, **options))
+    return SearchAgent(search, parameter, cache, algorithm, stats, **options)
+
+def play_game(red_agent, yellow_agent, board=None, current_player='R', verbosity="None"):
+    """
+    Play one game between two in-process agents, alternating move by move.
+    Returns a dict with the winner ('R', 'Y' or 'Draw'), the moves played
+    (0-based columns) and, per move, the visits carried over by tree reuse.
+    """
+    if board is None:
+        board = [[EMPTY] * COLUMNS for _ in range(ROWS)]
+    game = ConnectFour(board, current_player)
+    agents = {'R': red_agent, 'Y': yellow_agent}
+    carried = {'R': [], 'Y': []}
+
+    winner = game.check_winner()
+    while winner is None:
+        player = game.current_player
+        move = agents[player].choose_move(game)
+        carried[player].append(getattr(agents[player], "carried_visits", 0))
+
+        game.apply_move(move)
+        winner = game.check_winner_after(move, game.last_row)
+        for agent in agents.values():
+            agent.observe(move)
+
+        if verbosity == "Verbose":
+            print(f"\n{player} played column {move + 1}")
+            game.display()
+        game.current_player = 'Y' if player == 'R' else 'R'
+
+    return {"winner": winner, "moves": list(game.moves), "carried_visits": carried}
+
+def main():
+    """
+    Play a single in-process game and report how much search was reused.
+    """
+    if len(sys.argv) not in (5, 6):
+        print("Usage: python game_driver.py <red_algorithm> <red_parameter> "
+              "<yellow_algorithm> <yellow_parameter> [board_file]")
+        return
+
+    red = make_agent(sys.argv[1], int(sys.argv[2]))
+    yellow = make_agent(sys.argv[3], int(sys.argv[4]))
+    board, current_player = None, 'R'
+    if len(sys.argv) == 6:
+        algorithm, current_player, board = load_board_from_file(sys.argv[5])
+
+    game = play_game(red, yellow, board, current_player, verbosity="Verbose")
+    print(f"Total moves played: {len(game['moves'])}")
+    print(f"Final result: {game['winner'] + ' wins' if game['winner'] != 'Draw' else 'Draw'}")
+    for player in ('R', 'Y'):
+        carried = game["carried_visits"][player]
+        if carried:
+            print(f"{player} visits carried over: {sum(carried)} total, {max(carried)} max per move")
+
+if __name__ == "__main__":
+    main()
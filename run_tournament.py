@@ -1,6 +1,12 @@
-import subprocess
-from collections import defaultdict
+import os
+import sys
+import random
 import concurrent.futures
+from collections import defaultdict
+
+from game_driver import make_agent, play_game as play_driver_game
+from utils.eval_cache import EvalCache
+from utils.search_stats import SearchStats
 
 # List of agents with (algorithm_name, parameter)
 agents = [
@@ -16,72 +22,138 @@ agents = [
 # Create friendly names for output matrix
 agent_names = [f"{name}({param})" for name, param in agents]
 
-# Dictionary to store win results
-results = defaultdict(lambda: defaultdict(int))
-
 # Set number of games for each matchup
 GAMES_PER_MATCHUP = 20
 
-def play_game(player1_algo, player2_algo):
+# Per-move time control in milliseconds for every search agent (None = use parameters)
+TIME_LIMIT_MS = None
+
+# UCT agents search every move from scratch, so that an agent's strength
+# is that of its parameter; with tree reuse they also carry the visits of
+# earlier moves, and results are not comparable with a fresh-tree run
+REUSE_TREE = False
+
+def play_game(player1_algo, player2_algo, seed=None, time_limit_ms=None, cache_path=None, collect_stats=False,
+              reuse_tree=REUSE_TREE):
     """
-    Plays a game between two algorithms.
+    Plays a game between two algorithms in this process.
     player1 plays as 'R', player2 plays as 'Y'.
-    Returns 'R', 'Y', or 'Draw'
+    With time_limit_ms both search agents get the same wall-clock budget per move.
+    With cache_path, search results are shared with other games through an
+    EvalCache (UCT agents only use it without tree reuse).
+    With reuse_tree, UCT agents keep their tree from one move to the next.
+    With collect_stats, each side's UCT searches are recorded in a SearchStats.
+    Returns a dict with the agents, the winner ('R', 'Y' or 'Draw'), the move
+    count and the two sides' stats (None unless collected).
     """
-    input_file = "boards/empty.txt"
-
-    result = subprocess.run(
-        ["python3", "connectFour.py", input_file, "None", str(player1_algo[1])],
-        capture_output=True,
-        text=True
-    )
-    out = result.stdout
-    if "Final result: R wins" in out:
-        return "R"
-    elif "Final result: Y wins" in out:
-        return "Y"
-    elif "Final result: Draw" in out:
-        return "Draw"
-    return "Unknown"
-
-def play_matchup(player1, player2, agent_names, i, j):
-    """
-    Plays GAMES_PER_MATCHUP games between two agents in parallel.
-    """
-    wins = {"R": 0, "Y": 0}
+    random.seed(seed)
+    options = {"time_limit_ms": time_limit_ms} if time_limit_ms else {}
+    if cache_path:
+        options["cache"] = _open_cache(cache_path)
+    red_stats = SearchStats() if collect_stats else None
+    yellow_stats = SearchStats() if collect_stats else None
+    game = play_driver_game(make_agent(*player1_algo, reuse_tree=reuse_tree, stats=red_stats, **options),
+                            make_agent(*player2_algo, reuse_tree=reuse_tree, stats=yellow_stats, **options))
+    return {
+        "red": player1_algo,
+        "yellow": player2_algo,
+        "winner": game["winner"],
+        "moves": len(game["moves"]),
+        "red_stats": red_stats,
+        "yellow_stats": yellow_stats,
+    }
+
+# One EvalCache per worker process, opened on first use
+_caches = {}
 
-    def single_game(_):
-        return play_game(player1, player2)
+def _open_cache(path):
+    if path not in _caches:
+        _caches[path] = EvalCache(path)
+    return _caches[path]
 
-    with concurrent.futures.ThreadPoolExecutor(max_workers=4) as executor:
-        results_list = list(executor.map(single_game, range(GAMES_PER_MATCHUP)))
+def _play_indexed_game(task):
+    i, j, player1_algo, player2_algo, seed, time_limit_ms, cache_path, collect_stats, reuse_tree = task
+    return i, j, play_game(player1_algo, player2_algo, seed, time_limit_ms, cache_path, collect_stats, reuse_tree)
 
-    for result in results_list:
-        if result == "R":
+def run_tournament(games_per_matchup=GAMES_PER_MATCHUP, workers=None, time_limit_ms=TIME_LIMIT_MS,
+                   cache_path=None, collect_stats=False, reuse_tree=REUSE_TREE):
+    """
+    Play every ordered pair of distinct agents games_per_matchup times,
+    spreading the games over a process pool (one worker per core by default).
+    time_limit_ms puts every search agent on the same per-move time control.
+    cache_path names an evaluation cache file shared by all workers.
+    collect_stats records search instrumentation (see aggregate_stats).
+    reuse_tree lets UCT agents keep their tree between moves (see REUSE_TREE).
+    Returns a list of (i, j, game result) tuples, i playing Red against j.
+    """
+    base_seed = random.getrandbits(32)
+    tasks = [
+        (i, j, agents[i], agents[j], base_seed + len(agents) ** 2 * game + i * len(agents) + j,
+         time_limit_ms, cache_path, collect_stats, reuse_tree)
+        for i in range(len(agents))
+        for j in range(len(agents))
+        if i != j
+        for game in range(games_per_matchup)
+    ]
+    with concurrent.futures.ProcessPoolExecutor(max_workers=workers or os.cpu_count()) as executor:
+        return list(executor.map(_play_indexed_game, tasks, chunksize=4))
+
+def win_matrix(games):
+    """
+    Count wins: matrix[winner_name][loser_name].
+    """
+    results = defaultdict(lambda: defaultdict(int))
+    for i, j, game in games:
+        if game["winner"] == "R":
             results[agent_names[i]][agent_names[j]] += 1
-        elif result == "Y":
+        elif game["winner"] == "Y":
             results[agent_names[j]][agent_names[i]] += 1
+    return results
+
+def aggregate_stats(games):
+    """
+    Merge the collected SearchStats of every game per agent name.
+    Agents without stats (UR, PMCGS, or collection off) are left out.
+    """
+    totals = {}
+    for i, j, game in games:
+        for index, stats in ((i, game["red_stats"]), (j, game["yellow_stats"])):
+            if stats is not None and stats.searches:
+                totals.setdefault(agent_names[index], SearchStats()).merge(stats)
+    return totals
+
+def main():
+    time_limit_ms = TIME_LIMIT_MS
+    if len(sys.argv) > 1:
+        time_limit_ms = int(sys.argv[1]) or None
+    cache_path = (sys.argv[2] or None) if len(sys.argv) > 2 else None
+    collect_stats = len(sys.argv) > 3 and sys.argv[3] == "stats"
+    reuse_tree = REUSE_TREE if len(sys.argv) <= 4 else sys.argv[4] == "reuse"
+    games = run_tournament(time_limit_ms=time_limit_ms, cache_path=cache_path, collect_stats=collect_stats,
+                           reuse_tree=reuse_tree)
+    results = win_matrix(games)
+
+    # Display matrix
+    print("\nTournament Win Matrix (out of", GAMES_PER_MATCHUP, "games, UCT tree reuse",
+          "on):" if reuse_tree else "off):")
+    print("\t" + "\t".join(agent_names))
+    for row_name in agent_names:
+        row = [row_name]
+        for col_name in agent_names:
+            win_count = results[row_name][col_name]
+            row.append(str(win_count))
+        print("\t".join(row))
+
+    # Special: Compare Improved UCT variants vs UCT(10000)
+    uct_10000_name = "UCT(10000)"
+    for improved in ["Improved_UCT_Heuristic(500)", "Improved_UCT_UCB(500)"]:
+        wins = results[improved][uct_10000_name]
+        print(f"{improved} vs {uct_10000_name}: {wins} wins / {GAMES_PER_MATCHUP} games ({(wins / GAMES_PER_MATCHUP) * 100:.1f}% win rate)")
+
+    if collect_stats:
+        for name, stats in aggregate_stats(games).items():
+            print(f"\nSearch profile of {name}:")
+            print(stats.summary())
 
-# Run tournament
-for i, player1 in enumerate(agents):
-    for j, player2 in enumerate(agents):
-        if i == j:
-            continue
-        print(f"Running: {agent_names[i]} vs {agent_names[j]}")
-        play_matchup(player1, player2, agent_names, i, j)
-
-# Display matrix
-print("\nTournament Win Matrix (out of", GAMES_PER_MATCHUP, "games):")
-print("\t" + "\t".join(agent_names))
-for row_name in agent_names:
-    row = [row_name]
-    for col_name in agent_names:
-        win_count = results[row_name][col_name]
-        row.append(str(win_count))
-    print("\t".join(row))
-
-# Special: Compare Improved UCT variants vs UCT(10000)
-uct_10000_name = "UCT(10000)"
-for improved in ["Improved_UCT_Heuristic(500)", "Improved_UCT_UCB(500)"]:
-    wins = results[improved][uct_10000_name]
-    print(f"{improved} vs {uct_10000_name}: {wins} wins / {GAMES_PER_MATCHUP} games ({(wins / GAMES_PER_MATCHUP) * 100:.1f}% win rate)")
+if __name__ == "__main__":
+    main()
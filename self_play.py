@@ -0,0 +1,250 @@
+"""
+Self-play data generation: plays games between two copies of a UCT agent
+on a process pool and streams every searched position to JSONL shards.
+
+Each shard line is either a position or the end of a game:
+
+    {"type": "position", "game": 12, "ply": 5, "red": ..., "yellow": ...,
+     "player": "Y", "visits": [...], "values": [...], "move": 3, "result": -1}
+    {"type": "game", "game": 12, "plies": 23, "result": -1, "positions": 19}
+
+`visits` are the root children's visit counts and `values` the column
+values from Yellow's point of view, as printed by the searches; endgame
+positions played by the solver have null visits. `result` is the game's
+outcome (1 Yellow win, -1 Red win, 0 draw). A position already written
+(same stones and side to move) is not written again.
+
+A game's lines are written together, after the game ends, and a shard is
+only closed between games once it passes its size cap. To resume, the
+shards are scanned: games with an end line are done, their positions
+seed the duplicate filter, and anything after the last end line (a game
+cut off by a crash) is truncated. Game g is always played with the seed
+derived from (seed, g), so a resumed run produces what the full run
+would have.
+"""
+import io
+import os
+import sys
+import glob
+import json
+import time
+import random
+import contextlib
+import concurrent.futures
+from collections import deque
+
+from connectFour import ConnectFour, ROWS, COLUMNS, EMPTY
+from game_driver import make_agent
+from utils.opening_book import book_key
+from utils.algorithm_table import TREE_SEARCHES
+
+SHARD_PATTERN = "shard_{:05d}.jsonl"
+DEFAULT_MAX_SHARD_BYTES = 64 * 2 ** 20
+
+# Opening plies whose move is sampled in proportion to the root visits
+# instead of taken as the best one, so that games do not all repeat
+RANDOM_PLIES = 4
+
+# Algorithms with a tree search whose root visits can be recorded
+SELF_PLAY_ALGORITHMS = TREE_SEARCHES
+
+# Games in flight per worker process
+PENDING_PER_WORKER = 2
+
+
+def game_seed(seed, game):
+    return (seed << 32) + game
+
+
+def play_self_play_game(task):
+    """
+    Worker entry point: play game number `game_number` against itself with
+    tree reuse and return (game_number, per-ply records, result).
+    """
+    game_number, algorithm, num_simulations, seed, random_plies = task
+    random.seed(game_seed(seed, game_number))
+    agent = make_agent(algorithm, num_simulations).agent  # the UCTAgent, which takes a report
+    game = ConnectFour([[EMPTY] * COLUMNS for _ in range(ROWS)], 'R')
+
+    plies = []
+    winner = None
+    with contextlib.redirect_stdout(io.StringIO()):
+        while winner is None:
+            report = {}
+            best_move = agent.choose_move(game, report)
+            visits = report.get("visits")
+            move = best_move
+            if len(game.moves) < random_plies and visits and sum(visits):
+                move = random.choices(range(COLUMNS), weights=visits)[0]
+            plies.append((game.red, game.yellow, game.current_player, visits, report.get("values"), move))
+
+            game.apply_move(move)
+            winner = game.check_winner_after(move, game.last_row)
+            agent.observe(move)
+            game.current_player = 'Y' if game.current_player == 'R' else 'R'
+
+    result = {'R': -1, 'Y': 1, 'Draw': 0}[winner]
+    return game_number, plies, result
+
+
+class ShardWriter:
+    """
+    Appends game blocks to numbered JSONL shards in a directory, starting
+    a new shard once the current one is over max_bytes.
+    """
+    def __init__(self, directory, max_bytes=DEFAULT_MAX_SHARD_BYTES, shard=0):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.shard = shard
+        self._file = None
+
+    def _path(self):
+        return os.path.join(self.directory, SHARD_PATTERN.format(self.shard))
+
+    def write_block(self, lines):
+        """
+        Write one game's lines with a single write and flush them to disk.
+        """
+        if self._file is None:
+            self._file = open(self._path(), "a")
+        self._file.write("".join(lines))
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        if self._file.tell() >= self.max_bytes:
+            self._file.close()
+            self._file = None
+            self.shard += 1
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+
+
+def scan_shards(directory, max_bytes=DEFAULT_MAX_SHARD_BYTES):
+    """
+    Recover the state of an earlier run: the set of finished games, the
+    keys of the positions written for them and the shard to continue in,
+    which is a new one if the last shard has reached max_bytes.
+    Shards are truncated after their last complete game.
+    """
+    finished, seen = set(), set()
+    shards = sorted(glob.glob(os.path.join(directory, SHARD_PATTERN.replace("{:05d}", "*"))))
+    for path in shards:
+        valid_end = offset = 0
+        keys = []
+        with open(path, "rb") as file:
+            for line in file:
+                offset += len(line)
+                if not line.endswith(b"\n"):
+                    break
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    break
+                if record["type"] == "position":
+                    keys.append(book_key(record["red"], record["yellow"], record["player"]))
+                else:
+                    finished.add(record["game"])
+                    seen.update(keys)
+                    keys.clear()
+                    valid_end = offset
+        if valid_end < os.path.getsize(path):
+            with open(path, "r+b") as file:
+                file.truncate(valid_end)
+    next_shard = 0
+    if shards:
+        next_shard = int(os.path.basename(shards[-1])[6:11])
+        if valid_end >= max_bytes:  # valid_end is the last shard's size after truncation
+            next_shard += 1
+    return finished, seen, next_shard
+
+
+def game_lines(game_number, plies, result, seen):
+    """
+    Shard lines for a finished game, skipping positions already in `seen`
+    (which is updated). Returns the lines and the positions written.
+    """
+    lines = []
+    for ply, (red, yellow, current_player, visits, values, move) in enumerate(plies):
+        key = book_key(red, yellow, current_player)
+        if key in seen:
+            continue
+        seen.add(key)
+        lines.append(json.dumps({
+            "type": "position", "game": game_number, "ply": ply, "red": red, "yellow": yellow,
+            "player": current_player, "visits": visits, "values": values, "move": move, "result": result,
+        }) + "\n")
+    positions = len(lines)
+    lines.append(json.dumps({"type": "game", "game": game_number, "plies": len(plies), "result": result,
+                             "positions": positions}) + "\n")
+    return lines, positions
+
+
+def run_self_play(directory, num_games, algorithm="UCT", num_simulations=500, workers=None, seed=0,
+                  max_shard_bytes=DEFAULT_MAX_SHARD_BYTES, random_plies=RANDOM_PLIES, verbosity="Brief"):
+    """
+    Play games 0 .. num_games - 1 that the shards in `directory` do not
+    already hold and append their positions. Returns a dict with the games
+    played, positions written, duplicates skipped and elapsed seconds.
+    """
+    if algorithm not in SELF_PLAY_ALGORITHMS:
+        raise ValueError(f"Algorithm '{algorithm}' cannot be used for self-play.")
+    os.makedirs(directory, exist_ok=True)
+    finished, seen, shard = scan_shards(directory, max_shard_bytes)
+    todo = [game for game in range(num_games) if game not in finished]
+    workers = workers or os.cpu_count()
+    writer = ShardWriter(directory, max_shard_bytes, shard)
+    stats = {"games": 0, "positions": 0, "duplicates": 0, "seconds": 0.0}
+    if verbosity in ["Verbose", "Brief"] and finished:
+        print(f"Resuming: {len(finished)} games and {len(seen)} positions already written")
+
+    started = time.perf_counter()
+    pending = deque()
+    try:
+        with concurrent.futures.ProcessPoolExecutor(max_workers=workers) as executor:
+            games = iter(todo)
+            while True:
+                for game_number in games:
+                    pending.append(executor.submit(play_self_play_game, (game_number, algorithm, num_simulations,
+                                                                         seed, random_plies)))
+                    if len(pending) >= workers * PENDING_PER_WORKER:
+                        break
+                if not pending:
+                    break
+                game_number, plies, result = pending.popleft().result()
+                lines, positions = game_lines(game_number, plies, result, seen)
+                writer.write_block(lines)
+                stats["games"] += 1
+                stats["positions"] += positions
+                stats["duplicates"] += len(plies) - positions
+                if verbosity == "Verbose":
+                    print(f"Game {game_number}: {len(plies)} plies, {positions} new positions, result {result}")
+    finally:
+        writer.close()
+    stats["seconds"] = time.perf_counter() - started
+
+    if verbosity in ["Verbose", "Brief"]:
+        rate = stats["positions"] / stats["seconds"] * 3600 if stats["seconds"] else 0
+        print(f"Games played: {stats['games']}, positions written: {stats['positions']}, "
+              f"duplicates skipped: {stats['duplicates']} ({rate:.0f} positions/hour)")
+    return stats
+
+
+def main():
+    if len(sys.argv) not in range(5, 9):
+        print("Usage: python self_play.py <output_dir> <num_games> <algorithm> <num_simulations> "
+              "[workers] [max_shard_mb] [seed]")
+        sys.exit(1)
+
+    directory = sys.argv[1]
+    num_games = int(sys.argv[2])
+    algorithm = sys.argv[3]
+    num_simulations = int(sys.argv[4])
+    workers = int(sys.argv[5]) if len(sys.argv) > 5 else None
+    max_shard_bytes = int(float(sys.argv[6]) * 2 ** 20) if len(sys.argv) > 6 else DEFAULT_MAX_SHARD_BYTES
+    seed = int(sys.argv[7]) if len(sys.argv) > 7 else 0
+
+    run_self_play(directory, num_games, algorithm, num_simulations, workers, seed, max_shard_bytes)
+
+if __name__ == "__main__":
+    main()
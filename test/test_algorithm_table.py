@@ -0,0 +1,45 @@
+import os
+import sys
+
+import pytest
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from algorithms import uct, improved_uct_ucb
+from algorithms.batch_uct import VARIANTS
+from game_driver import make_agent, RandomAgent, SearchAgent, TreeReuseAgent
+from utils.algorithm_table import (ALGORITHMS, TREE_SEARCHES, load_search, node_class, rollout_policy,
+                                   search_keywords, request_options)
+from utils.monte_utils import simulate_heuristic_game
+
+
+def test_every_algorithm_loads():
+    for algorithm in ALGORITHMS:
+        assert callable(load_search(algorithm))
+    assert TREE_SEARCHES == ("UCT", "Improved_UCT_Heuristic", "Improved_UCT_UCB")
+    assert node_class("Improved_UCT_UCB") is improved_uct_ucb.Node and node_class("UCT") is uct.Node
+    assert rollout_policy("Improved_UCT_Heuristic") is simulate_heuristic_game
+    assert VARIANTS["Improved_UCT_Heuristic"] == (uct.Node, True)
+    with pytest.raises(ValueError):
+        load_search("Nope")
+
+
+def test_options_are_filtered_or_rejected():
+    options = {"time_limit_ms": 50, "mirror": True}
+    assert search_keywords("PMCGS", options) == {"time_limit_ms": 50}
+    assert search_keywords("UCT", options) == options
+    assert request_options("UCT", options) == options
+    with pytest.raises(ValueError):
+        request_options("PMCGS", options)
+    with pytest.raises(ValueError):
+        request_options("UCT", {"workers": 4})
+
+
+def test_make_agent_builds_each_algorithm():
+    assert isinstance(make_agent("UR", 0), RandomAgent)
+    assert isinstance(make_agent("PMCGS", 50, mirror=True), SearchAgent)
+    assert isinstance(make_agent("UCT", 50), TreeReuseAgent)
+    assert isinstance(make_agent("Improved_UCT_UCB", 50, reuse_tree=False), SearchAgent)
+    assert make_agent("Improved_UCT_Heuristic", 50).agent.rollout is simulate_heuristic_game
+    with pytest.raises(ValueError):
+        make_agent("Nope", 50)
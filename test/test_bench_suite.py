@@ -0,0 +1,26 @@
+import os
+import sys
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'benchmarks')))
+
+from bench_suite import regressions, TOLERANCES
+
+
+def test_regressions_use_per_metric_tolerances():
+    baseline = {"core": {"check_winner_per_sec": 1000.0},
+                "algorithms": {"UCT": {"time_to_move_sec": 0.1, "peak_memory_bytes": 1000}}}
+    within = {"core": {"check_winner_per_sec": 1000.0 * (1 - TOLERANCES["check_winner_per_sec"]) + 1},
+              "algorithms": {"UCT": {"time_to_move_sec": 0.12, "peak_memory_bytes": 1040}}}
+    assert regressions(within, baseline) == []
+
+    worse = {"core": {"check_winner_per_sec": 500.0},
+             "algorithms": {"UCT": {"time_to_move_sec": 0.2, "peak_memory_bytes": 1100}}}
+    assert [path for path, _, _ in regressions(worse, baseline)] == [
+        "core/check_winner_per_sec", "algorithms/UCT/time_to_move_sec", "algorithms/UCT/peak_memory_bytes"]
+
+
+def test_tolerance_override_and_missing_metrics():
+    baseline = {"core": {"check_winner_per_sec": 1000.0, "gone_per_sec": 5.0}}
+    results = {"core": {"check_winner_per_sec": 700.0, "new_per_sec": 1.0}}
+    assert regressions(results, baseline, tolerance=0.5) == []
+    assert regressions(results, baseline, tolerance=0.1) == [("core/check_winner_per_sec", 1000.0, 700.0)]
@@ -0,0 +1,91 @@
+import os
+import sys
+import random
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from connectFour import ConnectFour, ROWS, COLUMNS, EMPTY
+
+
+def list_scan_winner(board):
+    """
+    Winner of a list-of-lists board found by scanning every line of four
+    cells, as ConnectFour did before it kept bitboards.
+    """
+    for row in range(ROWS):
+        for col in range(COLUMNS):
+            player = board[row][col]
+            if player == EMPTY:
+                continue
+            for d_row, d_col in ((0, 1), (1, 0), (1, 1), (1, -1)):
+                end_row, end_col = row + 3 * d_row, col + 3 * d_col
+                if 0 <= end_row < ROWS and 0 <= end_col < COLUMNS and all(
+                        board[row + i * d_row][col + i * d_col] == player for i in range(4)):
+                    return player
+    if all(cell != EMPTY for row in board for cell in row):
+        return 'Draw'
+    return None
+
+
+def new_game():
+    return ConnectFour([[EMPTY] * COLUMNS for _ in range(ROWS)], 'R')
+
+
+def test_check_winner_matches_the_list_scan():
+    rng = random.Random(0)
+    for _ in range(3000):
+        game = new_game()
+        winner = None
+        while winner is None:
+            move = rng.choice(game.get_legal_moves())
+            game.apply_move(move)
+            winner = game.check_winner_after(move, game.last_row)
+            assert winner == game.check_winner() == list_scan_winner(game.board)
+            game.current_player = 'Y' if game.current_player == 'R' else 'R'
+
+
+def test_undo_restores_every_position():
+    rng = random.Random(1)
+    for _ in range(200):
+        game = new_game()
+        history = []
+        while game.check_winner() is None:
+            history.append((game.board, game.red, game.yellow, list(game.heights), game.current_player,
+                            game.get_legal_moves()))
+            game.apply_move(rng.choice(game.get_legal_moves()))
+            game.current_player = 'Y' if game.current_player == 'R' else 'R'
+        for board, red, yellow, heights, current_player, legal_moves in reversed(history):
+            game.undo_move()
+            assert (game.board, game.red, game.yellow, game.heights) == (board, red, yellow, heights)
+            assert game.current_player == current_player
+            assert game.get_legal_moves() == legal_moves
+        assert game.moves == [] and game.move_count == 0
+
+
+def test_undo_to_and_board_round_trips():
+    rng = random.Random(2)
+    game = new_game()
+    for _ in range(10):
+        game.apply_move(rng.choice(game.get_legal_moves()))
+        game.current_player = 'Y' if game.current_player == 'R' else 'R'
+    red, yellow, board = game.red, game.yellow, game.board
+
+    copy = ConnectFour(board, game.current_player)
+    assert (copy.red, copy.yellow, copy.heights) == (red, yellow, game.heights)
+    same = ConnectFour.from_bitboards(red, yellow, game.current_player)
+    assert same.board == board and same.position_key() == game.position_key()
+
+    for _ in range(5):
+        game.apply_move(rng.choice(game.get_legal_moves()))
+    game.undo_to(10)
+    assert (game.red, game.yellow, game.board) == (red, yellow, board)
+
+
+def test_full_columns_are_not_legal():
+    game = new_game()
+    for _ in range(ROWS):
+        assert game.apply_move(3)
+    assert not game.apply_move(3)
+    assert 3 not in game.get_legal_moves()
+    game.undo_move()
+    assert 3 in game.get_legal_moves()
@@ -0,0 +1,111 @@
+import os
+import sys
+import json
+import socket
+import tempfile
+import threading
+
+import pytest
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from engine_server import EngineServer, serve_lines, serve_socket
+
+
+@pytest.fixture(scope="module")
+def engine():
+    engine = EngineServer(workers=1, book_path=None)
+    yield engine
+    engine.close()
+
+
+def serve(engine, requests):
+    replies = []
+    serve_lines(engine, [json.dumps(request) for request in requests], lambda text: replies.append(json.loads(text)))
+    return {reply["id"]: reply for reply in replies}
+
+
+def test_replies_echo_ids(engine):
+    replies = serve(engine, [
+        {"id": 1, "moves": "4453", "algorithm": "UCT", "budget": 50, "seed": 1},
+        {"id": 2, "board": ["OOOOOOO"] * 5 + ["RRROYYO"], "player": "R", "algorithm": "UCT", "budget": 200},
+        {"id": 3, "moves": "44", "algorithm": "UR", "seed": 3},
+    ])
+    assert sorted(replies) == [1, 2, 3]
+    assert replies[1]["move"] in range(7) and len(replies[1]["values"]) == 7
+    assert replies[2]["move"] == 3
+    assert replies[3]["source"] == "search"
+
+
+def test_bad_requests_get_errors(engine):
+    replies = serve(engine, [
+        {"id": 1, "moves": "4444444"},
+        {"id": 2, "moves": "4", "algorithm": "Nope"},
+        {"id": 3, "board": ["OOOOOOO"] * 6, "player": "X"},
+        {"id": 4, "moves": "4", "algorithm": "UCT", "options": {"workers": 4}},
+    ])
+    assert all("error" in reply for reply in replies.values())
+
+    lines = []
+    serve_lines(engine, ["not json"], lines.append)
+    assert "error" in json.loads(lines[0])
+
+
+def test_sessions_carry_the_tree(engine):
+    replies = serve(engine, [{"id": 1, "moves": "4", "algorithm": "UCT", "budget": 300, "session": "s", "seed": 1}])
+    played = "4" + str(replies[1]["move"] + 1)
+    follow = serve(engine, [{"id": 2, "moves": played + "4", "algorithm": "UCT", "budget": 300, "session": "s"}])
+    assert follow[2]["carried_visits"] > 0
+
+
+def test_sessions_take_search_options(engine):
+    options = {"tt_size": 1000, "mirror": True, "max_nodes": 5000, "endgame_cells": 8}
+    replies = serve(engine, [
+        {"id": 1, "moves": "4", "algorithm": "UCT", "budget": 200, "session": "o", "options": options},
+        {"id": 2, "moves": "4", "algorithm": "UCT", "budget": 200, "session": "n", "options": {"node_store": True}},
+        {"id": 3, "moves": "4", "algorithm": "UCT", "budget": 200, "session": "f", "options": {"node_store": False}},
+    ])
+    assert replies[1]["move"] in range(7) and replies[3]["move"] in range(7)
+    assert "node_store" in replies[2]["error"]
+
+
+def test_session_map_is_bounded(monkeypatch):
+    import engine_server
+    monkeypatch.setattr(engine_server, "MAX_SESSIONS", 3)
+    engine = EngineServer(workers=1, book_path=None)
+    try:
+        for name in "abcdecf":
+            serve(engine, [{"id": 1, "moves": "4", "algorithm": "UR", "session": name}])
+        assert sorted(engine._sessions) == ["c", "e", "f"]
+    finally:
+        engine.close()
+
+def test_broken_client_does_not_stop_replies(engine):
+    def broken_pipe(text):
+        raise BrokenPipeError
+    broken = threading.Thread(target=serve_lines, daemon=True,
+                              args=(engine, [json.dumps({"id": 1, "moves": "4", "algorithm": "UR"})], broken_pipe))
+    broken.start()
+    broken.join(30)
+    assert not broken.is_alive()
+    assert serve(engine, [{"id": 2, "moves": "4", "algorithm": "UR"}])[2]["move"] in range(7)
+
+
+def test_socket_clients(engine):
+    path = os.path.join(tempfile.mkdtemp(), "engine.sock")
+    threading.Thread(target=serve_socket, args=(engine, path), daemon=True).start()
+    while not os.path.exists(path):
+        pass
+
+    # A client that leaves before its reply must not break the next one
+    gone = socket.socket(socket.AF_UNIX)
+    gone.connect(path)
+    gone.sendall(json.dumps({"id": 1, "moves": "4", "algorithm": "UCT", "budget": 3000}).encode() + b"\n")
+    gone.close()
+
+    with socket.socket(socket.AF_UNIX) as client:
+        client.settimeout(60)
+        client.connect(path)
+        client.sendall(json.dumps({"id": 2, "moves": "4", "algorithm": "UR"}).encode() + b"\n")
+        reply = json.loads(client.makefile().readline())
+    assert reply["id"] == 2 and reply["move"] in range(7)
@@ -0,0 +1,50 @@
+import os
+import sys
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from algorithms.uct import uct_search
+from utils.eval_cache import EvalCache, cache_key, cached_search, HEADER, RECORD
+
+VALUES = [0.5, None, -0.25, 0.0, None, 1.0, -1.0]
+
+
+def key(n, algorithm="UCT"):
+    return cache_key(n, 0, 'R', algorithm, 500)
+
+
+def test_put_get_and_reopen(tmp_path):
+    path = str(tmp_path / "cache.bin")
+    cache = EvalCache(path)
+    assert cache.get(key(1)) is None
+    cache.put(key(1), 3, VALUES)
+    assert cache.get(key(1)) == (3, VALUES)
+    assert cache.get(key(1, "PMCGS")) is None
+
+    reopened = EvalCache(path)
+    assert reopened.get(key(1)) == (3, VALUES)
+    cache.put(key(2), 4, VALUES)
+    assert reopened.get(key(2)) == (4, VALUES)  # appended by another instance
+
+
+def test_compaction_keeps_recently_used_records(tmp_path):
+    path = str(tmp_path / "cache.bin")
+    cache = EvalCache(path, max_bytes=HEADER.size + 20 * RECORD.size)
+    for n in range(60):
+        cache.put(key(n), n % 7, VALUES)
+    assert os.path.getsize(path) <= HEADER.size + 20 * RECORD.size
+    assert cache.get(key(59)) == (59 % 7, VALUES)
+    assert cache.get(key(0)) is None
+    assert EvalCache(path).get(key(59)) == (59 % 7, VALUES)
+
+
+def test_cached_search_replays_seeded_searches(tmp_path):
+    cache = EvalCache(str(tmp_path / "cache.bin"))
+    board = [list("OOOOOOO") for _ in range(5)] + [list("OOORYOO")]
+    first, second = {}, {}
+    move = cached_search(cache, "UCT", uct_search, board, 'R', "None", 200, seed=7, report=first)
+    assert cached_search(cache, "UCT", uct_search, board, 'R', "None", 200, seed=7, report=second) == move
+    assert not first["cached"] and second["cached"]
+    for cached, searched in zip(second["values"], first["values"]):
+        assert (cached is None) == (searched is None)
+        assert searched is None or abs(cached - searched) < 1e-6  # stored as float32
@@ -1,36 +1,39 @@
 import subprocess
-import re
 import csv
 import os
+import sys
+import tempfile
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from utils.trace import read_trace
 
 def run_game(board_path, num_simulations=500):
     """
-    Run a single game on the given board using Improved UCT.
+    Run a single game on the given board using Improved UCT, recording
+    its search in a trace file that is read back with read_trace.
     """
-    args = ['python3', 'connectFour.py', board_path, 'Verbose', str(num_simulations)]
-    result = subprocess.run(args, stdout=subprocess.PIPE, text=True)
-    output = result.stdout.splitlines()
-
-    move_count = 0
-    terminal_values = []
-    v_lines = []
+    with tempfile.TemporaryDirectory() as trace_dir:
+        trace_path = os.path.join(trace_dir, "trace.jsonl")
+        args = ['python3', 'connectFour.py', board_path, 'None', str(num_simulations), '--trace', trace_path]
+        subprocess.run(args, stdout=subprocess.DEVNULL)
 
-    for line in output:
-        if line.startswith("Move selected"):
-            move_count += 1
-        elif line.startswith("TERMINAL NODE VALUE:"):
-            val = int(line.split(":")[1].strip())
-            terminal_values.append(val)
-        elif re.match(r'^V\d:', line):
-            v_lines.append(line)
+        move_count = 0
+        result_sum = 0
+        last_values = None
+        if os.path.exists(trace_path):
+            for event in read_trace(trace_path, {"selected", "result", "ucb"}):
+                if event["kind"] == "selected":
+                    move_count += 1
+                elif event["kind"] == "result":
+                    result_sum += event["value"]
+                else:
+                    last_values = event["values"]
 
-    result_sum = sum(terminal_values)
     result_label = "Win" if result_sum > 0 else "Loss" if result_sum < 0 else "Draw"
 
-    if v_lines:
-        last_v = v_lines[-1]
-        v_values = [float(num) for num in re.findall(r"[-+]?\d*\.\d+|\d+", last_v)]
-        avg_v = round(sum(v_values) / len(v_values), 3)
+    if last_values:
+        avg_v = round(sum(last_values.values()) / len(last_values), 3)
     else:
         avg_v = None
 
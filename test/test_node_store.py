@@ -0,0 +1,34 @@
+import os
+import sys
+import random
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from algorithms.uct import uct_search
+from algorithms.solver import solve_position
+
+# Yellow to move with three empty cells: column 3 (index 2) draws, column 1 loses
+NEAR_FULL = [list(row) for row in (
+    "OYORYRY",
+    "ORYRYYR",
+    "RRRYRRY",
+    "RYYRRYY",
+    "YRYYYRR",
+    "YRYRRRY",
+)]
+
+
+def test_store_search_scores_finished_games():
+    random.seed(0)
+    report = {}
+    move = uct_search(NEAR_FULL, 'Y', "None", 300, node_store=True, endgame_cells=0, report=report)
+    assert sum(report["visits"]) == 300
+    assert move == solve_position(NEAR_FULL, 'Y', "None")
+
+
+def test_store_search_matches_node_search_on_a_win():
+    random.seed(0)
+    board = [list("OOOOOOO") for _ in range(5)] + [list("RRROYYO")]
+    report = {}
+    assert uct_search(board, 'R', "None", 500, node_store=True, endgame_cells=0, report=report) == 3
+    assert sum(report["visits"]) == 500
@@ -0,0 +1,60 @@
+import os
+import sys
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from connectFour import ConnectFour
+from build_opening_book import book_positions, build_book, _search_position
+from utils.bitboard import MIRRORED_COLUMN, mirror_bits
+from utils.opening_book import OpeningBook, canonical_book_key, write_book
+
+
+def test_written_entries_read_back_for_both_mirror_images(tmp_path):
+    positions = book_positions(3)
+    entries = {key: (key % 7, (key % 2001 - 1000) / 1000) for key in positions}
+    path = str(tmp_path / "test.book")
+    write_book(path, entries, 3)
+
+    book = OpeningBook(path)
+    try:
+        assert len(book) == len(entries) and book.depth == 3
+        for key, (red, yellow, player, mirrored) in positions.items():
+            move, value = entries[key]
+            game = ConnectFour.from_bitboards(red, yellow, player)
+            assert book.lookup(game) == ((MIRRORED_COLUMN[move] if mirrored else move), value)
+            if (mirror_bits(red), mirror_bits(yellow)) == (red, yellow):
+                continue  # a symmetric position is its own mirror image
+            mirror = ConnectFour.from_bitboards(mirror_bits(red), mirror_bits(yellow), player)
+            assert book.lookup(mirror) == ((move if mirrored else MIRRORED_COLUMN[move]), value)
+        deeper = ConnectFour([list("OOOOOOO") for _ in range(2)] + [list("RYRYRYR")] * 4, 'R')
+        assert book.lookup(deeper) is None
+    finally:
+        book.close()
+
+
+def test_mirror_images_share_a_key():
+    for red, yellow, player, _ in book_positions(4).values():
+        assert canonical_book_key(red, yellow, player)[0] == \
+            canonical_book_key(mirror_bits(red), mirror_bits(yellow), player)[0]
+
+
+def test_built_book_moves_are_legal(tmp_path):
+    path = str(tmp_path / "built.book")
+    count = build_book(path, 1, 50, workers=1)
+    book = OpeningBook(path)
+    try:
+        assert len(book) == count
+        for red, yellow, player, _ in book_positions(1).values():
+            game = ConnectFour.from_bitboards(red, yellow, player)
+            move, value = book.lookup(game)
+            assert move in game.get_legal_moves() and -1 <= value <= 1
+    finally:
+        book.close()
+
+
+def test_budgets_below_the_move_count_are_searched():
+    game = ConnectFour.from_bitboards(0, 0, 'R')
+    key = canonical_book_key(game.red, game.yellow, 'R')[0]
+    for seed in range(10):
+        _, move, value = _search_position((key, (0, 0, 'R', False), 1, seed))
+        assert move in game.get_legal_moves() and -1 <= value <= 1
@@ -0,0 +1,18 @@
+import os
+import sys
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from connectFour import parse_options
+
+
+def test_flags_are_converted():
+    assert parse_options(["--workers", "2", "--max-memory-mb", "1.5", "--cache", "c.bin"]) == \
+        {"workers": 2, "max_memory_mb": 1.5, "cache": "c.bin"}
+
+
+def test_malformed_flags_are_reported(capsys):
+    assert parse_options(["--workers"]) is None
+    assert parse_options(["--nope", "1"]) is None
+    assert parse_options(["--time-limit-ms", "abc"]) is None
+    assert "--time-limit-ms" in capsys.readouterr().out
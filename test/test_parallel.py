@@ -0,0 +1,31 @@
+import os
+import sys
+import random
+
+import pytest
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from algorithms.uct import uct_search
+
+# Red has three in a row on the bottom and wins by playing column 4 (index 3)
+RED_WINS_AT_3 = [list("OOOOOOO") for _ in range(5)] + [list("RRROYYO")]
+
+
+@pytest.mark.parametrize("parallel", ["root", "tree"])
+def test_parallel_search_finds_the_win(parallel):
+    random.seed(0)
+    report = {}
+    move = uct_search(RED_WINS_AT_3, 'R', "None", 200, workers=2, parallel=parallel, report=report)
+    assert move == 3
+    assert report["simulations"] > 0
+
+
+@pytest.mark.parametrize("parallel", ["root", "tree"])
+def test_parallel_search_from_the_empty_board(parallel):
+    random.seed(0)
+    board = [list("OOOOOOO") for _ in range(6)]
+    report = {}
+    move = uct_search(board, 'R', "None", 200, workers=2, parallel=parallel, report=report)
+    assert move in range(7)
+    assert len(report["values"]) == 7
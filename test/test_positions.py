@@ -0,0 +1,75 @@
+import os
+import sys
+import json
+import random
+
+import pytest
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from connectFour import ConnectFour
+from utils.positions import request_game
+from convert_positions import read_positions, write_positions
+from utils.packed_positions import PackedPositions, write_packed, valid_bitboards
+
+EMPTY_ROWS = ["OOOOOOO"] * 6
+
+
+def random_positions(count, seed=0):
+    rng = random.Random(seed)
+    positions = []
+    for _ in range(count):
+        game = ConnectFour([list(row) for row in EMPTY_ROWS], 'R')
+        for _ in range(rng.randrange(30)):
+            move = rng.choice(game.get_legal_moves())
+            game.apply_move(move)
+            game.current_player = 'Y' if game.current_player == 'R' else 'R'
+            if game.check_winner_after(move, game.last_row) is not None:
+                break
+        positions.append((game.red, game.yellow, game.current_player))
+    return positions
+
+
+@pytest.mark.parametrize("rows", [
+    ["OOOROOO"] + ["OOOOOOO"] * 5,                   # a floating stone
+    ["OOOOOOO"] * 4 + ["OOOROOO", "OOOOOOO"],         # a stone above a gap
+    ["OOOOOOO"] * 5 + ["OOOXOOO"],                    # an unknown cell
+])
+def test_impossible_boards_are_rejected(rows):
+    with pytest.raises(ValueError):
+        request_game({"board": rows, "player": "R"})
+
+
+def test_bad_bitboards_are_rejected():
+    assert not valid_bitboards(1 << 1, 0)  # a stone on an empty cell
+    assert not valid_bitboards(1, 1)
+    with pytest.raises(ValueError):
+        request_game({"red": 2, "yellow": 0, "player": "Y"})
+
+
+def test_text_positions_with_gaps_do_not_convert(tmp_path):
+    source = tmp_path / "positions.jsonl"
+    source.write_text(json.dumps({"board": ["OOOROOO"] + ["OOOOOOO"] * 5, "player": "R"}) + "\n")
+    with pytest.raises(ValueError):
+        list(read_positions(str(source)))
+
+
+def test_packed_round_trip(tmp_path):
+    positions = random_positions(200)
+    path = str(tmp_path / "positions.c4p")
+    assert write_packed(path, positions) == len(positions)
+    with PackedPositions(path) as packed:
+        assert len(packed) == len(positions)
+        assert list(packed) == positions
+        assert packed[-1] == positions[-1]
+        records = packed.records()
+        assert records["red"].tolist() == [red for red, _, _ in positions]
+        del records
+
+
+@pytest.mark.parametrize("target", ["positions.jsonl", "boards"])
+def test_text_round_trip(tmp_path, target):
+    positions = random_positions(50, seed=1)
+    path = str(tmp_path / target)
+    assert write_positions(positions, path) == len(positions)
+    assert list(read_positions(path)) == positions
@@ -0,0 +1,39 @@
+import os
+import sys
+import glob
+import json
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from self_play import run_self_play, scan_shards
+
+
+def shard_games(directory):
+    games = []
+    for path in sorted(glob.glob(os.path.join(directory, "shard_*.jsonl"))):
+        with open(path) as file:
+            games.append([record["game"] for record in map(json.loads, file) if record["type"] == "game"])
+    return games
+
+
+def test_resume_starts_a_new_shard_when_the_last_one_is_full(tmp_path):
+    directory = str(tmp_path)
+    run_self_play(directory, 2, "UCT", 20, workers=1, max_shard_bytes=1, verbosity="None")
+    assert shard_games(directory) == [[0], [1]]
+    assert scan_shards(directory, max_bytes=1)[2] == 2
+
+    run_self_play(directory, 3, "UCT", 20, workers=1, max_shard_bytes=1, verbosity="None")
+    assert shard_games(directory) == [[0], [1], [2]]
+
+
+def test_resume_truncates_an_unfinished_game(tmp_path):
+    directory = str(tmp_path)
+    run_self_play(directory, 1, "UCT", 20, workers=1, verbosity="None")
+    path = os.path.join(directory, "shard_00000.jsonl")
+    size = os.path.getsize(path)
+    with open(path, "a") as file:
+        file.write(json.dumps({"type": "position", "game": 1, "red": 0, "yellow": 0, "player": "R"}) + "\n{\"type\": \"pos")
+
+    finished, seen, shard = scan_shards(directory)
+    assert finished == {0} and seen and shard == 0
+    assert os.path.getsize(path) == size
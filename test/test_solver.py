@@ -0,0 +1,95 @@
+import os
+import sys
+import random
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from connectFour import ConnectFour, ROWS, COLUMNS, EMPTY
+from algorithms.solver import Solver, best_solved_move, wins_with
+from algorithms.uct import new_root, grow_tree, Node
+from utils.bitboard import BOARD_CELLS
+from utils.monte_utils import simulate_random_game
+
+
+def minimax(game):
+    """
+    Plain minimax value for the player to move: 1 win, 0 draw, -1 loss.
+    """
+    best = -1
+    for col in game.get_legal_moves():
+        value = move_value(game, col)
+        best = max(best, value)
+        if best == 1:
+            break
+    return best
+
+
+def move_value(game, col):
+    """
+    Minimax value of playing col, for the player to move.
+    """
+    player = game.current_player
+    game.apply_move(col)
+    winner = game.check_winner_after(col, game.last_row)
+    if winner is not None:
+        value = 0 if winner == 'Draw' else 1
+    else:
+        game.current_player = 'Y' if player == 'R' else 'R'
+        value = -minimax(game)
+    game.undo_move()
+    return value
+
+
+def endgame_positions(count, empty_cells, seed):
+    """
+    Positions with `empty_cells` empty cells where the player to move has
+    no immediate win, by seeded random play.
+    """
+    rng = random.Random(seed)
+    positions = []
+    while len(positions) < count:
+        game = ConnectFour([[EMPTY] * COLUMNS for _ in range(ROWS)], 'R')
+        while game.move_count < BOARD_CELLS - empty_cells:
+            move = rng.choice(game.get_legal_moves())
+            game.apply_move(move)
+            if game.check_winner_after(move, game.last_row) is not None:
+                break
+            game.current_player = 'Y' if game.current_player == 'R' else 'R'
+        else:
+            if not any(wins_with(game, col) for col in game.get_legal_moves()):
+                positions.append(ConnectFour.from_bitboards(game.red, game.yellow, game.current_player))
+    return positions
+
+
+def test_solver_matches_minimax():
+    for game in endgame_positions(30, 11, seed=0):
+        expected = {col: move_value(game, col) for col in game.get_legal_moves()}
+        solver = Solver()
+        assert solver.outcomes(game, BOARD_CELLS - game.move_count) == expected
+
+        results = Solver().solve(game)
+        assert results[best_solved_move(results)] == max(expected.values())
+
+
+def test_mcts_solver_proven_values_are_exact():
+    random.seed(0)
+    proven_roots = 0
+    for game in endgame_positions(20, 12, seed=1):
+        exact = Solver().outcomes(game, BOARD_CELLS - game.move_count)
+        root = new_root(game, Node)
+        grow_tree(root, game, "None", 5000, simulate_random_game)
+        for child in root.children.values():
+            if child.proven is not None:
+                assert child.proven == exact[child.move]
+        if root.proven is not None:
+            proven_roots += 1
+            assert root.proven == -max(exact.values())
+    assert proven_roots > 0
+
+
+def test_mcts_solver_proves_an_immediate_win():
+    game = ConnectFour([list("OOOOOOO") for _ in range(5)] + [list("RRROYYO")], 'R')
+    root = new_root(game, Node)
+    grow_tree(root, game, "None", 100, simulate_random_game)
+    assert root.children[3].proven == 1
+    assert root.proven == -1
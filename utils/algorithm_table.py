@@ -0,0 +1,89 @@
+"""
+The search algorithms a board file, request or agent can name, and how to
+load them. Every entry point that dispatches on an algorithm name reads
+this table. The algorithm modules are only imported when an algorithm is
+loaded, so naming one does not pay for importing the others.
+"""
+import importlib
+
+# name -> (module, search entry point, rollout policy in utils.monte_utils,
+# module of the tree's Node class); UR plays no rollouts, and UR and PMCGS
+# grow no tree
+ALGORITHMS = {
+    "UR": ("algorithms.ur", "run_ur", None, None),
+    "PMCGS": ("algorithms.pmcgs", "run_pmcgs", "simulate_random_game", None),
+    "UCT": ("algorithms.uct", "uct_search", "simulate_random_game", "algorithms.uct"),
+    "Improved_UCT_Heuristic": ("algorithms.improved_uct_heuristic", "uct_search", "simulate_heuristic_game",
+                               "algorithms.uct"),
+    "Improved_UCT_UCB": ("algorithms.improved_uct_ucb", "uct_search", "simulate_random_game",
+                         "algorithms.improved_uct_ucb"),
+}
+
+# The UCT variants, which take every keyword option of algorithms.uct.uct_search
+TREE_SEARCHES = tuple(name for name, (_, _, _, node_module) in ALGORITHMS.items() if node_module is not None)
+
+# Keyword options of the other searches
+SEARCH_OPTIONS = {
+    "UR": (),
+    "PMCGS": ("time_limit_ms", "endgame_cells"),
+}
+
+# Options a request to the engine server or the analyzer may set; the rest
+# (workers, parallel, ...) belong to the process that serves it
+REQUEST_OPTIONS = ("tt_size", "mirror", "time_limit_ms", "node_store", "max_nodes", "max_memory_mb",
+                   "endgame_cells")
+
+
+def _entry(algorithm):
+    if algorithm not in ALGORITHMS:
+        raise ValueError(f"Algorithm '{algorithm}' not implemented.")
+    return ALGORITHMS[algorithm]
+
+
+def load_search(algorithm):
+    """
+    The algorithm's search entry point, called as
+    search(board, current_player, verbosity, parameter, **options).
+    """
+    module, function, _, _ = _entry(algorithm)
+    return getattr(importlib.import_module(module), function)
+
+
+def rollout_policy(algorithm):
+    """
+    The rollout function of the algorithm, or None for UR.
+    """
+    rollout = _entry(algorithm)[2]
+    return getattr(importlib.import_module("utils.monte_utils"), rollout) if rollout else None
+
+
+def node_class(algorithm):
+    """
+    The Node class of a tree search, or None for the other algorithms.
+    """
+    module = _entry(algorithm)[3]
+    return importlib.import_module(module).Node if module else None
+
+
+def search_keywords(algorithm, options):
+    """
+    The options out of `options` that the algorithm's search takes; the
+    others (tree search settings for PMCGS, say) are dropped.
+    """
+    _entry(algorithm)
+    allowed = SEARCH_OPTIONS.get(algorithm)
+    if allowed is None:
+        return dict(options)
+    return {name: value for name, value in options.items() if name in allowed}
+
+
+def request_options(algorithm, options):
+    """
+    Check the search options of a request, which may only set
+    REQUEST_OPTIONS that the algorithm takes. Returns them as a dict.
+    """
+    allowed = [name for name in REQUEST_OPTIONS if name in SEARCH_OPTIONS.get(algorithm, REQUEST_OPTIONS)]
+    unknown = set(options) - set(allowed)
+    if unknown:
+        raise ValueError(f"unsupported options for {algorithm}: {', '.join(sorted(unknown))}")
+    return dict(options)
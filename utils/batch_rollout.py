@@ -0,0 +1,172 @@
+"""
+Vectorized random rollouts: thousands of games advanced together as NumPy arrays.
+
+In batch_random_rollouts every game starts from the same position and
+plays one ply per step, so the side to move and the move count are
+shared by the whole batch. rollouts_from_positions instead starts each
+game from its own position, tracking the side to move per game.
+Finished games are retired from the active set after each ply.
+NumPy is optional; `available()` reports whether this engine can be used.
+"""
+import random
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - exercised only without NumPy
+    np = None
+
+from utils.bitboard import ROWS, COLUMNS, COLUMN_HEIGHT, BOARD_CELLS, has_four
+from utils.monte_utils import CENTER_FIRST_ORDER
+
+# Upper bound on games held in memory at once
+MAX_BATCH = 1 << 16
+
+
+if np is not None:
+    # Bit length of every column value (the column's height), and a
+    # preference key per column that makes argmax pick the most central
+    _COLUMN_BIT_LENGTH = np.array([value.bit_length() for value in range(1 << COLUMN_HEIGHT)], dtype=np.int64)
+    _CENTER_PREFERENCE = np.zeros(COLUMNS)
+    for rank, col in enumerate(CENTER_FIRST_ORDER):
+        _CENTER_PREFERENCE[col] = COLUMNS - rank
+
+
+def available():
+    """
+    Return True if NumPy is installed and batched rollouts can run.
+    """
+    return np is not None
+
+
+def _has_four(stones):
+    """
+    Vectorized bitboard four-in-a-row test over a uint64 array.
+    """
+    won = np.zeros(stones.shape, dtype=bool)
+    for shift in (1, COLUMN_HEIGHT, COLUMN_HEIGHT - 1, COLUMN_HEIGHT + 1):
+        m = stones & (stones >> np.uint64(shift))
+        won |= (m & (m >> np.uint64(2 * shift))) != 0
+    return won
+
+
+def _play_batch(red, yellow, heights, current_player, first_moves, rng):
+    """
+    Play one game per entry of `first_moves` to the end with random moves.
+    Returns an int8 array of results: 1 Yellow win, -1 Red win, 0 draw.
+    """
+    count = len(first_moves)
+    stones = {
+        'R': np.full(count, red, dtype=np.uint64),
+        'Y': np.full(count, yellow, dtype=np.uint64),
+    }
+    height = np.tile(np.asarray(heights, dtype=np.int64), (count, 1))
+    results = np.zeros(count, dtype=np.int8)
+    active = np.arange(count)
+    cols = np.asarray(first_moves, dtype=np.int64)
+    player = current_player
+    stones_on_board = sum(heights)
+
+    while active.size:
+        if cols is None:
+            # Random legal column: largest random key among the open columns
+            keys = rng.random((active.size, COLUMNS))
+            keys[height[active] >= ROWS] = -1.0
+            cols = keys.argmax(axis=1)
+
+        rows = height[active, cols]
+        bits = np.left_shift(np.uint64(1), (cols * COLUMN_HEIGHT + rows).astype(np.uint64))
+        stones[player][active] |= bits
+        height[active, cols] = rows + 1
+        stones_on_board += 1
+
+        won = _has_four(stones[player][active])
+        results[active[won]] = 1 if player == 'Y' else -1
+        active = active[~won]
+        if stones_on_board == BOARD_CELLS:
+            break  # every game still running is a draw
+
+        player = 'Y' if player == 'R' else 'R'
+        cols = None
+
+    return results
+
+
+def batch_random_rollouts(game, first_moves, games_per_move, rng=None):
+    """
+    Play `games_per_move` random games after each move in `first_moves`.
+    The rollouts are split into batches of at most MAX_BATCH games. Without
+    an rng one is seeded from the random module, so random.seed() makes
+    the rollouts reproducible.
+    Returns:
+        list of result sums (Yellow's point of view), aligned with first_moves
+    """
+    if rng is None:
+        rng = np.random.default_rng(random.getrandbits(64))
+
+    sums = [0] * len(first_moves)
+    if has_four(game.red) or has_four(game.yellow):
+        winner = 1 if has_four(game.yellow) else -1
+        return [winner * games_per_move for _ in first_moves]
+
+    chunk = max(1, MAX_BATCH // max(1, len(first_moves)))
+    remaining = games_per_move
+    while remaining > 0:
+        size = min(chunk, remaining)
+        moves = np.repeat(np.asarray(first_moves, dtype=np.int64), size)
+        results = _play_batch(game.red, game.yellow, game.heights,
+                              game.current_player, moves, rng)
+        per_move = results.reshape(len(first_moves), size).sum(axis=1, dtype=np.int64)
+        for i, total in enumerate(per_move):
+            sums[i] += int(total)
+        remaining -= size
+    return sums
+
+
+def rollouts_from_positions(reds, yellows, yellow_to_move, rng=None, heuristic=False):
+    """
+    Play one game to the end from each of a batch of unfinished positions,
+    given as Red and Yellow bitboards and whether Yellow moves next.
+    Moves are random, or with heuristic=True the most central open column
+    (the policy of simulate_heuristic_game). Without an rng one is seeded
+    from the random module.
+    Returns an int8 array of results: 1 Yellow win, -1 Red win, 0 draw.
+    """
+    if rng is None:
+        rng = np.random.default_rng(random.getrandbits(64))
+
+    count = len(reds)
+    red = np.asarray(reds, dtype=np.uint64)
+    yellow = np.asarray(yellows, dtype=np.uint64)
+    yellow_next = np.asarray(yellow_to_move, dtype=bool)
+    mover = np.where(yellow_next, yellow, red)
+    waiting = np.where(yellow_next, red, yellow)
+    mover_sign = np.where(yellow_next, 1, -1).astype(np.int8)  # result if the mover wins
+
+    # A column's stones fill its low bits, so its height is their bit length
+    occupied = red | yellow
+    shifts = np.arange(0, COLUMNS * COLUMN_HEIGHT, COLUMN_HEIGHT, dtype=np.uint64)
+    height = _COLUMN_BIT_LENGTH[(occupied[:, None] >> shifts) & np.uint64((1 << COLUMN_HEIGHT) - 1)]
+    stones_on_board = height.sum(axis=1)
+
+    results = np.zeros(count, dtype=np.int8)
+    active = np.arange(count)
+    while active.size:
+        heights = height[active]
+        keys = np.tile(_CENTER_PREFERENCE, (active.size, 1)) if heuristic else rng.random((active.size, COLUMNS))
+        keys[heights >= ROWS] = -1.0
+        cols = keys.argmax(axis=1)
+
+        rows = heights[np.arange(active.size), cols]
+        stones = mover[active] | np.left_shift(np.uint64(1), (cols * COLUMN_HEIGHT + rows).astype(np.uint64))
+        mover[active] = stones
+        height[active, cols] = rows + 1
+        stones_on_board[active] += 1
+
+        won = _has_four(stones)
+        results[active[won]] = mover_sign[active[won]]
+        active = active[~won & (stones_on_board[active] < BOARD_CELLS)]  # full boards are draws
+
+        mover[active], waiting[active] = waiting[active], mover[active]
+        mover_sign[active] = -mover_sign[active]
+
+    return results
@@ -0,0 +1,137 @@
+"""
+Bitboard helpers for the Connect Four game core.
+
+Each player's stones are stored in one integer. Column c owns bits
+c * 7 .. c * 7 + 6: the six playable cells from the bottom row upwards plus
+one always-empty sentinel bit, so shifted lines can never wrap from one
+column into the next.
+"""
+
+ROWS = 6
+COLUMNS = 7
+COLUMN_HEIGHT = ROWS + 1  # playable cells plus the sentinel bit
+
+BOTTOM_MASK = sum(1 << (col * COLUMN_HEIGHT) for col in range(COLUMNS))
+BOARD_MASK = BOTTOM_MASK * ((1 << ROWS) - 1)
+ALL_COLUMNS_FULL = (1 << COLUMNS) - 1
+BOARD_CELLS = ROWS * COLUMNS
+
+BOARD_BITS = COLUMNS * COLUMN_HEIGHT
+
+# Column each column maps to when the board is mirrored left to right
+MIRRORED_COLUMN = tuple(COLUMNS - 1 - col for col in range(COLUMNS))
+
+# Legal move tuples indexed by a 7-bit "column is full" mask
+LEGAL_MOVES = tuple(
+    tuple(col for col in range(COLUMNS) if not full & (1 << col))
+    for full in range(1 << COLUMNS)
+)
+
+
+def cell_bit(col, height):
+    """
+    Return the bit for the cell `height` rows above the bottom of `col`.
+    """
+    return 1 << (col * COLUMN_HEIGHT + height)
+
+
+def _lines_through(col, height):
+    """
+    Mask of every cell that shares a four-long line with the given cell.
+    """
+    mask = 0
+    for dc, dh in ((0, 1), (1, 0), (1, 1), (1, -1)):
+        for step in range(-3, 4):
+            c, h = col + dc * step, height + dh * step
+            if 0 <= c < COLUMNS and 0 <= h < ROWS:
+                mask |= cell_bit(c, h)
+    return mask
+
+
+def has_four(stones):
+    """
+    Return True if the stone mask contains four in a row.
+    Shifts: 1 = vertical, 7 = horizontal, 6 and 8 = the two diagonals.
+    """
+    m = stones & (stones >> 1)
+    if m & (m >> 2):
+        return True
+    m = stones & (stones >> 7)
+    if m & (m >> 14):
+        return True
+    m = stones & (stones >> 6)
+    if m & (m >> 12):
+        return True
+    m = stones & (stones >> 8)
+    if m & (m >> 16):
+        return True
+    return False
+
+
+# Lines through each cell, indexed by bit position (sentinel bits map to 0)
+LINE_MASKS = tuple(
+    _lines_through(bit // COLUMN_HEIGHT, bit % COLUMN_HEIGHT) if bit % COLUMN_HEIGHT < ROWS else 0
+    for bit in range(COLUMNS * COLUMN_HEIGHT)
+)
+
+
+def position_key(red, yellow):
+    """
+    Unique integer key for a position: both stone masks side by side.
+    """
+    return red | yellow << BOARD_BITS
+
+
+def mirror_bits(stones):
+    """
+    Mirror a stone mask left to right.
+    """
+    mirrored = 0
+    for col in range(COLUMNS):
+        column = stones >> (col * COLUMN_HEIGHT) & 0x7F
+        mirrored |= column << ((COLUMNS - 1 - col) * COLUMN_HEIGHT)
+    return mirrored
+
+
+def column_heights(stones):
+    """
+    Return the per-column heights of a mask holding every stone on the board.
+    """
+    return [(stones >> (col * COLUMN_HEIGHT) & 0x7F).bit_length() for col in range(COLUMNS)]
+
+
+def from_rows(board, empty='O'):
+    """
+    Convert a list-of-lists board (row 0 is the top) into bitboards.
+    Returns:
+        red (int), yellow (int), heights (list of column heights)
+    """
+    red = 0
+    yellow = 0
+    heights = [0] * COLUMNS
+    for col in range(COLUMNS):
+        for height in range(ROWS):
+            cell = board[ROWS - 1 - height][col]
+            if cell == empty:
+                break
+            if cell == 'R':
+                red |= cell_bit(col, height)
+            else:
+                yellow |= cell_bit(col, height)
+            heights[col] = height + 1
+    return red, yellow, heights
+
+
+def to_rows(red, yellow, empty='O'):
+    """
+    Convert bitboards back into a list-of-lists board (row 0 is the top).
+    """
+    board = [[empty] * COLUMNS for _ in range(ROWS)]
+    for col in range(COLUMNS):
+        for height in range(ROWS):
+            bit = cell_bit(col, height)
+            if red & bit:
+                board[ROWS - 1 - height][col] = 'R'
+            elif yellow & bit:
+                board[ROWS - 1 - height][col] = 'Y'
+    return board
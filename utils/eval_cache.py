@@ -0,0 +1,207 @@
+"""
+Persistent cache of search results, shared by processes through one file.
+
+Results are keyed by a 16-byte digest of (position, side to move,
+algorithm, budget, seed, search options) and stored as fixed-size records
+appended to the file, so the file order is also the order of last use:
+a hit on an old record appends a fresh copy of it. When the file outgrows
+its size cap it is compacted to the most recently used half.
+
+Appends and compaction hold an exclusive lock on a side file
+(`<path>.lock`, via fcntl where available); readers never lock, read only
+whole records and reload when compaction has replaced the file.
+"""
+import os
+import random
+import struct
+import hashlib
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - no cross-process locking without fcntl
+    fcntl = None
+
+from connectFour import ConnectFour
+from utils.monte_utils import print_column_values
+from utils.opening_book import book_key
+
+MAGIC = b"C4EC"
+VERSION = 1
+HEADER = struct.Struct("<4sI")
+DIGEST_SIZE = 16
+# digest, best column, column values (NaN for Null)
+RECORD = struct.Struct(f"<{DIGEST_SIZE}sb3x7f")
+
+DEFAULT_MAX_BYTES = 64 * 2 ** 20
+
+NULL_VALUE = float("nan")
+
+
+def cache_key(red, yellow, current_player, algorithm, budget, seed=None, options=None):
+    """
+    Digest identifying one search: position and side to move, algorithm,
+    budget (simulations), seed (None for unseeded runs) and any other
+    options that change the result.
+    """
+    fields = (book_key(red, yellow, current_player), algorithm, budget, seed,
+              sorted((options or {}).items()))
+    return hashlib.blake2b(repr(fields).encode(), digest_size=DIGEST_SIZE).digest()
+
+
+class EvalCache:
+    """
+    Append-only on-disk map from cache_key digests to (column, values).
+    The whole index is kept in memory, so hits cost one dict lookup.
+    """
+    def __init__(self, path, max_bytes=DEFAULT_MAX_BYTES):
+        self.path = path
+        self.max_bytes = max(max_bytes, HEADER.size + 2 * RECORD.size)
+        self.hits = 0
+        self.misses = 0
+        self._index = {}   # digest -> (column, values, record number)
+        self._inode = None
+        self._offset = 0
+        self._records = 0
+        with self._locked():
+            if not os.path.exists(path) or os.path.getsize(path) == 0:
+                with open(path, "wb") as file:
+                    file.write(HEADER.pack(MAGIC, VERSION))
+        self._refresh()
+
+    def _locked(self):
+        return _FileLock(self.path + ".lock")
+
+    def _refresh(self):
+        """
+        Read records appended since the last refresh, or everything again
+        if the file was replaced by a compaction.
+        """
+        with open(self.path, "rb") as file:
+            inode = os.fstat(file.fileno()).st_ino
+            if inode != self._inode:
+                magic, version = HEADER.unpack(file.read(HEADER.size))
+                if magic != MAGIC or version != VERSION:
+                    raise ValueError(f"{self.path} is not a version {VERSION} evaluation cache")
+                self._index.clear()
+                self._inode, self._offset, self._records = inode, HEADER.size, 0
+            file.seek(self._offset)
+            data = file.read()
+        whole = len(data) - len(data) % RECORD.size
+        for digest, move, *values in RECORD.iter_unpack(data[:whole]):
+            values = [None if value != value else value for value in values]
+            self._index[digest] = (move, values, self._records)
+            self._records += 1
+        self._offset += whole
+
+    def get(self, key):
+        """
+        Cached (column, values) for a key, or None.
+        """
+        entry = self._index.get(key)
+        if entry is None:
+            self._refresh()
+            entry = self._index.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        move, values, record = entry
+        if self._records - record > self._capacity() // 2:
+            self.put(key, move, values)  # keep it among the recently used
+        return move, values
+
+    def put(self, key, move, values):
+        """
+        Append a result, compacting the file if it is over its size cap.
+        """
+        record = RECORD.pack(key, move, *(NULL_VALUE if value is None else value for value in values))
+        with self._locked():
+            with open(self.path, "ab") as file:
+                file.write(record)
+                size = file.tell()
+            if size > self.max_bytes:
+                self._compact()
+        self._refresh()
+
+    def _capacity(self):
+        return (self.max_bytes - HEADER.size) // RECORD.size
+
+    def _compact(self):
+        """
+        Rewrite the file with the most recently used distinct records that
+        fit in half the size cap. The caller holds the lock.
+        """
+        with open(self.path, "rb") as file:
+            file.seek(HEADER.size)
+            data = file.read()
+        data = data[:len(data) - len(data) % RECORD.size]
+        keep, seen = [], set()
+        for start in range(len(data) - RECORD.size, -1, -RECORD.size):
+            record = data[start:start + RECORD.size]
+            digest = record[:DIGEST_SIZE]
+            if digest not in seen:
+                seen.add(digest)
+                keep.append(record)
+                if len(keep) >= self._capacity() // 2:
+                    break
+        temp_path = f"{self.path}.{os.getpid()}.tmp"
+        with open(temp_path, "wb") as file:
+            file.write(HEADER.pack(MAGIC, VERSION))
+            file.write(b"".join(reversed(keep)))
+        os.replace(temp_path, self.path)
+
+    def __len__(self):
+        return len(self._index)
+
+
+class _FileLock:
+    """
+    Exclusive advisory lock on a side file, held for a with block.
+    """
+    def __init__(self, path):
+        self.path = path
+        self.file = None
+
+    def __enter__(self):
+        self.file = open(self.path, "ab")
+        if fcntl is not None:
+            fcntl.flock(self.file.fileno(), fcntl.LOCK_EX)
+        return self
+
+    def __exit__(self, *exc_info):
+        if fcntl is not None:
+            fcntl.flock(self.file.fileno(), fcntl.LOCK_UN)
+        self.file.close()
+
+
+def cached_search(cache, algorithm, search, board, current_player, verbosity, budget, seed=None, report=None,
+                  **options):
+    """
+    Run search(board, current_player, verbosity, budget, **options), or
+    replay its output from the cache. With a seed the random module is
+    seeded first, so a cached result is exactly what the search would
+    return; without one the result of an earlier unseeded run is reused.
+    A `report` dict receives the column values under "values" and whether
+    they came from the cache under "cached".
+    Returns the chosen column.
+    """
+    game = ConnectFour(board, current_player)
+    key = cache_key(game.red, game.yellow, current_player, algorithm, budget, seed, options)
+    found = cache.get(key)
+    if found is not None:
+        move, values = found
+        if report is not None:
+            report.update(values=values, cached=True)
+        print_column_values(values, verbosity)
+        print("FINAL Move selected:", move + 1)
+        return move
+
+    if seed is not None:
+        random.seed(seed)
+    if report is None:
+        report = {}
+    move = search(board, current_player, verbosity, budget, report=report, **options)
+    report.setdefault("values", [None] * 7)
+    report["cached"] = False
+    cache.put(key, move, report["values"])
+    return move
@@ -1,25 +1,31 @@
 import random
+import time
 from connectFour import ConnectFour
+
+# Rollout result for each check_winner outcome
+GAME_RESULTS = {'R': -1, 'Y': 1, 'Draw': 0}
+
+# Columns from the center outwards
+CENTER_FIRST_ORDER = (3, 2, 4, 1, 5, 0, 6)
+
 def simulate_random_game(game: ConnectFour):
     """
     Simulate a game to the end using random moves.
+    Only the position on entry needs a full check_winner scan; after that
+    each ply is checked through the stone that was just dropped.
     Returns:
         1 -> Yellow (Max) win
        -1 -> Red (Min) win
         0 -> Draw
     """
-    while True:
-        winner = game.check_winner()
-        if winner == 'R':
-            return -1
-        elif winner == 'Y':
-            return 1
-        elif winner == 'Draw':
-            return 0
+    winner = game.check_winner()
+    while winner is None:
         legal_moves = game.get_legal_moves()
         move = random.choice(legal_moves)
         game.apply_move(move)
         game.current_player = 'Y' if game.current_player == 'R' else 'R'
+        winner = game.check_winner_after(move, game.last_row)
+    return GAME_RESULTS[winner]
 
 
 def heuristic_move(game: ConnectFour):
@@ -28,8 +34,7 @@ def heuristic_move(game: ConnectFour):
     Prefers center column and moves closer to center.
     """
     legal = game.get_legal_moves()
-    preferred_order = [3, 2, 4, 1, 5, 0, 6]  # Center-first heuristic
-    for col in preferred_order:
+    for col in CENTER_FIRST_ORDER:
         if col in legal:
             return col
     return random.choice(legal)
@@ -43,17 +48,13 @@ def simulate_heuristic_game(game: ConnectFour):
        -1 -> Red (Min) win
         0 -> Draw
     """
-    while True:
-        winner = game.check_winner()
-        if winner == 'R':
-            return -1
-        elif winner == 'Y':
-            return 1
-        elif winner == 'Draw':
-            return 0
+    winner = game.check_winner()
+    while winner is None:
         move = heuristic_move(game)
         game.apply_move(move)
         game.current_player = 'Y' if game.current_player == 'R' else 'R'
+        winner = game.check_winner_after(move, game.last_row)
+    return GAME_RESULTS[winner]
 
 def basic_heuristic(game, move):
     """
@@ -62,3 +63,21 @@ def basic_heuristic(game, move):
     """
     center_preference = [3, 2, 2, 3, 2, 2, 1]  # Weights: columns 3 and 4 are most central
     return center_preference[move] / 3.0  # Normalize to [0, 1]
+
+def print_column_values(values, verbosity):
+    """
+    Print a search's per-column values (Yellow's point of view, None for
+    columns that are full or were not searched) under Brief or Verbose.
+    """
+    if verbosity in ["Verbose", "Brief"]:
+        for col, value in enumerate(values):
+            if value is None:
+                print(f"Column {col + 1}: Null")
+            else:
+                print(f"Column {col + 1}: {value:.2f}")
+
+def deadline_after(time_limit_ms):
+    """
+    Monotonic-clock deadline for a search time budget, or None without one.
+    """
+    return time.monotonic() + time_limit_ms / 1000 if time_limit_ms else None
@@ -0,0 +1,77 @@
+"""
+Struct-of-arrays storage for UCT search trees.
+
+Nodes are integer handles into parallel `array` columns instead of Python
+objects. A node's children occupy one contiguous block of handles created
+when the node is first expanded, one slot per legal move, so a node only
+needs the first handle and the size of that block.
+"""
+from array import array
+
+DEFAULT_CAPACITY = 1024
+
+# (attribute, array typecode, initial value) for each column
+COLUMNS = (
+    ("visits", "q", 0),         # ni
+    ("value", "d", 0.0),        # wi
+    ("first_child", "q", -1),   # handle of the first child, -1 before expansion
+    ("child_count", "B", 0),    # number of children in the block
+    ("move", "b", -1),          # column played to reach the node
+)
+
+
+class NodeStore:
+    """
+    Growable, preallocated node columns addressed by integer handles.
+    """
+    def __init__(self, capacity=DEFAULT_CAPACITY):
+        self.capacity = 0
+        self.size = 0
+        for name, typecode, initial in COLUMNS:
+            setattr(self, name, array(typecode))
+        self._grow(max(1, capacity))
+
+    def _grow(self, capacity):
+        extra = capacity - self.capacity
+        for name, typecode, initial in COLUMNS:
+            getattr(self, name).extend(array(typecode, [initial]) * extra)
+        self.capacity = capacity
+
+    def new_node(self, move=-1):
+        """
+        Allocate a single node (used for roots) and return its handle.
+        """
+        if self.size == self.capacity:
+            self._grow(self.capacity * 2)
+        handle = self.size
+        self.move[handle] = move
+        self.size += 1
+        return handle
+
+    def add_children(self, handle, moves):
+        """
+        Allocate one child per move as a contiguous block under `handle`.
+        """
+        count = len(moves)
+        while self.size + count > self.capacity:
+            self._grow(self.capacity * 2)
+        first = self.size
+        for offset, move in enumerate(moves):
+            self.move[first + offset] = move
+        self.first_child[handle] = first
+        self.child_count[handle] = count
+        self.size += count
+        return first
+
+    def children(self, handle):
+        """
+        Range of the child handles of a node (empty before expansion).
+        """
+        first = self.first_child[handle]
+        return range(first, first + self.child_count[handle]) if first >= 0 else range(0)
+
+    def nbytes(self):
+        """
+        Bytes held by the columns, including preallocated free slots.
+        """
+        return sum(getattr(self, name).itemsize * self.capacity for name, _, _ in COLUMNS)
@@ -0,0 +1,108 @@
+"""
+Read-only opening book: best moves for early positions, searched in place.
+
+The file is a 16-byte header followed by fixed-size records sorted by
+position key, so a book is opened with mmap and binary-searched without
+being parsed or loaded. Positions are stored once for a position and its
+mirror image, under whichever of the two has the smaller key.
+
+Header: magic, format version, depth (plies covered), record count.
+Record: position key, value in thousandths for the player to move, column.
+"""
+import os
+import mmap
+import struct
+
+from utils.bitboard import BOTTOM_MASK, BOARD_BITS, MIRRORED_COLUMN, mirror_bits
+
+MAGIC = b"C4BK"
+VERSION = 1
+HEADER = struct.Struct("<4sHHQ")
+RECORD = struct.Struct("<QhBx")
+
+# Book looked up by connectFour.py unless --book names another file
+DEFAULT_BOOK = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "books", "opening.book")
+
+# Book values are stored as integers in [-VALUE_SCALE, VALUE_SCALE]
+VALUE_SCALE = 1000
+
+
+def book_key(red, yellow, current_player):
+    """
+    64-bit key of a position and the side to move.
+    red + (red | yellow) + BOTTOM_MASK sets one marker bit above each
+    column's stones and keeps Red's stones below it, which identifies the
+    position in 49 bits; bit 49 holds the side to move.
+    """
+    key = red + (red | yellow) + BOTTOM_MASK
+    return key | (1 << BOARD_BITS) if current_player == 'Y' else key
+
+
+def canonical_book_key(red, yellow, current_player):
+    """
+    Key under which a position is stored, and whether that key belongs to
+    its mirror image (moves then map column c to 6 - c).
+    """
+    key = book_key(red, yellow, current_player)
+    mirrored = book_key(mirror_bits(red), mirror_bits(yellow), current_player)
+    return (mirrored, True) if mirrored < key else (key, False)
+
+
+def write_book(path, entries, depth):
+    """
+    Write a book file from {canonical key: (column, value)} entries, with
+    columns in the canonical orientation and values in [-1, 1] for the
+    player to move.
+    """
+    with open(path, "wb") as file:
+        file.write(HEADER.pack(MAGIC, VERSION, depth, len(entries)))
+        for key in sorted(entries):
+            move, value = entries[key]
+            file.write(RECORD.pack(key, round(value * VALUE_SCALE), move))
+
+
+class OpeningBook:
+    """
+    Memory-mapped view of a book file written by write_book.
+    """
+    def __init__(self, path):
+        with open(path, "rb") as file:
+            self._map = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        if len(self._map) < HEADER.size:
+            raise ValueError(f"{path} is not an opening book")
+        magic, version, self.depth, self.count = HEADER.unpack_from(self._map, 0)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"{path} is not a version {VERSION} opening book")
+        if len(self._map) != HEADER.size + self.count * RECORD.size:
+            raise ValueError(f"{path} is truncated")
+
+    def _find(self, key):
+        low, high = 0, self.count
+        while low < high:
+            middle = (low + high) // 2
+            middle_key, value, move = RECORD.unpack_from(self._map, HEADER.size + middle * RECORD.size)
+            if middle_key == key:
+                return move, value
+            if middle_key < key:
+                low = middle + 1
+            else:
+                high = middle
+        return None
+
+    def lookup(self, game):
+        """
+        Book move for the game's position as (column, value for the player
+        to move), or None if the position is not in the book.
+        """
+        key, mirrored = canonical_book_key(game.red, game.yellow, game.current_player)
+        found = self._find(key)
+        if found is None:
+            return None
+        move, value = found
+        return (MIRRORED_COLUMN[move] if mirrored else move), value / VALUE_SCALE
+
+    def __len__(self):
+        return self.count
+
+    def close(self):
+        self._map.close()
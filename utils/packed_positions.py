@@ -0,0 +1,156 @@
+"""
+Packed binary position files for large datasets.
+
+A file is a 16-byte header followed by fixed-size 17-byte records, one
+per position: Red's bitboard, Yellow's bitboard (little-endian 64-bit,
+bit col * 7 + height as in utils.bitboard) and the side to move
+(0 Red, 1 Yellow). PackedPositions maps a file with mmap, so records are
+read in place; with NumPy it also exposes the records as zero-copy
+structured arrays for bulk work.
+
+Header: magic, format version, record size, record count.
+"""
+import os
+import mmap
+import struct
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - array views need NumPy
+    np = None
+
+from utils.bitboard import COLUMNS, COLUMN_HEIGHT, BOARD_MASK, to_rows
+
+MAGIC = b"C4PP"
+VERSION = 1
+HEADER = struct.Struct("<4sHHQ")
+RECORD = struct.Struct("<QQB")
+
+# Extension that marks packed files for the converters and the analyzer
+PACKED_SUFFIX = ".c4p"
+
+PLAYERS = ('R', 'Y')
+
+
+def valid_bitboards(red, yellow):
+    """
+    True if two bitboards make a reachable-looking board: no shared cells,
+    nothing outside the board and no gaps under a stone in any column.
+    """
+    occupied = red | yellow
+    if red & yellow or occupied & ~BOARD_MASK:
+        return False
+    for col in range(COLUMNS):
+        column = occupied >> (col * COLUMN_HEIGHT) & ((1 << COLUMN_HEIGHT) - 1)
+        if column & (column + 1):
+            return False
+    return True
+
+
+def unpack_board(red, yellow, empty='O'):
+    """
+    List-of-lists board (row 0 is the top) of a record's bitboards.
+    """
+    return to_rows(red, yellow, empty)
+
+
+class PackedWriter:
+    """
+    Stream records into a new packed file. The record count in the header
+    is filled in by close(); use as a context manager.
+    """
+    def __init__(self, path):
+        self.path = path
+        self.count = 0
+        self._file = open(path, "wb")
+        self._file.write(HEADER.pack(MAGIC, VERSION, RECORD.size, 0))
+
+    def write(self, red, yellow, current_player):
+        self._file.write(RECORD.pack(red, yellow, PLAYERS.index(current_player)))
+        self.count += 1
+
+    def close(self):
+        self._file.seek(0)
+        self._file.write(HEADER.pack(MAGIC, VERSION, RECORD.size, self.count))
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def write_packed(path, positions):
+    """
+    Write (red, yellow, player) tuples to a packed file. Returns the count.
+    """
+    with PackedWriter(path) as writer:
+        for red, yellow, current_player in positions:
+            writer.write(red, yellow, current_player)
+    return writer.count
+
+
+class PackedPositions:
+    """
+    Memory-mapped view of a packed file. Indexing and iteration give
+    (red, yellow, player) tuples; records(), red, yellow and
+    yellow_to_move give NumPy views that share the mapped memory (drop
+    them before close(), which cannot unmap memory still in use).
+    """
+    def __init__(self, path):
+        with open(path, "rb") as file:
+            size = os.fstat(file.fileno()).st_size
+            if size < HEADER.size:
+                raise ValueError(f"{path} is not a packed position file")
+            self._map = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, record_size, self.count = HEADER.unpack_from(self._map, 0)
+        if magic != MAGIC or version != VERSION or record_size != RECORD.size:
+            raise ValueError(f"{path} is not a version {VERSION} packed position file")
+        if len(self._map) != HEADER.size + self.count * RECORD.size:
+            raise ValueError(f"{path} is truncated")
+
+    def __len__(self):
+        return self.count
+
+    def __getitem__(self, index):
+        if not -self.count <= index < self.count:
+            raise IndexError("position index out of range")
+        red, yellow, player = RECORD.unpack_from(self._map, HEADER.size + index % self.count * RECORD.size)
+        return red, yellow, PLAYERS[player]
+
+    def __iter__(self):
+        unpack_from, data = RECORD.unpack_from, self._map
+        for offset in range(HEADER.size, HEADER.size + self.count * RECORD.size, RECORD.size):
+            red, yellow, player = unpack_from(data, offset)
+            yield red, yellow, PLAYERS[player]
+
+    def records(self):
+        """
+        Structured NumPy array over all records, without copying.
+        """
+        if np is None:
+            raise RuntimeError("NumPy is required for array views of packed positions")
+        dtype = np.dtype([("red", "<u8"), ("yellow", "<u8"), ("player", "u1")])
+        return np.frombuffer(self._map, dtype=dtype, count=self.count, offset=HEADER.size)
+
+    @property
+    def red(self):
+        return self.records()["red"]
+
+    @property
+    def yellow(self):
+        return self.records()["yellow"]
+
+    @property
+    def yellow_to_move(self):
+        return self.records()["player"].view(bool)
+
+    def close(self):
+        self._map.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
@@ -0,0 +1,116 @@
+"""
+Position records and where they come from: board files, JSONL streams
+and packed position files.
+
+A record names a position the way an engine server request does
+(see engine_server.py): {"moves": "4453"} lists the 1-based columns
+played from the empty board, {"board": [...], "player": "R"} gives the
+six rows top first, as in a board file, and {"red": ..., "yellow": ...,
+"player": "R"} the two bitboards (see utils.bitboard).
+"""
+import os
+import sys
+import glob
+import json
+
+from connectFour import ConnectFour, ROWS, COLUMNS, EMPTY
+from utils.algorithm_table import ALGORITHMS
+from utils.file_utils import load_board_from_file
+from utils.packed_positions import PackedPositions, PACKED_SUFFIX, valid_bitboards
+
+
+def request_game(request):
+    """
+    Build the ConnectFour position named by a record. Boards with an
+    unknown cell or a stone above an empty cell are rejected.
+    """
+    if "moves" in request:
+        game = ConnectFour([[EMPTY] * COLUMNS for _ in range(ROWS)], 'R')
+        for char in str(request["moves"]):
+            col = int(char) - 1
+            if col not in game.get_legal_moves():
+                raise ValueError(f"illegal move {char} in {request['moves']!r}")
+            game.apply_move(col)
+            game.current_player = 'Y' if game.current_player == 'R' else 'R'
+        return ConnectFour.from_bitboards(game.red, game.yellow, game.current_player)
+
+    if "red" in request:
+        red, yellow = int(request["red"]), int(request.get("yellow", 0))
+        if not valid_bitboards(red, yellow):
+            raise ValueError("red and yellow are not the bitboards of a board")
+        if request.get("player") not in ('R', 'Y'):
+            raise ValueError("player must be 'R' or 'Y'")
+        return ConnectFour.from_bitboards(red, yellow, request["player"])
+
+    rows = request.get("board")
+    if not isinstance(rows, list) or len(rows) != ROWS or any(len(row) != COLUMNS for row in rows):
+        raise ValueError(f"board must be {ROWS} rows of {COLUMNS} cells")
+    if any(cell not in ('R', 'Y', EMPTY) for row in rows for cell in row):
+        raise ValueError(f"board cells must be 'R', 'Y' or '{EMPTY}'")
+    for col in range(COLUMNS):
+        column = "".join(row[col] for row in rows)  # top first
+        if EMPTY in column.lstrip(EMPTY):
+            raise ValueError(f"column {col + 1} has a stone above an empty cell")
+    if request.get("player") not in ('R', 'Y'):
+        raise ValueError("player must be 'R' or 'Y'")
+    return ConnectFour([list(row) for row in rows], request["player"])
+
+
+def board_file_positions(path):
+    """
+    Yield a record per board file of a directory (every *.txt, sorted) or glob.
+    The file's algorithm line becomes the record's algorithm.
+    """
+    if os.path.isdir(path):
+        files = sorted(glob.glob(os.path.join(path, "*.txt")))
+    else:
+        files = sorted(glob.glob(path))
+    for file_name in files:
+        algorithm, current_player, board = load_board_from_file(file_name)
+        record = {"id": os.path.basename(file_name), "board": ["".join(row) for row in board],
+                  "player": current_player}
+        if algorithm in ALGORITHMS:
+            record["algorithm"] = algorithm
+        yield record
+
+
+def jsonl_positions(lines):
+    """
+    Yield the records of a JSONL stream, skipping blank lines. A line that
+    is not a JSON object is passed on as its text so that its result can
+    report the error.
+    """
+    for line in lines:
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            record = json.loads(line)
+        except ValueError:
+            record = line
+        yield record
+
+
+def packed_positions(path):
+    """
+    Yield a bitboard record per position of a packed file.
+    """
+    with PackedPositions(path) as positions:
+        for red, yellow, current_player in positions:
+            yield {"red": red, "yellow": yellow, "player": current_player}
+
+
+def open_positions(source):
+    """
+    Records of an input: "-" for JSONL on stdin, a .jsonl file, a packed
+    .c4p file, or a directory or glob of board files.
+    """
+    if source == "-":
+        yield from jsonl_positions(sys.stdin)
+    elif source.endswith(PACKED_SUFFIX):
+        yield from packed_positions(source)
+    elif source.endswith(".jsonl"):
+        with open(source) as file:
+            yield from jsonl_positions(file)
+    else:
+        yield from board_file_positions(source)
@@ -0,0 +1,104 @@
+"""
+Optional instrumentation for the UCT search loop.
+
+A SearchStats passed to a search collects cumulative time and call counts
+per phase (select, expand, rollout, backpropagate), histograms of selection
+depth, of the branching factor along selected paths and of rollout length,
+and the number of iterations and searches. Stats from many searches (or
+processes) are combined with merge(). Without a SearchStats the search
+loop only pays for a few `is None` tests per iteration.
+"""
+from collections import Counter
+
+PHASES = ("select", "expand", "rollout", "backpropagate")
+
+
+class SearchStats:
+    """
+    Counters filled in by grow_tree. `callback`, if given, is called with
+    the stats after every `callback_every` iterations (0: never) and at the
+    end of every search.
+    """
+    def __init__(self, callback=None, callback_every=0):
+        self.callback = callback
+        self.callback_every = callback_every
+        self.phase_seconds = dict.fromkeys(PHASES, 0.0)
+        self.phase_calls = dict.fromkeys(PHASES, 0)
+        self.iterations = 0
+        self.searches = 0
+        self.depths = Counter()       # selected path length -> iterations
+        self.branching = Counter()    # children of a node on a selected path -> nodes
+        self.rollout_lengths = Counter()  # plies played by a rollout -> rollouts
+
+    def add_phase(self, phase, seconds):
+        self.phase_seconds[phase] += seconds
+        self.phase_calls[phase] += 1
+
+    def add_path(self, path):
+        """
+        Record the depth of a selected path and the branching of its inner nodes.
+        """
+        self.depths[len(path) - 1] += 1
+        for node in path[:-1]:
+            self.branching[len(node.children)] += 1
+
+    def end_iteration(self):
+        self.iterations += 1
+        if self.callback is not None and self.callback_every and self.iterations % self.callback_every == 0:
+            self.callback(self)
+
+    def end_search(self):
+        self.searches += 1
+        if self.callback is not None:
+            self.callback(self)
+
+    def merge(self, other):
+        """
+        Add another SearchStats' counts to this one. Returns self.
+        """
+        for phase in PHASES:
+            self.phase_seconds[phase] += other.phase_seconds[phase]
+            self.phase_calls[phase] += other.phase_calls[phase]
+        self.iterations += other.iterations
+        self.searches += other.searches
+        self.depths.update(other.depths)
+        self.branching.update(other.branching)
+        self.rollout_lengths.update(other.rollout_lengths)
+        return self
+
+    @staticmethod
+    def mean(histogram):
+        total = sum(histogram.values())
+        return sum(value * count for value, count in histogram.items()) / total if total else 0.0
+
+    def as_dict(self):
+        """
+        Plain-dict snapshot, e.g. for JSON output.
+        """
+        return {
+            "iterations": self.iterations,
+            "searches": self.searches,
+            "phase_seconds": dict(self.phase_seconds),
+            "phase_calls": dict(self.phase_calls),
+            "depths": dict(sorted(self.depths.items())),
+            "branching": dict(sorted(self.branching.items())),
+            "rollout_lengths": dict(sorted(self.rollout_lengths.items())),
+        }
+
+    def summary(self):
+        """
+        Human-readable report of the phase split and the histogram means.
+        """
+        total = sum(self.phase_seconds.values()) or 1.0
+        lines = [f"Searches: {self.searches}, iterations: {self.iterations}"]
+        for phase in PHASES:
+            seconds = self.phase_seconds[phase]
+            lines.append(f"  {phase:<14}{seconds:9.3f}s {seconds / total:6.1%} {self.phase_calls[phase]:>10} calls")
+        lines.append(f"  mean depth {self.mean(self.depths):.2f}, mean branching {self.mean(self.branching):.2f}, "
+                     f"mean rollout length {self.mean(self.rollout_lengths):.2f}")
+        return "\n".join(lines)
+
+    def __getstate__(self):
+        state = dict(self.__dict__)
+        state["callback"] = None  # callbacks stay in the process that made them
+        return state
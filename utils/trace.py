@@ -0,0 +1,142 @@
+"""
+Buffered, structured trace of search iterations.
+
+A Tracer collects one event per step of a traced iteration and writes
+them as JSON lines, in chunks, when its buffer fills or it is flushed.
+Only every `sample_every`-th iteration is traced, and no new iteration
+is traced once `max_bytes` have been written (those are counted as
+dropped), so a trace can stay on during long runs.
+
+Events carry the iteration number `it` and a `kind`:
+    ucb       values: {column: selection score} of one node on the path,
+              rounded to 4 decimals
+    selected  move: column of the leaf reached by selection
+    added     a node was added to the tree
+    result    value: rollout result from Yellow's point of view
+
+TextTracer writes the same events in the Verbose text format to stdout.
+read_trace() reads a JSONL trace back.
+"""
+import sys
+import json
+import math
+
+# Bytes of encoded events held in memory before they are written out
+DEFAULT_BUFFER_BYTES = 1 << 16
+
+# Trace files stop growing at this size
+DEFAULT_MAX_BYTES = 256 * 2 ** 20
+
+
+class Tracer:
+    """
+    JSONL trace written to `path` (appended to, so several searches can
+    share one file). Use as a context manager or call close().
+    """
+    def __init__(self, path, sample_every=1, max_bytes=DEFAULT_MAX_BYTES, buffer_bytes=DEFAULT_BUFFER_BYTES):
+        self.sample_every = max(1, sample_every)
+        self.max_bytes = max_bytes
+        self.buffer_bytes = buffer_bytes
+        self.iteration = 0
+        self.written = 0   # bytes recorded so far
+        self.dropped = 0   # sampled iterations not traced because of max_bytes
+        self._buffer = []
+        self._buffered = 0
+        self._file = self._open(path)
+
+    def _open(self, path):
+        return open(path, "a")
+
+    def begin_iteration(self):
+        """
+        Start the next iteration. Returns True if its events should be recorded.
+        """
+        self.iteration += 1
+        if self.iteration % self.sample_every:
+            return False
+        if self.max_bytes is not None and self.written >= self.max_bytes:
+            self.dropped += 1
+            return False
+        return True
+
+    def event(self, kind, **fields):
+        line = self._encode(kind, fields)
+        self._buffer.append(line)
+        self._buffered += len(line)
+        self.written += len(line)
+        if self._buffered >= self.buffer_bytes:
+            self.flush()
+
+    def _encode(self, kind, fields):
+        if kind == "ucb":
+            values = ",".join(f'"{col}":{_number(value)}' for col, value in fields["values"].items())
+            return f'{{"it":{self.iteration},"kind":"ucb","values":{{{values}}}}}\n'
+        return json.dumps({"it": self.iteration, "kind": kind, **fields}, separators=(",", ":")) + "\n"
+
+    def flush(self):
+        if self._buffer:
+            self._file.write("".join(self._buffer))
+            self._buffer.clear()
+            self._buffered = 0
+        self._file.flush()
+
+    def close(self):
+        self.flush()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def _number(value):
+    """
+    JSON text of a score, to 4 decimals (Infinity for unvisited children,
+    as json.dumps writes it).
+    """
+    if value == value and abs(value) != math.inf:
+        return f"{value:.4f}"
+    return json.dumps(value)
+
+
+class TextTracer(Tracer):
+    """
+    Tracer for Verbose runs: the classic text lines (V1: 0.52, Move selected,
+    NODE ADDED, TERMINAL NODE VALUE) on stdout, without sampling or size cap.
+    """
+    def __init__(self, sample_every=1, max_bytes=None, buffer_bytes=DEFAULT_BUFFER_BYTES):
+        super().__init__(None, sample_every, max_bytes, buffer_bytes)
+
+    def _open(self, path):
+        return sys.stdout
+
+    def _encode(self, kind, fields):
+        if kind == "ucb":
+            return "".join(f"V{col + 1}: {value:.2f}\n" for col, value in fields["values"].items())
+        if kind == "selected":
+            return f"Move selected: {fields['move'] + 1}\n"
+        if kind == "added":
+            return "NODE ADDED\n"
+        if kind == "result":
+            return f"TERMINAL NODE VALUE: {fields['value']}\n"
+        return f"{kind}: {fields}\n"
+
+    def close(self):
+        self.flush()  # stdout stays open
+
+
+def read_trace(path, kinds=None):
+    """
+    Yield the events of a JSONL trace as dicts, optionally only those
+    whose kind is in `kinds`. Column keys of "ucb" events come back as ints.
+    """
+    with open(path) as file:
+        for line in file:
+            event = json.loads(line)
+            if kinds is not None and event["kind"] not in kinds:
+                continue
+            if "values" in event:
+                event["values"] = {int(col): value for col, value in event["values"].items()}
+            yield event
@@ -0,0 +1,62 @@
+"""
+Transposition table for the UCT family.
+
+Maps position keys to search-tree nodes so a position reached through
+different move orders is searched as one node (the tree becomes a DAG).
+"""
+from utils.bitboard import position_key, mirror_bits
+
+DEFAULT_MAX_ENTRIES = 1_000_000
+
+
+class TranspositionTable:
+    """
+    Bounded map from position keys to shared tree nodes.
+    Once `max_entries` positions are stored, new nodes are still created
+    but no longer registered, so existing entries are never dropped mid-search.
+    With mirror=True a position and its left-right mirror image share one
+    canonical entry.
+    """
+    def __init__(self, max_entries=DEFAULT_MAX_ENTRIES, mirror=False):
+        self.entries = {}
+        self.max_entries = max_entries
+        self.mirror = mirror
+        self.hits = 0
+
+    def canonical_key(self, game):
+        """
+        Key under which the game's position is stored.
+        """
+        key = position_key(game.red, game.yellow)
+        if self.mirror:
+            mirrored = position_key(mirror_bits(game.red), mirror_bits(game.yellow))
+            if mirrored < key:
+                return mirrored
+        return key
+
+    def get(self, key):
+        node = self.entries.get(key)
+        if node is not None:
+            self.hits += 1
+        return node
+
+    def put(self, key, node):
+        if len(self.entries) < self.max_entries:
+            self.entries[key] = node
+
+    def retain(self, root):
+        """
+        Drop every entry that cannot be reached from `root`, e.g. after the
+        tree has been re-rooted between moves.
+        """
+        reachable = set()
+        stack = [root]
+        while stack:
+            node = stack.pop()
+            if id(node) not in reachable:
+                reachable.add(id(node))
+                stack.extend(node.children.values())
+        self.entries = {key: node for key, node in self.entries.items() if id(node) in reachable}
+
+    def __len__(self):
+        return len(self.entries)